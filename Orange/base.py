@@ -109,11 +109,15 @@ class Model:
         elif isinstance(data, Instance):
             if data.domain != self.domain:
                 data = Instance(self.domain, data)
-            data = Table(data.domain, [data])
-            prediction = self.predict_storage(data)
+            if type(self).predict_storage is Model.predict_storage:
+                # Models that predict from arrays do not need a table
+                prediction = self.predict(np.atleast_2d(data.x))
+            else:
+                prediction = self.predict_storage(
+                    Table(data.domain, [data]))
         elif isinstance(data, Table):
             if data.domain != self.domain:
-                data = data.from_table(self.domain, data)
+                data = data.from_table_cached(self.domain, data)
             prediction = self.predict_storage(data)
         else:
             raise TypeError("Unrecognized argument (instance of '{}')".format(
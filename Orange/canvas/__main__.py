@@ -20,6 +20,8 @@ from PyQt4.QtGui import QFont, QColor
 from PyQt4.QtCore import Qt, QDir
 
 from Orange import canvas
+from Orange.data import Table
+from Orange.data.io import TableCache
 from Orange.canvas.application.application import CanvasApplication
 from Orange.canvas.application.canvasmain import CanvasMainWindow
 from Orange.canvas.application.outputview import TextStream, ExceptHook
@@ -230,6 +232,9 @@ def main(argv=None):
             else:
                 log.info("%r style sheet not found.", stylesheet)
 
+    # Reuse the parsed data files between the sessions
+    Table.file_cache = TableCache(os.path.join(cache_dir(), "tables"))
+
     # Add the default canvas_icons search path
     dirpath = os.path.abspath(os.path.dirname(canvas.__file__))
     QDir.addSearchPath("canvas_icons", os.path.join(dirpath, "icons"))
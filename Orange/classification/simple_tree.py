@@ -98,9 +98,9 @@ class SimpleTreeLearner(Learner):
 class SimpleTreeModel(Model):
 
     def __init__(self, learner, data):
-        X = np.ascontiguousarray(data.X)
-        Y = np.ascontiguousarray(data.Y)
-        W = np.ascontiguousarray(data.W)
+        X = np.ascontiguousarray(data.X, dtype=np.float64)
+        Y = np.ascontiguousarray(data.Y, dtype=np.float64)
+        W = np.ascontiguousarray(data.W, dtype=np.float64)
         self.num_attrs = X.shape[1]
         if len(data.domain.class_vars) != 1:
             n_cls = len(data.domain.class_vars)
@@ -160,7 +160,7 @@ class SimpleTreeModel(Model):
             learner.seed)
 
     def predict_storage(self, data):
-        X = np.ascontiguousarray(data.X)
+        X = np.ascontiguousarray(data.X, dtype=np.float64)
         if self.type == Classification:
             p = np.zeros((X.shape[0], self.cls_vals))
             _tree.predict_classification(
@@ -5,7 +5,7 @@ cimport numpy as np
 import cython
 
 cdef extern from "numpy/npy_math.h":
-    bint npy_isnan(double x)
+    bint npy_isnan(double x) nogil
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -17,37 +17,40 @@ def contingency_floatarray(np.ndarray[np.float64_t, ndim=1] col_data, np.ndarray
       and class value (indexed by rows),
     - and an array with the number of missing values for each class.
     """
-    cdef np.ndarray[np.int_t, ndim=1] ranks = col_data.argsort()
+    cdef np.ndarray[np.intp_t, ndim=1] ranks = col_data.argsort()
     cdef int N = 0
     cdef np.float64_t v
     cdef np.float64_t last = float("NaN")
-    cdef Py_ssize_t i,j
-    cdef int weights = not W == None
-    for i in range(ranks.shape[0]):
-        i = ranks[i]
-        v = col_data[i]
-        if v != last and not npy_isnan(v):
-            N += 1
-            last = v
+    cdef Py_ssize_t i, j, r
+    cdef int weights = W is not None
+    # The loops release the GIL, so columns can be processed in threads
+    with nogil:
+        for r in range(ranks.shape[0]):
+            i = ranks[r]
+            v = col_data[i]
+            if v != last and not npy_isnan(v):
+                N += 1
+                last = v
     cdef np.ndarray[np.float64_t, ndim=1] V = numpy.zeros(N, dtype=numpy.float64)
     cdef np.ndarray[np.float64_t, ndim=2] C = numpy.zeros((n_rows, N), dtype=numpy.float64)
     last = float("NaN")
     j = -1
     cdef Py_ssize_t tc
     cdef np.ndarray[np.float64_t, ndim=1] unknown = numpy.zeros(n_rows, dtype=numpy.float64)
-    for i in range(ranks.shape[0]):
-        i = ranks[i]
-        v = col_data[i]
-        tc = classes[i]
-        if v != last and not npy_isnan(v):
-            j += 1
-            V[j] = v
-            last = v
-            C[tc,j] += W[i] if weights else 1.
-        elif npy_isnan(v):
-            unknown[tc] += W[i] if weights else 1.
-        else:
-            C[tc,j] += W[i] if weights else 1.
+    with nogil:
+        for r in range(ranks.shape[0]):
+            i = ranks[r]
+            v = col_data[i]
+            tc = classes[i]
+            if v != last and not npy_isnan(v):
+                j += 1
+                V[j] = v
+                last = v
+                C[tc,j] += W[i] if weights else 1.
+            elif npy_isnan(v):
+                unknown[tc] += W[i] if weights else 1.
+            else:
+                C[tc,j] += W[i] if weights else 1.
 
     assert j == N-1
 
@@ -6,6 +6,7 @@ import cython
 from libc.stdio cimport *
 from libc.string cimport *
 from libc.stdlib cimport malloc, free
+from cpython.unicode cimport PyUnicode_DecodeASCII
 
 cdef extern from "stdio.h" nogil:
     int fgetc(FILE *STREAM)
@@ -16,7 +17,7 @@ cdef enum State:
     COMMENT, CARRIAGE_RETURNED, ESCAPE, EQUALS, END_LINE,
     SET_VALUE, WAIT_VALUE, READ_VALUE, READ_DECS, TO_NEXT
 
-cpdef sparse_prescan_fast(fname):
+cpdef sparse_prescan_fast(fname, long start=0, long end=-1):
     cdef:
         State state
         char c
@@ -25,11 +26,13 @@ cpdef sparse_prescan_fast(fname):
         int n_classes = 0
         int n_metas = 0
         int n_lines = 0
-        int *output_count
+        int *output_count = &n_attributes
 
     cdef FILE *f = fopen(fname, "rb")
     if f == NULL:
         raise IOError("File '{}' cannot be opened".format(fname))
+    if start:
+        fseek(f, start, SEEK_SET)
 
     state = BEGIN_LINE
     while True:
@@ -55,6 +58,9 @@ cpdef sparse_prescan_fast(fname):
                 continue
 
         if state == BEGIN_LINE:
+            # the character that begins the line has already been read
+            if end >= 0 and ftell(f) > end:
+                break
             n_lines += 1
             output_count = &n_attributes
             state = READ
@@ -109,13 +115,22 @@ cdef inline void resize_if_needed(np.ndarray a, size):
     if dim[0] != size:
         a.resize(size, refcheck=False)
 
+cdef np.ndarray grow(np.ndarray a):
+    cdef np.ndarray b = np.empty(2 * len(a) + 64, a.dtype)
+    b[:len(a)] = a
+    return b
+
 cdef enum ColKinds:
     ATTRIBUTE, CLASS, META
 
 @cython.wraparound(False)
-def sparse_read_float(fname):
-    n_attrs, n_classes, n_metas, n_lines = sparse_prescan_fast(fname)
-
+def sparse_read_float(fname, long start=0, long end=-1):
+    """
+    Read a basket file in a single pass into CSR matrices, whose arrays
+    grow as needed. If `start` and `end` are given, only lines that begin
+    in the given range of bytes are read; `start` must be at the beginning
+    of a line.
+    """
     cdef:
         State state
         char c
@@ -131,22 +146,21 @@ def sparse_read_float(fname):
         int ii
         int attr_index
         int row_err
-        float value, decs
+        double value, decs
         char col_kind
 
-        # n_lines + 2 -- +2 instead of +1 is needed for the empty last line
-        # it is removed in the end
-        np.ndarray[np.float_t, ndim=1] X_data = np.empty(n_attrs, float)
-        np.ndarray[np.int32_t, ndim=1] X_indices = np.empty(n_attrs, np.int32)
-        np.ndarray[np.int32_t, ndim=1] X_indptr = np.empty(n_lines + 2, np.int32)
+        # The arrays are enlarged when needed and trimmed in the end
+        np.ndarray[np.float_t, ndim=1] X_data = np.empty(64, float)
+        np.ndarray[np.int32_t, ndim=1] X_indices = np.empty(64, np.int32)
+        np.ndarray[np.int32_t, ndim=1] X_indptr = np.empty(64, np.int32)
 
-        np.ndarray[np.float_t, ndim=1] Y_data = np.empty(n_classes, float)
-        np.ndarray[np.int32_t, ndim=1] Y_indices = np.empty(n_classes, np.int32)
-        np.ndarray[np.int32_t, ndim=1] Y_indptr = np.empty(n_lines + 2, np.int32)
+        np.ndarray[np.float_t, ndim=1] Y_data = np.empty(64, float)
+        np.ndarray[np.int32_t, ndim=1] Y_indices = np.empty(64, np.int32)
+        np.ndarray[np.int32_t, ndim=1] Y_indptr = np.empty(64, np.int32)
 
-        np.ndarray[np.float_t, ndim=1] metas_data = np.empty(n_metas, float)
-        np.ndarray[np.int32_t, ndim=1] metas_indices = np.empty(n_metas, np.int32)
-        np.ndarray[np.int32_t, ndim=1] metas_indptr = np.empty(n_lines + 2, np.int32)
+        np.ndarray[np.float_t, ndim=1] metas_data = np.empty(64, float)
+        np.ndarray[np.int32_t, ndim=1] metas_indices = np.empty(64, np.int32)
+        np.ndarray[np.int32_t, ndim=1] metas_indptr = np.empty(64, np.int32)
 
         dict attr_indices = {}
         dict class_indices = {}
@@ -155,7 +169,8 @@ def sparse_read_float(fname):
     cdef FILE *f = fopen(fname, "rb")
     if f == NULL:
         raise IOError("File '{}' cannot be opened".format(fname))
-
+    if start:
+        fseek(f, start, SEEK_SET)
 
     X_indptr[0] = Y_indptr[0] = metas_indptr[0] = 0
     line = 0
@@ -166,9 +181,15 @@ def sparse_read_float(fname):
         state = BEGIN_LINE
         while not (f_eof and state == BEGIN_LINE):
             if state == BEGIN_LINE:
+                if end >= 0 and ftell(f) >= end:
+                    break
                 col_kind = ATTRIBUTE
                 if in_line or line == 0:
                     line += 1
+                    if line == X_indptr.shape[0]:
+                        X_indptr = grow(X_indptr)
+                        Y_indptr = grow(Y_indptr)
+                        metas_indptr = grow(metas_indptr)
                     X_indptr[line] = X_indptr[line - 1]
                     Y_indptr[line] = Y_indptr[line - 1]
                     metas_indptr[line] = metas_indptr[line - 1]
@@ -316,7 +337,7 @@ def sparse_read_float(fname):
 
             if state == READ_DECS:
                 if "0" <= c <= "9":
-                    value = value * decs + (c & 0xf)
+                    value += decs * (c & 0xf)
                     decs /= 10
                 else:
                     endc = strchr(not_in_atom, c)
@@ -330,16 +351,25 @@ def sparse_read_float(fname):
             if state == SET_VALUE:
                 if col_kind == ATTRIBUTE:
                     ii = X_indptr[line]
+                    if ii == X_data.shape[0]:
+                        X_data = grow(X_data)
+                        X_indices = grow(X_indices)
                     X_data[ii] = value
                     X_indices[ii] = attr_index
                     X_indptr[line] = X_indptr[line] + 1
                 elif col_kind == CLASS:
                     ii = Y_indptr[line]
+                    if ii == Y_data.shape[0]:
+                        Y_data = grow(Y_data)
+                        Y_indices = grow(Y_indices)
                     Y_data[ii] = value
                     Y_indices[ii] = attr_index
                     Y_indptr[line] = Y_indptr[line] + 1
                 else:
                     ii = metas_indptr[line]
+                    if ii == metas_data.shape[0]:
+                        metas_data = grow(metas_data)
+                        metas_indices = grow(metas_indices)
                     metas_data[ii] = value
                     metas_indices[ii] = attr_index
                     metas_indptr[line] = metas_indptr[line] + 1
@@ -396,14 +426,14 @@ def sparse_read_float(fname):
     for t_data, t_indices, t_indptr, ll in [
              (X_data, X_indices, X_indptr, attr_indices),
              (Y_data, Y_indices, Y_indptr, class_indices),
-             (metas_data, metas_indices, metas_indptr, metas_indices)]:
+             (metas_data, metas_indices, metas_indptr, meta_indices)]:
         if t_indptr[line]:
             resize_if_needed(t_indptr, line + 1)
             resize_if_needed(t_indices, t_indptr[line])
             resize_if_needed(t_data, t_indptr[line])
-            row_err, col = check_csr_matrix(t_indptr, t_indices, len(t_names))
+            row_err, col = check_csr_matrix(t_indptr, t_indices, len(ll))
             if row_err >= 0:
-                for name, attr_col in t_names.items():
+                for name, attr_col in ll.items():
                     if col == attr_col:
                         break
                 raise ValueError("Duplicate values of '{}' in row {}".
@@ -419,3 +449,307 @@ def sparse_read_float(fname):
 
 # TODO: this function needs to be bottlenecked (not literally;
 # adding 'char' and 'float32' should suffice)
+
+
+from libc.math cimport NAN, fabs, floor, copysign
+
+cdef extern from "stdlib.h" nogil:
+    double strtod(const char *nptr, char **endptr)
+
+# Column treatments for read_tab_block
+cpdef enum TabColumn:
+    TAB_SKIP, TAB_FLOAT, TAB_CODE, TAB_STRING
+
+cdef inline bint is_blank(char c):
+    return c == " " or c == "\r" or c == "\n" or c == "\v" or c == "\f"
+
+cdef double POW10[23]
+for _i in range(23):
+    POW10[_i] = 10. ** _i
+
+cdef inline bint fast_float(char *s, Py_ssize_t length, double *value):
+    # Parse numbers without exponents with at most 15 digits and 22 decimals;
+    # with these limits the result is exact (as from strtod).
+    # Return False for anything else.
+    cdef:
+        Py_ssize_t i = 0
+        bint negative = False, dot = False
+        long long mantissa = 0
+        int digits = 0, decimals = 0
+        char c
+    if length and (s[0] == "-" or s[0] == "+"):
+        negative = s[0] == "-"
+        i = 1
+    while i < length:
+        c = s[i]
+        if "0" <= c <= "9":
+            mantissa = mantissa * 10 + (c - 48)
+            digits += 1
+            decimals += dot
+        elif c == "." and not dot:
+            dot = True
+        else:
+            return False
+        i += 1
+    if digits == 0 or digits > 15 or decimals > 22:
+        return False
+    value[0] = mantissa / POW10[decimals]
+    if negative:
+        value[0] = -value[0]
+    return True
+
+cdef inline bint is_unknown(char *s, Py_ssize_t length):
+    # the default unknown_str of variables: "", "?", ".", "~" and "NA"
+    if length == 0:
+        return True
+    if length == 1:
+        return s[0] == "?" or s[0] == "." or s[0] == "~"
+    return length == 2 and s[0] == "N" and s[1] == "A"
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def read_tab_block(bytes block, np.ndarray[np.int8_t, ndim=1] kinds not None,
+                   int first_row=0):
+    """
+    Tokenize a block of lines from a tab-delimited file and convert it
+    column-wise.
+
+    The block must be encoded in utf-8. Element `kinds[i]` tells how to treat
+    the i-th column: `TAB_SKIP` ignores it, `TAB_FLOAT` parses it into floats
+    (default unknown values become nan), `TAB_CODE` enumerates distinct
+    strings in the order of their first appearance and `TAB_STRING` keeps the
+    (stripped) strings. Lines with only white space are skipped and missing
+    trailing columns are treated as empty.
+
+    Return a tuple `(floats, decimals, codes, distinct, strings)`: a 2d array
+    with float columns, the maximal number of decimals in each float column
+    (-1 if there were no known values), a 2d array with indices into lists of
+    distinct strings `distinct` for code columns, and a list with lists of
+    strings for string columns.
+
+    :param block: the lines to parse
+    :param kinds: treatment of columns
+    :param first_row: the number of data rows preceding the block; used in
+        error messages
+    """
+    cdef:
+        char *data = block
+        Py_ssize_t size = len(block)
+        Py_ssize_t n_columns = len(kinds)
+        Py_ssize_t max_rows = block.count(b"\n") + 1
+        Py_ssize_t pos = 0, line_end, start, end, beg, fin, i
+        Py_ssize_t row = 0, col, ci
+        bint more_columns
+        int n_floats = 0, n_codes = 0, n_strings = 0
+        char kind
+        char buf[64]
+        char *endp
+        double value
+        int ndec
+        np.ndarray[np.intp_t, ndim=1] kind_index = \
+            np.empty(n_columns, np.intp)
+
+    for col in range(n_columns):
+        kind = kinds[col]
+        if kind == TAB_FLOAT:
+            kind_index[col] = n_floats
+            n_floats += 1
+        elif kind == TAB_CODE:
+            kind_index[col] = n_codes
+            n_codes += 1
+        elif kind == TAB_STRING:
+            kind_index[col] = n_strings
+            n_strings += 1
+
+    cdef:
+        np.ndarray[np.float64_t, ndim=2] floats = \
+            np.empty((max_rows, n_floats), np.float64)
+        np.ndarray[np.intp_t, ndim=1] decimals = \
+            np.empty(n_floats, np.intp)
+        np.ndarray[np.intp_t, ndim=2] codes = \
+            np.empty((max_rows, n_codes), np.intp)
+        list code_dicts = [{} for _ in range(n_codes)]
+        list distinct = [[] for _ in range(n_codes)]
+        list strings = [[] for _ in range(n_strings)]
+        dict code_dict
+
+    decimals[:] = -1
+    while pos < size:
+        line_end = pos
+        while line_end < size and data[line_end] != "\n":
+            line_end += 1
+        start = pos
+        pos = line_end + 1
+        beg = start
+        while beg < line_end and (is_blank(data[beg]) or data[beg] == "\t"):
+            beg += 1
+        if beg == line_end:
+            continue
+
+        col = 0
+        more_columns = False
+        while col < n_columns:
+            end = start
+            while end < line_end and data[end] != "\t":
+                end += 1
+            kind = kinds[col]
+            if kind != TAB_SKIP:
+                beg, fin = start, end
+                while beg < fin and is_blank(data[beg]):
+                    beg += 1
+                while fin > beg and is_blank(data[fin - 1]):
+                    fin -= 1
+                ci = kind_index[col]
+                if kind == TAB_FLOAT:
+                    if is_unknown(data + beg, fin - beg):
+                        floats[row, ci] = NAN
+                        ndec = -1
+                    else:
+                        if not fast_float(data + beg, fin - beg, &value):
+                            endp = NULL
+                            if fin - beg < 64:
+                                memcpy(buf, data + beg, fin - beg)
+                                buf[fin - beg] = 0
+                                value = strtod(buf, &endp)
+                            if endp != buf + (fin - beg):
+                                # let Python parse (or reject) anything else
+                                value = float(data[beg:fin].decode("utf-8"))
+                        floats[row, ci] = value
+                        ndec = 0
+                        for i in range(beg, fin):
+                            if data[i] == ".":
+                                if i > beg:
+                                    ndec = fin - i - 1
+                                break
+                    if ndec > decimals[ci]:
+                        decimals[ci] = ndec
+                elif kind == TAB_CODE:
+                    s = data[beg:fin].decode("utf-8")
+                    code_dict = code_dicts[ci]
+                    code = code_dict.get(s)
+                    if code is None:
+                        code = code_dict[s] = len(code_dict)
+                        distinct[ci].append(s)
+                    codes[row, ci] = code
+                else:
+                    strings[ci].append(data[beg:fin].decode("utf-8"))
+            col += 1
+            more_columns = end < line_end
+            start = end + more_columns
+        if more_columns:
+            raise ValueError("Too many columns in line {}"
+                             .format(4 + first_row + row))
+        row += 1
+
+    return floats[:row], decimals, codes[:row], distinct, strings
+
+
+@cython.wraparound(False)
+def parse_baskets(list cells, dict indices):
+    """
+    Parse the cells of a basket column. A cell contains items separated by
+    commas or white space; an item is a name, optionally followed by `=` and
+    a value (the default is 1). Items are given column indices in the order
+    of their first appearance; `indices` maps names to indices and is
+    updated with new names. Unknown cells ("?", "~", "NA") are empty.
+
+    Return arrays data, indices and indptr of a CSR matrix.
+    """
+    cdef:
+        Py_ssize_t row, n = 0
+        np.ndarray[np.float_t, ndim=1] data = np.empty(64, float)
+        np.ndarray[np.int32_t, ndim=1] columns = np.empty(64, np.int32)
+        np.ndarray[np.int32_t, ndim=1] indptr = \
+            np.empty(len(cells) + 1, np.int32)
+
+    indptr[0] = 0
+    for row in range(len(cells)):
+        cell = cells[row]
+        if cell not in ("?", "~", "NA"):
+            for item in cell.replace(",", " ").split():
+                name, eq, value = item.partition("=")
+                if n == data.shape[0]:
+                    data = grow(data)
+                    columns = grow(columns)
+                columns[n] = indices.setdefault(name, len(indices))
+                data[n] = float(value) if eq else 1
+                n += 1
+        indptr[row + 1] = n
+    return data[:n], columns[:n], indptr
+
+
+@cython.cdivision(True)
+cdef inline int fast_fixed(char *buf, double value, int decimals):
+    # Format the value as "%.<decimals>f" for moderately sized values whose
+    # rounding is unambiguous despite the error of scaling; return the length
+    # or -1 if snprintf must be used
+    cdef:
+        double scaled, frac
+        long long rounded, int_part, frac_part, p10
+        int length = 0, i
+        char digits[24]
+
+    if decimals > 9:
+        return -1
+    scaled = fabs(value) * POW10[decimals]
+    if not scaled < 1e9:
+        return -1
+    frac = scaled - floor(scaled)
+    if 0.5 - 1e-6 < frac < 0.5 + 1e-6:
+        return -1
+    rounded = <long long>floor(scaled + 0.5)
+    p10 = <long long>POW10[decimals]
+    int_part = rounded // p10
+    frac_part = rounded % p10
+    if copysign(1, value) < 0:
+        buf[length] = "-"
+        length += 1
+    i = 0
+    while True:
+        digits[i] = <char>(48 + int_part % 10)
+        int_part //= 10
+        i += 1
+        if int_part == 0:
+            break
+    while i:
+        i -= 1
+        buf[length] = digits[i]
+        length += 1
+    if decimals:
+        buf[length] = "."
+        length += 1
+        for i in range(decimals - 1, -1, -1):
+            buf[length + i] = <char>(48 + frac_part % 10)
+            frac_part //= 10
+        length += decimals
+    return length
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def format_floats(double[:] values, int decimals):
+    """
+    Return a list of values formatted with the given number of decimals,
+    as by `"%.<decimals>f"`; unknown values are formatted as "?".
+    """
+    cdef:
+        char buf[128]
+        int length
+        Py_ssize_t i, n = values.shape[0]
+        double value
+        list formatted = [None] * n
+
+    for i in range(n):
+        value = values[i]
+        if value != value:
+            formatted[i] = "?"
+            continue
+        length = fast_fixed(buf, value, decimals)
+        if length < 0:
+            length = snprintf(buf, sizeof(buf), "%.*f", decimals, value)
+        if 0 <= length < sizeof(buf):
+            formatted[i] = PyUnicode_DecodeASCII(buf, length, NULL)
+        else:
+            formatted[i] = "%.*f" % (decimals, value)
+    return formatted
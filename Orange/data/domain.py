@@ -55,6 +55,74 @@ class DomainConversion:
             source.index(var) if var in source
             else var.compute_value for var in destination.metas]
 
+        # Precompiled plans for converting arrays (see convert_arrays)
+        self.n_attributes = len(destination.attributes)
+        n_source_attrs = len(source.attributes)
+        self._variables_plan = self._compile(self.variables, n_source_attrs)
+        self._metas_plan = self._compile(self.metas, n_source_attrs)
+
+    @staticmethod
+    def _compile(indices, n_source_attrs):
+        # Return a list of (source block, source columns, destination
+        # columns) for columns copied from the source's X (block 0), Y (1)
+        # and metas (2), and a list of (destination column, compute_value)
+        blocks = ([], []), ([], []), ([], [])
+        computed = []
+        for dst, src in enumerate(indices):
+            if not isinstance(src, Integral):
+                computed.append((dst, src))
+            elif src < 0:
+                blocks[2][0].append(-1 - src)
+                blocks[2][1].append(dst)
+            elif src < n_source_attrs:
+                blocks[0][0].append(src)
+                blocks[0][1].append(dst)
+            else:
+                blocks[1][0].append(src - n_source_attrs)
+                blocks[1][1].append(dst)
+        copied = [(block, np.array(src, dtype=np.intp),
+                   np.array(dst, dtype=np.intp))
+                  for block, (src, dst) in enumerate(blocks) if src]
+        return copied, computed
+
+    def convert_arrays(self, x, y, metas, source=None):
+        """
+        Convert arrays with values in the source domain to arrays of
+        attributes, class variables and meta attributes of the destination
+        domain. Arrays are 1-dimensional for a single data instance and
+        2-dimensional (with a row for each instance) for several.
+
+        The values of variables that are not in the source domain are
+        computed by their `compute_value` from `source`, an instance (for
+        1-dimensional arrays) or a table in the source domain.
+
+        :param x: the values of attributes
+        :param y: the values of class variables
+        :param metas: the values of meta attributes
+        :param source: data from which the values are computed
+        :type source: Orange.data.Instance or Orange.data.Table
+        :return: a tuple of arrays (attributes, class variables, metas)
+        """
+        shape = np.shape(x)[:-1]
+        blocks = x, y, metas
+        values = self._apply(self._variables_plan, blocks, source,
+                             np.empty(shape + (len(self.variables),)))
+        metas = self._apply(self._metas_plan, blocks, source,
+                            np.empty(shape + (len(self.metas),),
+                                     dtype=object))
+        nattrs = self.n_attributes
+        return values[..., :nattrs], values[..., nattrs:], metas
+
+    @staticmethod
+    def _apply(plan, blocks, source, out):
+        copied, computed = plan
+        for block, src, dst in copied:
+            out[..., dst] = blocks[block][..., src]
+        for dst, compute_value in computed:
+            out[..., dst] = Unknown if compute_value is None \
+                else compute_value(source)
+        return out
+
 
 class Domain:
     def __init__(self, attributes, class_vars=None, metas=None, source=None):
@@ -319,19 +387,7 @@ class Domain:
             if inst.domain == self:
                 return inst._x, inst._y, inst._metas
             c = self.get_conversion(inst.domain)
-            l = len(inst.domain.attributes)
-            values = [(inst._x[i] if 0 <= i < l
-                       else inst._y[i - l] if i >= l
-                       else inst._metas[-i - 1])
-                      if isinstance(i, int)
-                      else (Unknown if not i else i(inst))
-                      for i in c.variables]
-            metas = [(inst._x[i] if 0 <= i < l
-                      else inst._y[i - l] if i >= l
-                      else inst._metas[-i - 1])
-                     if isinstance(i, int)
-                     else (Unknown if not i else i(inst))
-                     for i in c.metas]
+            return c.convert_arrays(inst._x, inst._y, inst._metas, inst)
         else:
             nvars = len(self._variables)
             nmetas = len(self._metas)
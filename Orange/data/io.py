@@ -1,8 +1,17 @@
+import bz2
 import csv
+import gzip
+import hashlib
+import json
+import lzma
+import os
 import re
 import sys
 import pickle
-from itertools import chain
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from itertools import chain, islice
 
 import bottlechest as bn
 import numpy as np
@@ -35,6 +44,180 @@ class FileFormats:
         return f
 
 
+# Functions that open compressed files, by the extension of the compression
+compression_openers = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+
+def split_extension(filename):
+    """
+    Split the file name into the name without extensions, the extension of
+    the format and the extension of the compression, which is an empty
+    string for files that are not compressed (e.g. `"iris.tab.gz"` gives
+    `("iris", ".tab", ".gz")`).
+    """
+    name, ext = os.path.splitext(filename)
+    compression = ""
+    if ext in compression_openers:
+        compression = ext
+        name, ext = os.path.splitext(name)
+    return name, ext, compression
+
+
+def open_compressed(filename, mode="rt", *args, **kwargs):
+    """
+    Open the file like :obj:`open`, but decompress (or compress, when
+    writing) it if the extension is one of those in `compression_openers`.
+    """
+    opener = compression_openers.get(os.path.splitext(filename)[1], open)
+    return opener(filename, mode, *args, **kwargs)
+
+
+def _use_processes(filename, n_jobs, min_size):
+    return n_jobs != 1 and not split_extension(filename)[2] and \
+        os.path.getsize(filename) >= min_size
+
+
+def _line_ranges(filename, start, n_ranges):
+    """
+    Split the file from the byte offset `start` to its end into at most
+    `n_ranges` consecutive byte ranges that begin at starts of lines.
+    """
+    size = os.path.getsize(filename)
+    bounds = [start]
+    with open(filename, "rb") as f:
+        for i in range(1, n_ranges):
+            pos = start + (size - start) * i // n_ranges
+            if pos <= bounds[-1]:
+                continue
+            f.seek(pos - 1)
+            f.readline()
+            pos = f.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+    bounds.append(size)
+    return [(beg, end) for beg, end in zip(bounds, bounds[1:]) if beg < end]
+
+
+def _parse_in_processes(parse, filename, start, n_jobs, *args):
+    """
+    Split the file from the byte offset `start` on into ranges of whole
+    lines, and yield results of `parse(filename, beg, end, *args)` for the
+    consecutive ranges, which are computed in a pool of `n_jobs` processes.
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(n_jobs) as executor:
+        futures = [executor.submit(parse, filename, beg, end, *args)
+                   for beg, end in _line_ranges(filename, start, 4 * n_jobs)]
+        for future in futures:
+            yield future.result()
+
+
+def _read_range(filename, beg, end):
+    with open(filename, "rb") as f:
+        f.seek(beg)
+        return f.read(end - beg)
+
+
+def _parse_tab_range(filename, beg, end, kinds):
+    return _io.read_tab_block(_read_range(filename, beg, end), kinds)
+
+
+def _parse_txt(data, n_columns, delimiter, missing):
+    arr = np.genfromtxt(BytesIO(data),
+                        delimiter=delimiter, missing_values=missing)
+    return arr.reshape(-1, n_columns)
+
+
+def _parse_txt_range(filename, beg, end, n_columns, delimiter, missing):
+    return _parse_txt(_read_range(filename, beg, end),
+                      n_columns, delimiter, missing)
+
+
+def _chunk_ranges(filename, chunk_size):
+    """
+    Split the file into consecutive byte ranges with `chunk_size` lines.
+    """
+    with open(filename, "rb") as f:
+        beg = 0
+        while True:
+            for _ in islice(f, chunk_size):
+                pass
+            end = f.tell()
+            if end == beg:
+                return
+            yield beg, end
+            beg = end
+
+
+def _column_formatter(var, repr_strings=True, numeric=False):
+    """
+    Return a function that formats an array of values of the variable at
+    once. The result is the same as from `var.repr_val` for each value,
+    except for non-primitive variables when `repr_strings` is `False`,
+    where `var.str_val` is used. If `numeric` is `True`, values of
+    primitive variables are written as numbers (discrete values as
+    indices) with full precision and unknowns as "?".
+    """
+    if numeric and var.is_primitive():
+        def format_column(values):
+            return [repr(val) if val == val else "?"
+                    for val in values.astype(float).tolist()]
+    elif var.is_continuous:
+        def format_column(values):
+            return _io.format_floats(values.astype(float),
+                                     var.number_of_decimals)
+    elif var.is_discrete:
+        # The last label is for unknown values, which get index -1
+        labels = np.array(list(var.values) + ["?"], dtype=object)
+
+        def format_column(values):
+            values = values.astype(float)
+            codes = np.where(np.isnan(values), -1, values).astype(int)
+            return labels[codes].tolist()
+    else:
+        to_str = var.repr_val if repr_strings else var.str_val
+
+        def format_column(values):
+            return [to_str(val) for val in values]
+    return format_column
+
+
+def _formatted_rows(data, variables=None, repr_strings=True, numeric=False,
+                    block_size=10000):
+    """
+    Format the values of the given variables (by default, all variables
+    and meta attributes) column-wise (see :obj:`_column_formatter`), and
+    yield lists of rows of strings for consecutive blocks of (at most)
+    `block_size` rows. Blocks of sparse arrays are formatted as dense.
+    """
+    domain = data.domain
+    if variables is None:
+        variables = domain.variables + domain.metas
+    arrays = (data.X, data._Y, data.metas)
+    columns = []
+    for var in variables:
+        index = domain.index(var)
+        if index < 0:
+            columns.append((2, -1 - index))
+        elif index < len(domain.attributes):
+            columns.append((0, index))
+        else:
+            columns.append((1, index - len(domain.attributes)))
+    formatters = [_column_formatter(var, repr_strings, numeric)
+                  for var in variables]
+    for start in range(0, len(data), block_size):
+        end = min(start + block_size, len(data))
+        blocks = []
+        for arr in arrays:
+            block = arr[start:end]
+            if sparse.issparse(block):
+                block = block.toarray()
+            blocks.append(block)
+        formatted = [format_column(blocks[arr][:, i])
+                     for format_column, (arr, i) in zip(formatters, columns)]
+        yield list(zip(*formatted)) if formatted else [()] * (end - start)
+
+
 class FileReader:
     def prescan_file(self, f, delim, nvars, disc_cols, cont_cols):
         values = [set() for _ in range(nvars)]
@@ -54,10 +237,12 @@ class FileReader:
 
 @FileFormats.register("Tab-delimited file", ".tab")
 class TabDelimFormat:
+    SUPPORTS_COMPRESSION = True
     non_escaped_spaces = re.compile(r"(?<!\\) +")
 
     def read_header(self, f):
-        f.seek(0)
+        if f.seekable():
+            f.seek(0)
         names = [x.strip() for x in f.readline().strip("\n\r").split("\t")]
         types = [x.strip() for x in f.readline().strip("\n\r").split("\t")]
         flags = [x.strip() for x in f.readline().strip("\n\r").split("\t")]
@@ -79,6 +264,8 @@ class TabDelimFormat:
         self.meta_columns = []
         self.weight_column = -1
         self.basket_column = -1
+        self.basket_indices = {}
+        self._basket_blocks = []
 
         for col, (name, tpe, flag) in enumerate(zip(names, types, flags)):
             tpe = tpe.strip()
@@ -143,6 +330,129 @@ class TabDelimFormat:
             i += 1
         return i
 
+    # The approximate number of characters that are parsed at once
+    block_size = 1 << 20
+
+    # Read the data in a single pass, without counting the lines first.
+    # This halves the I/O, but the data is held twice while the blocks are
+    # concatenated. Streams that cannot seek are always read in a single pass.
+    single_pass = False
+
+    # The number of processes that parse files larger than parallel_min_size
+    # (in bytes); None uses all cores
+    n_jobs = 1
+    parallel_min_size = 1 << 24
+
+    def _column_kinds(self, domain):
+        """
+        Return an array that tells :obj:`_io.read_tab_block` how to treat
+        each column of the file, and an array with positions of columns
+        within arrays of the corresponding kind.
+        """
+        kinds = np.zeros(self.n_columns, dtype=np.int8)
+        for (col, _), var in zip(
+                chain(self.attribute_columns, self.classvar_columns,
+                      self.meta_columns),
+                chain(domain.variables, domain.metas)):
+            if var.is_continuous and \
+                    var.unknown_str == Variable._DefaultUnknownStr:
+                kinds[col] = _io.TAB_FLOAT
+            elif var.is_string:
+                kinds[col] = _io.TAB_STRING
+            else:
+                kinds[col] = _io.TAB_CODE
+        if self.weight_column >= 0:
+            kinds[self.weight_column] = _io.TAB_FLOAT
+        if self.basket_column >= 0:
+            kinds[self.basket_column] = _io.TAB_STRING
+        positions = np.zeros(self.n_columns, dtype=int)
+        for kind in (_io.TAB_FLOAT, _io.TAB_CODE, _io.TAB_STRING):
+            of_kind = kinds == kind
+            positions[of_kind] = np.arange(np.sum(of_kind))
+        return kinds, positions
+
+    @staticmethod
+    def _adjust_decimals(var, decimals):
+        # Same as what ContinuousVariable.val_from_str_add does for each value
+        if decimals >= 0 and var.adjust_decimals and \
+                (decimals > var.number_of_decimals or
+                 var.adjust_decimals == 2):
+            var.number_of_decimals = decimals
+            var.adjust_decimals = 1
+
+    def parse_block(self, lines, domain, first_row=0):
+        """
+        Parse a block of data lines. The lines are tokenized at once and
+        converted column-wise: continuous columns are parsed into floats by
+        compiled code, and values of other columns are converted only once
+        for each distinct value.
+
+        :param lines: lines from the data part of the file
+        :type lines: list of str
+        :param domain: the domain returned by :obj:`read_header`
+        :type domain: Orange.data.Domain
+        :param first_row: the number of data rows preceding the block
+        :type first_row: int
+        :return: arrays X, Y, metas and W (or `None` if there are no weights)
+        """
+        kinds, positions = self._column_kinds(domain)
+        parsed = _io.read_tab_block(
+            "".join(lines).encode("utf-8"), kinds, first_row)
+        return self.convert_block(parsed, domain, kinds, positions)
+
+    def convert_block(self, parsed, domain, kinds, positions):
+        """
+        Construct arrays X, Y, metas and W from the result of
+        :obj:`_io.read_tab_block`. Symbolic values are converted in the order
+        of their first appearance in the block, so converting consecutive
+        blocks adds new values to variables in the same order as reading the
+        file line by line.
+        """
+        floats, decimals, codes, distinct, strings = parsed
+        n_rows = len(floats)
+
+        def convert(columns, variables, dtype):
+            arr = np.empty((n_rows, len(variables)), dtype=dtype)
+            for i, ((col, reader), var) in enumerate(zip(columns, variables)):
+                kind, pos = kinds[col], positions[col]
+                if kind == _io.TAB_FLOAT:
+                    arr[:, i] = floats[:, pos]
+                    self._adjust_decimals(var, decimals[pos])
+                elif kind == _io.TAB_CODE:
+                    values = np.array([reader(val) for val in distinct[pos]],
+                                      dtype=dtype)
+                    arr[:, i] = values[codes[:, pos]]
+                else:
+                    arr[:, i] = strings[pos]
+            return arr
+
+        X = convert(self.attribute_columns, domain.attributes, float)
+        Y = convert(self.classvar_columns, domain.class_vars, float)
+        metas = convert(self.meta_columns, domain.metas, object)
+        if self.weight_column >= 0:
+            W = floats[:, positions[self.weight_column]]
+        else:
+            W = None
+        if self.basket_column >= 0:
+            self._basket_blocks.append(_io.parse_baskets(
+                strings[positions[self.basket_column]], self.basket_indices))
+        return X, Y, metas, W
+
+    def read_blocks(self, f, domain):
+        """
+        Parse the data part of the file in blocks and yield a tuple with
+        arrays X, Y, metas and W for each block (see :obj:`parse_block`).
+        The file must be positioned after the header.
+        """
+        line_count = 0
+        while True:
+            lines = f.readlines(self.block_size)
+            if not lines:
+                break
+            block = self.parse_block(lines, domain, line_count)
+            line_count += len(block[0])
+            yield block
+
     def read_data(self, f, table):
         X, Y = table.X, table._Y
         W = table.W if table.W.shape[-1] else None
@@ -150,37 +460,20 @@ class TabDelimFormat:
         f.readline()
         f.readline()
         f.readline()
-        padding = [""] * self.n_columns
-        if self.basket_column >= 0:
-            # TODO how many columns?!
-            table._Xsparse = sparse.lil_matrix(len(X), 100)
         table.metas = metas = (
             np.empty((len(X), len(self.meta_columns)), dtype=object))
         line_count = 0
-        Xr = None
-        for lne in f:
-            values = lne
-            if not values.strip():
-                continue
-            values = values.split("\t")
-            if len(values) > self.n_columns:
-                raise ValueError("Too many columns in line {}".
-                                 format(4 + line_count))
-            elif len(values) < self.n_columns:
-                values += padding
-            if self.attribute_columns:
-                Xr = X[line_count]
-                for i, (col, reader) in enumerate(self.attribute_columns):
-                    Xr[i] = reader(values[col].strip())
-            for i, (col, reader) in enumerate(self.classvar_columns):
-                Y[line_count, i] = reader(values[col].strip())
+        for block_X, block_Y, block_metas, block_W in \
+                self.read_blocks(f, table.domain):
+            end = line_count + len(block_X)
+            X[line_count:end] = block_X
+            Y[line_count:end] = block_Y
+            metas[line_count:end] = block_metas
             if W is not None:
-                W[line_count] = float(values[self.weight_column])
-            for i, (col, reader) in enumerate(self.meta_columns):
-                metas[line_count, i] = reader(values[col].strip())
-            line_count += 1
+                W[line_count:end] = block_W
+            line_count = end
         if line_count != len(X):
-            del Xr, X, Y, W, metas
+            del X, Y, W, metas
             table.X.resize(line_count, len(table.domain.attributes))
             table._Y.resize(line_count, len(table.domain.class_vars))
             if table.W.ndim == 1:
@@ -190,6 +483,32 @@ class TabDelimFormat:
             table.metas.resize((line_count, len(self.meta_columns)))
         table.n_rows = line_count
 
+    def read_data_single_pass(self, f, domain, cls):
+        """
+        Construct a table from the data part of the file, which is read
+        only once. Arrays for blocks are concatenated at the end. The file
+        must be positioned after the header.
+        """
+        return self._table_from_blocks(
+            list(self.read_blocks(f, domain)), domain, cls)
+
+    def _table_from_blocks(self, blocks, domain, cls):
+        table = cls.from_domain(domain, 0, self.weight_column >= 0)
+        if not blocks:
+            return table
+        X, Y, metas, W = zip(*blocks)
+        del blocks
+        table.X = np.vstack(X)
+        table.Y = np.vstack(Y)
+        table.metas = np.vstack(metas)
+        if self.weight_column >= 0:
+            table.W = np.hstack(W)
+        else:
+            table.W = np.empty((len(table.X), 0))
+        table.n_rows = len(table.X)
+        cls._init_ids(table)
+        return table
+
     def reorder_values_array(self, arr, variables):
         newvars = []
         for col, var in enumerate(variables):
@@ -212,34 +531,120 @@ class TabDelimFormat:
         table.domain = Domain(attrs, classes, metas=metas)
 
     def read_file(self, filename, cls=None):
+        if _use_processes(filename, self.n_jobs, self.parallel_min_size):
+            return self._read_file_parallel(filename, cls)
+        with open_compressed(filename) as file:
+            # Seeking in compressed files requires decompressing them again
+            return self._read_file(
+                file, cls, single_pass=bool(split_extension(filename)[2]))
+
+    def iter_chunks(self, filename, chunk_size, cls=None):
+        """
+        Read the file in chunks and yield tables with at most `chunk_size`
+        rows. The tables share the domain that is read from the header;
+        new values of discrete variables are added to variables in the
+        order in which they appear and are not sorted as by
+        :obj:`read_file`.
+        """
+        from ..data import Table
+        if cls is None:
+            cls = Table
+        with open_compressed(filename) as file:
+            domain = self.read_header(file)
+            if self.basket_column >= 0:
+                raise ValueError("Files with basket columns cannot be read "
+                                 "in chunks")
+            first_row = 0
+            while True:
+                lines = list(islice(file, chunk_size))
+                if not lines:
+                    break
+                block = self.parse_block(lines, domain, first_row)
+                if len(block[0]):
+                    first_row += len(block[0])
+                    yield self._table_from_blocks([block], domain, cls)
+
+    def _read_file_parallel(self, filename, cls=None):
+        from ..data import Table
+        if cls is None:
+            cls = Table
         with open(filename) as file:
-            return self._read_file(file, cls)
+            domain = self.read_header(file)
+        with open(filename, "rb") as file:
+            for _ in range(3):
+                file.readline()
+            data_start = file.tell()
+        kinds, positions = self._column_kinds(domain)
+        try:
+            blocks = [self.convert_block(parsed, domain, kinds, positions)
+                      for parsed in _parse_in_processes(
+                          _parse_tab_range, filename, data_start,
+                          self.n_jobs, kinds)]
+        except ValueError:
+            # Parse sequentially to report the correct line of the error
+            with open(filename) as file:
+                return self._read_file(file, cls)
+        table = self._table_from_blocks(blocks, domain, cls)
+        self.reorder_values(table)
+        self.add_baskets(table)
+        return table
 
-    def _read_file(self, file, cls=None):
+    def add_baskets(self, table):
+        """
+        Add columns with items from the basket column, which were collected
+        while converting the blocks, to the attributes of the table. The
+        table's X becomes a sparse (CSR) matrix.
+        """
+        if self.basket_column < 0:
+            return
+        blocks, self._basket_blocks = self._basket_blocks, []
+        indptr = [np.zeros(1, np.int32)]
+        for _, _, block_indptr in blocks:
+            indptr.append(block_indptr[1:] + indptr[-1][-1])
+        baskets = sparse.csr_matrix(
+            (np.hstack([np.empty(0)] + [block[0] for block in blocks]),
+             np.hstack([np.empty(0, np.int32)] +
+                       [block[1] for block in blocks]),
+             np.hstack(indptr)),
+            (len(table), len(self.basket_indices)))
+        names = sorted(self.basket_indices, key=self.basket_indices.get)
+        table.X = sparse.hstack((sparse.csr_matrix(table.X), baskets),
+                                format="csr")
+        table.domain = Domain(
+            list(table.domain.attributes) +
+            [ContinuousVariable.make(name) for name in names],
+            table.domain.class_vars, table.domain.metas)
+
+    def _read_file(self, file, cls=None, single_pass=False):
         from ..data import Table
         if cls is None:
             cls = Table
         domain = self.read_header(file)
-        nExamples = self.count_lines(file)
-        table = cls.from_domain(domain, nExamples, self.weight_column >= 0)
-        self.read_data(file, table)
+        if single_pass or self.single_pass or not file.seekable() or \
+                self.basket_column >= 0:
+            table = self.read_data_single_pass(file, domain, cls)
+        else:
+            nExamples = self.count_lines(file)
+            table = cls.from_domain(
+                domain, nExamples, self.weight_column >= 0)
+            self.read_data(file, table)
         self.reorder_values(table)
+        self.add_baskets(table)
         return table
 
     @classmethod
     def _write_fast(cls, f, data):
-        wa = [var.repr_val for var in data.domain.variables + data.domain.metas]
-        for Xi, Yi, Mi in zip(data.X, data._Y, data.metas):
-            f.write("\t".join(w(val) for val, w in zip(chain(Xi, Yi, Mi), wa)))
-            f.write("\n")
+        for rows in _formatted_rows(data):
+            f.write("".join("\t".join(row) + "\n" for row in rows))
 
     @classmethod
     def write_file(cls, filename, data):
         """
         Save data to file.
 
-        Function uses fast implementation in case of numpy data, and slower
-        fall-back for general storage.
+        Function uses fast implementation, which formats blocks of rows
+        column by column, in case of numpy data, and slower fall-back for
+        general storage.
 
         :param filename: the name of the file
         :type filename: str
@@ -247,7 +652,7 @@ class TabDelimFormat:
         :type data: Orange.data.Storage
         """
         if isinstance(filename, str):
-            f = open(filename, "w")
+            f = open_compressed(filename, "wt")
         else:
             f = filename
         domain_vars = data.domain.variables + data.domain.metas
@@ -292,6 +697,12 @@ class TabDelimFormat:
 @FileFormats.register("Comma-separated file", ".csv")
 class TxtFormat:
     MISSING_VALUES = frozenset({"", "NA", "?"})
+    SUPPORTS_COMPRESSION = True
+
+    # The number of processes that parse files larger than parallel_min_size
+    # (in bytes); None uses all cores
+    n_jobs = 1
+    parallel_min_size = 1 << 24
 
     @staticmethod
     def read_header(file, delimiter=None):
@@ -320,22 +731,61 @@ class TxtFormat:
         from ..data import Table
         if cls is None:
             cls = Table
-        with open(filename, "rt") as file:
+        with open_compressed(filename, "rt") as file:
             domain, header_lines, delimiter = self.read_header(file)
-        with open(filename, "rb") as file:
-            arr = np.genfromtxt(file, delimiter=delimiter,
-                                skip_header=header_lines,
-                                missing_values=self.MISSING_VALUES)
+        if _use_processes(filename, self.n_jobs, self.parallel_min_size):
+            with open(filename, "rb") as file:
+                for _ in range(header_lines):
+                    file.readline()
+                data_start = file.tell()
+            n_columns = len(domain.attributes)
+            arr = np.vstack([np.empty((0, n_columns))] + list(
+                _parse_in_processes(
+                    _parse_txt_range, filename, data_start, self.n_jobs,
+                    n_columns, delimiter, self.MISSING_VALUES)))
+        else:
+            with open_compressed(filename, "rb") as file:
+                arr = np.genfromtxt(file, delimiter=delimiter,
+                                    skip_header=header_lines,
+                                    missing_values=self.MISSING_VALUES)
         table = cls.from_numpy(domain, arr)
         return table
 
+    def iter_chunks(self, filename, chunk_size, cls=None):
+        """
+        Read the file in chunks and yield tables with at most `chunk_size`
+        rows.
+        """
+        from ..data import Table
+        if cls is None:
+            cls = Table
+        with open_compressed(filename, "rt") as file:
+            domain, header_lines, delimiter = self.read_header(file)
+        n_columns = len(domain.attributes)
+        with open_compressed(filename, "rb") as file:
+            for _ in range(header_lines):
+                file.readline()
+            while True:
+                lines = list(islice(file, chunk_size))
+                if not lines:
+                    break
+                arr = _parse_txt(b"".join(lines), n_columns, delimiter,
+                                 self.MISSING_VALUES)
+                if len(arr):
+                    yield cls.from_numpy(domain, arr)
+
     @classmethod
     def csv_saver(cls, filename, data, delimiter='\t'):
-        with open(filename, 'w') as csvfile:
+        with open_compressed(filename, "wt") as csvfile:
             writer = csv.writer(csvfile, delimiter=delimiter)
             all_vars = data.domain.variables + data.domain.metas
+            # Without the header with types, the file is read back as
+            # numeric, so only primitive variables are written, as numbers
+            numeric = delimiter != '\t'
+            if numeric:
+                all_vars = [var for var in all_vars if var.is_primitive()]
             writer.writerow([v.name for v in all_vars])  # write variable names
-            if delimiter == '\t':
+            if not numeric:
                 flags = ([''] * len(data.domain.attributes)) + \
                         (['class'] * len(data.domain.class_vars)) + \
                         (['m'] * len(data.domain.metas))
@@ -349,8 +799,16 @@ class TxtFormat:
                 writer.writerow([type(v).__name__.replace("Variable", "").lower()
                                  for v in all_vars])  # write variable types
                 writer.writerow(flags) # write flags
-            for ex in data: # write examples
-                writer.writerow(ex)
+            if hasattr(data, "metas"):
+                for rows in _formatted_rows(data, all_vars,
+                                            repr_strings=False,
+                                            numeric=numeric):
+                    writer.writerows(rows)
+            else:
+                # Storage without arrays (e.g. SqlTable)
+                for ex in data:
+                    writer.writerow([float(ex[var]) if numeric else str(ex[var])
+                                     for var in all_vars])
 
     @classmethod
     def write_file(cls, filename, data):
@@ -363,10 +821,7 @@ class BasketFormat:
     def read_file(cls, filename, storage_class=None):
         if storage_class is None:
             from ..data import Table as storage_class
-        def constr_vars(inds):
-            if inds:
-                return [ContinuousVariable(x.decode("utf-8")) for _, x in
-                        sorted((ind, name) for name, ind in inds.items())]
+        constr_vars = cls._construct_variables
 
         X, Y, metas, attr_indices, class_indices, meta_indices = \
             _io.sparse_read_float(filename.encode(sys.getdefaultencoding()))
@@ -375,8 +830,65 @@ class BasketFormat:
         classes = constr_vars(class_indices)
         meta_attrs = constr_vars(meta_indices)
         domain = Domain(attrs, classes, meta_attrs)
-        return storage_class.from_numpy(
-            domain, attrs and X, classes and Y, metas and meta_attrs)
+        if X is None:
+            n_rows = max([mat.shape[0] for mat in (Y, metas)
+                          if mat is not None] or [0])
+            X = sparse.csr_matrix((n_rows, 0))
+        return storage_class.from_numpy(domain, X, Y, metas)
+
+    @staticmethod
+    def _construct_variables(inds):
+        if inds:
+            return [ContinuousVariable(x.decode("utf-8")) for _, x in
+                    sorted((ind, name) for name, ind in inds.items())]
+
+    @staticmethod
+    def _to_domain_columns(mat, chunk_indices, indices, n_rows):
+        # Map columns of a matrix read from a chunk to columns of the domain
+        if not indices:
+            return None
+        if mat is None:
+            return sparse.csr_matrix((n_rows, len(indices)))
+        mapping = np.empty(len(chunk_indices), dtype=mat.indices.dtype)
+        for name, ind in chunk_indices.items():
+            mapping[ind] = indices[name]
+        mat = sparse.csr_matrix((mat.data, mapping[mat.indices], mat.indptr),
+                                (n_rows, len(indices)))
+        mat.sort_indices()
+        return mat
+
+    @classmethod
+    def iter_chunks(cls, filename, chunk_size, storage_class=None):
+        """
+        Read the file in chunks and yield tables with at most `chunk_size`
+        rows. The file is read twice: the first pass collects the names
+        of variables, so that all tables have the same domain.
+        """
+        if storage_class is None:
+            from ..data import Table as storage_class
+        fname = filename.encode(sys.getdefaultencoding())
+        ranges = list(_chunk_ranges(filename, chunk_size))
+        all_indices = ({}, {}, {})
+        for beg, end in ranges:
+            chunk = _io.sparse_read_float(fname, beg, end)
+            for indices, chunk_indices in zip(all_indices, chunk[3:]):
+                for name, _ in sorted(chunk_indices.items(),
+                                      key=lambda item: item[1]):
+                    indices.setdefault(name, len(indices))
+        domain = Domain(*map(cls._construct_variables, all_indices))
+        for beg, end in ranges:
+            chunk = _io.sparse_read_float(fname, beg, end)
+            n_rows = max([mat.shape[0] for mat in chunk[:3]
+                          if mat is not None] or [0])
+            if not n_rows:
+                continue
+            X, Y, metas = [
+                cls._to_domain_columns(mat, chunk_indices, indices, n_rows)
+                for mat, chunk_indices, indices
+                in zip(chunk[:3], chunk[3:], all_indices)]
+            if X is None:
+                X = sparse.csr_matrix((n_rows, 0))
+            yield storage_class.from_numpy(domain, X, Y, metas)
 
 
 @FileFormats.register("Excel file", ".xlsx")
@@ -648,11 +1160,345 @@ class ExcelFormat:
 
 @FileFormats.register("Pickled table", ".pickle")
 class PickleFormat:
+    SUPPORTS_COMPRESSION = True
+
     @classmethod
     def read_file(cls, file, _=None):
-        return pickle.load(open(file, "rb"))
+        with open_compressed(file, "rb") as f:
+            return pickle.load(f)
 
     @classmethod
     def write_file(cls, filename, table):
-        pickle.dump(table, open(filename, "wb"))
+        with open_compressed(filename, "wb") as f:
+            pickle.dump(table, f)
+
+
+@FileFormats.register("Binary table", ".orb")
+class BinaryFormat:
+    """
+    A binary format that stores columns of X, Y and weights as raw
+    little-endian arrays, so that reading the file only memory-maps them and
+    the pages are loaded from the disk when the data is actually used.
+    String meta attributes are stored as lengths and concatenated UTF-8
+    encoded values; meta attributes are decoded when the file is read.
+    The domain is described in a JSON header.
+    """
+    MAGIC = b"ORANGEBT"
+    VERSION = 1
+    ALIGNMENT = 64
+
+    @classmethod
+    def _align(cls, offset):
+        return -(-offset // cls.ALIGNMENT) * cls.ALIGNMENT
+
+    @staticmethod
+    def _describe_variable(var):
+        desc = {"name": var.name,
+                "attributes": {str(k): str(v)
+                               for k, v in var.attributes.items()}}
+        if var.is_discrete:
+            desc.update(type="d", values=list(var.values),
+                        ordered=bool(var.ordered),
+                        base_value=int(var.base_value))
+        elif var.is_continuous:
+            desc.update(type="c", decimals=int(var.number_of_decimals))
+        elif var.is_string:
+            desc.update(type="s")
+        else:
+            raise ValueError("Variable {} cannot be stored in a binary "
+                             "table".format(var.name))
+        return desc
 
+    @staticmethod
+    def _make_variable(desc):
+        if desc["type"] == "c":
+            var = ContinuousVariable.make(desc["name"])
+            TabDelimFormat._adjust_decimals(var, desc["decimals"])
+        elif desc["type"] == "d":
+            var = DiscreteVariable.make(desc["name"], desc["values"],
+                                        desc["ordered"], desc["base_value"])
+        else:
+            var = StringVariable.make(desc["name"])
+        var.attributes.update(desc["attributes"])
+        return var
+
+    @staticmethod
+    def _recode(column, desc, var):
+        # Variable.make may return a variable with a different order of values
+        if desc["type"] != "d" or var.values[:len(desc["values"])] == \
+                desc["values"]:
+            return
+        mapping = np.array([var.values.index(val) for val in desc["values"]],
+                           dtype=float)
+        known = ~np.isnan(column)
+        column[known] = mapping[column[known].astype(int)]
+
+    @classmethod
+    def write_file(cls, filename, data):
+        """
+        Save data to file.
+
+        :param filename: the name of the file
+        :type filename: str
+        :param data: the data to be saved
+        :type data: Orange.data.Table
+        """
+        if any(sparse.issparse(arr) for arr in (data.X, data._Y, data.metas)):
+            raise ValueError("Sparse data cannot be stored in a binary table")
+        domain = data.domain
+        n_rows = len(data)
+        header = {"version": cls.VERSION, "n_rows": n_rows,
+                  "weights": bool(data.has_weights()), "sections": {}}
+        for part in ("attributes", "class_vars", "metas"):
+            header[part] = [cls._describe_variable(var)
+                            for var in getattr(domain, part)]
+
+        size = 0
+
+        def add_section(name, n_bytes):
+            nonlocal size
+            header["sections"][name] = size
+            size = cls._align(size + n_bytes)
+
+        add_section("X", n_rows * len(domain.attributes) * 8)
+        add_section("Y", n_rows * len(domain.class_vars) * 8)
+        if header["weights"]:
+            add_section("W", n_rows * 8)
+        primitive = [i for i, var in enumerate(domain.metas)
+                     if var.is_primitive()]
+        add_section("metas", n_rows * len(primitive) * 8)
+        strings = {}
+        for i, var in enumerate(domain.metas):
+            if var.is_primitive():
+                continue
+            values = [None if val is None or
+                      isinstance(val, float) and np.isnan(val)
+                      else str(val).encode("utf-8")
+                      for val in data.metas[:, i]]
+            lengths = np.array([-1 if val is None else len(val)
+                                for val in values], dtype="<i8")
+            strings[i] = lengths, b"".join(val or b"" for val in values)
+            add_section("lengths{}".format(i), n_rows * 8)
+            add_section("strings{}".format(i), len(strings[i][1]))
+            header["metas"][i]["size"] = len(strings[i][1])
+
+        encoded = json.dumps(header).encode("utf-8")
+        start = cls._align(len(cls.MAGIC) + 8 + len(encoded))
+        sections = header["sections"]
+
+        def write_columns(name, arr):
+            f.seek(start + sections[name])
+            for col in arr.T:
+                np.asarray(col, dtype="<f8").tofile(f)
+
+        with open(filename, "wb") as f:
+            f.write(cls.MAGIC)
+            f.write(np.array([len(encoded)], dtype="<u8").tobytes())
+            f.write(encoded)
+            write_columns("X", data.X)
+            write_columns("Y", data._Y)
+            if header["weights"]:
+                write_columns("W", data.W.reshape(n_rows, 1))
+            write_columns("metas", data.metas[:, primitive].astype(float))
+            for i, (lengths, values) in strings.items():
+                f.seek(start + sections["lengths{}".format(i)])
+                lengths.tofile(f)
+                f.write(values)
+            f.truncate(start + size)
+
+    def read_file(self, filename, cls=None):
+        from ..data import Table
+        if cls is None:
+            cls = Table
+        with open(filename, "rb") as f:
+            if f.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError(
+                    "File {} is not a binary table".format(filename))
+            header_size = int(np.frombuffer(f.read(8), dtype="<u8")[0])
+            header = json.loads(f.read(header_size).decode("utf-8"))
+            if header["version"] > self.VERSION:
+                raise ValueError("Binary table {} has unsupported version {}".
+                                 format(filename, header["version"]))
+            start = self._align(len(self.MAGIC) + 8 + header_size)
+            n_rows, sections = header["n_rows"], header["sections"]
+
+            def read_columns(name, n_columns):
+                if not n_rows or not n_columns:
+                    return np.zeros((n_rows, n_columns))
+                # Copy-on-write, so that changes do not reach the file
+                return np.memmap(filename, dtype="<f8", mode="c",
+                                 offset=start + sections[name],
+                                 shape=(n_columns, n_rows)).T
+
+            meta_descs = header["metas"]
+            metas = np.empty((n_rows, len(meta_descs)), dtype=object)
+            primitive = [i for i, desc in enumerate(meta_descs)
+                         if desc["type"] != "s"]
+            if primitive:
+                metas[:, primitive] = read_columns("metas", len(primitive))
+            for i, desc in enumerate(meta_descs):
+                if desc["type"] != "s":
+                    continue
+                f.seek(start + sections["lengths{}".format(i)])
+                lengths = np.frombuffer(f.read(n_rows * 8), dtype="<i8")
+                values = f.read(desc["size"])
+                ends = np.cumsum(np.maximum(lengths, 0))
+                metas[:, i] = [
+                    None if length < 0 else
+                    values[end - length:end].decode("utf-8")
+                    for length, end in zip(lengths.tolist(), ends.tolist())]
+
+        X = read_columns("X", len(header["attributes"]))
+        Y = read_columns("Y", len(header["class_vars"]))
+        variables = []
+        for arr, descs in ((X, header["attributes"]),
+                           (Y, header["class_vars"])):
+            variables.append([])
+            for column, desc in zip(arr.T, descs):
+                var = self._make_variable(desc)
+                self._recode(column, desc, var)
+                variables[-1].append(var)
+        meta_vars = []
+        for i, desc in enumerate(meta_descs):
+            var = self._make_variable(desc)
+            if desc["type"] == "d":
+                column = metas[:, i].astype(float)
+                self._recode(column, desc, var)
+                metas[:, i] = column
+            meta_vars.append(var)
+
+        table = cls.from_domain(Domain(variables[0], variables[1], meta_vars))
+        table.X, table.Y, table.metas = X, Y, metas
+        if header["weights"]:
+            table.W = read_columns("W", 1)[:, 0]
+        else:
+            table.W = np.empty((n_rows, 0))
+        table.n_rows = n_rows
+        cls._init_ids(table)
+        return table
+
+
+class TableCache:
+    """
+    A cache of parsed data files, stored as binary tables (see
+    :obj:`BinaryFormat`) in the given directory.
+
+    Entries are keyed by the absolute path, size and modification time of
+    the file and by the reader, so a changed file is parsed again. When the
+    total size of the cache exceeds `max_size` bytes, the least recently
+    used entries are removed. Files smaller than `min_size` bytes, files
+    that are already binary and tables that cannot be stored as binary
+    tables (e.g. sparse data) are not cached.
+    """
+    VERSION = 1
+    EXTENSION = ".orb"
+
+    def __init__(self, directory, max_size=1 << 30, min_size=1 << 20):
+        self.directory = directory
+        self.max_size = max_size
+        self.min_size = min_size
+
+    def _entry(self, filename, reader):
+        stat = os.stat(filename)
+        if stat.st_size < self.min_size or \
+                issubclass(reader, (BinaryFormat, PickleFormat)):
+            return None
+        key = json.dumps([self.VERSION, os.path.abspath(filename),
+                          stat.st_size, stat.st_mtime_ns,
+                          reader.__module__, reader.__qualname__])
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + self.EXTENSION)
+
+    @staticmethod
+    def _is_cacheable(data):
+        return all(type(var) in (ContinuousVariable, DiscreteVariable,
+                                 StringVariable)
+                   for var in chain(data.domain.variables,
+                                    data.domain.metas)) and \
+            not any(sparse.issparse(arr)
+                    for arr in (data.X, data._Y, data.metas))
+
+    def get(self, filename, reader, cls=None):
+        """
+        Return the cached table for the file read by the given reader,
+        or `None` if there is none.
+
+        The table's arrays are copied from the memory-mapped file into
+        ordinary (C-contiguous) arrays, so the table is the same as the one
+        read from the file.
+        """
+        entry = self._entry(filename, reader)
+        if entry is None or not os.path.exists(entry):
+            return None
+        try:
+            data = BinaryFormat().read_file(entry, cls)
+            data.X = np.array(data.X, order="C")
+            data._Y = np.array(data._Y, order="C")
+            data.W = np.array(data.W, order="C")
+            # Mark the entry as recently used
+            os.utime(entry)
+        except (OSError, ValueError, KeyError):
+            self._remove(entry)
+            return None
+        return data
+
+    def put(self, filename, reader, data):
+        """
+        Store the table read from the file by the given reader and remove
+        the least recently used entries if the cache is too large.
+        """
+        entry = self._entry(filename, reader)
+        if entry is None or not self._is_cacheable(data):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        os.close(fd)
+        try:
+            BinaryFormat.write_file(temp_name, data)
+            os.replace(temp_name, entry)
+        except (OSError, ValueError):
+            self._remove(temp_name)
+            return
+        self.evict()
+
+    def entries(self):
+        """Return a list of (filename, size, last use) of cached tables."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        entries = []
+        for name in names:
+            if not name.endswith(self.EXTENSION):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def evict(self):
+        """Remove the least recently used entries above `max_size`."""
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        for path, entry_size, _ in entries:
+            if size <= self.max_size:
+                break
+            if self._remove(path):
+                size -= entry_size
+
+    def clear(self):
+        """Remove all cached tables."""
+        for path, _, _ in self.entries():
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        # Files that are memory-mapped cannot be removed on Windows
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
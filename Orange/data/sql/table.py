@@ -467,6 +467,111 @@ class SqlTable(table.Table):
             conts[row_index, col_index] = count
         return conts
 
+    def _compute_group_stats(self, group_vars, columns=None):
+        group_vars, columns = self._group_columns(group_vars, columns)
+        group_fields = [var.to_sql() for var in group_vars]
+        fields = list(group_fields)
+        for col in columns:
+            stats = self.GROUP_CONTINUOUS_STATS if col.is_continuous \
+                else self.DISCRETE_STATS
+            fields.append(stats % dict(field_name=col.to_sql()))
+        query = self._sql_query(
+            fields, filters=['%s IS NOT NULL' % f for f in group_fields],
+            group_by=group_fields)
+        with self._execute_sql_query(query) as cur:
+            results = self._sort_groups(group_vars, cur.fetchall())
+        groups = self._group_values(group_vars, results)
+        stats = [np.zeros((len(results), 6)) for _ in columns]
+        for g, result in enumerate(results):
+            result = tuple(np.nan if value is None else value
+                           for value in result)
+            i = len(group_vars)
+            for col, col_stats in zip(columns, stats):
+                if col.is_continuous:
+                    col_stats[g] = result[i:i+6]
+                    i += 6
+                else:
+                    col_stats[g] = (np.nan,) * 4 + result[i:i+2]
+                    i += 2
+        return groups, stats
+
+    def _compute_group_distributions(self, group_vars, columns=None):
+        group_vars, columns = self._group_columns(group_vars, columns)
+        group_fields = [var.to_sql() for var in group_vars]
+        filters = ['%s IS NOT NULL' % f for f in group_fields]
+        query = self._sql_query(group_fields, filters=filters,
+                                group_by=group_fields)
+        with self._execute_sql_query(query) as cur:
+            results = self._sort_groups(group_vars, cur.fetchall())
+        group_index = {result: g for g, result in enumerate(results)}
+
+        dists = []
+        for col in columns:
+            field_name = col.to_sql()
+            fields = group_fields + [field_name, "COUNT(*)"]
+            query = self._sql_query(fields, filters=filters,
+                                    group_by=group_fields + [field_name])
+            with self._execute_sql_query(query) as cur:
+                data = cur.fetchall()
+            unknowns = np.zeros(len(results))
+            known = []
+            for *group, value, count in data:
+                g = group_index[tuple(group)]
+                if value is None:
+                    unknowns[g] += count
+                else:
+                    known.append((g, value, count))
+            if col.is_continuous:
+                values = np.array(sorted({value for _, value, _ in known}),
+                                  dtype=float)
+                value_index = {value: i for i, value in enumerate(values)}
+                dist = np.zeros((len(results), len(values)))
+                for g, value, count in known:
+                    dist[g, value_index[value]] += count
+                dists.append(([values, dist], unknowns))
+            else:
+                dist = np.zeros((len(results), len(col.values)))
+                for g, value, count in known:
+                    dist[g, col.to_val(value)] += count
+                dists.append((dist, unknowns))
+        return self._group_values(group_vars, results), dists
+
+    def _group_columns(self, group_vars, columns):
+        group_vars = [self.domain[var] for var in group_vars]
+        if columns is None:
+            columns = [var for var in self.domain.variables
+                       if var not in group_vars]
+        else:
+            columns = [self.domain[col] for col in columns]
+        if any(not (var.is_continuous or var.is_discrete)
+               for var in columns):
+            raise ValueError("group statistics can be computed only for "
+                             "discrete and continuous values")
+        return group_vars, columns
+
+    @staticmethod
+    def _sort_groups(group_vars, results):
+        # Order the rows of results (starting with values of group
+        # variables) by values, as in Orange.data.Table
+        def key(result):
+            return tuple(var.to_val(value) if var.is_discrete else value
+                         for var, value in zip(group_vars, result))
+        return sorted(results, key=key)
+
+    @staticmethod
+    def _group_values(group_vars, results):
+        groups = []
+        for i, var in enumerate(group_vars):
+            if var.is_string:
+                values = np.array([result[i] for result in results],
+                                  dtype=object)
+            else:
+                values = np.array([var.to_val(result[i])
+                                   if var.is_discrete else result[i]
+                                   for result in results], dtype=float)
+            groups.append(values)
+        return groups
+
     def X_density(self):
         return self.DENSE
 
@@ -583,6 +688,11 @@ class SqlTable(table.Table):
                        "AVG(%(field_name)s)::double precision, " \
                        "STDDEV(%(field_name)s)::double precision, " \
                        + DISCRETE_STATS
+    GROUP_CONTINUOUS_STATS = "MIN(%(field_name)s)::double precision, " \
+                             "MAX(%(field_name)s)::double precision, " \
+                             "AVG(%(field_name)s)::double precision, " \
+                             "VAR_POP(%(field_name)s)::double precision, " \
+                             + DISCRETE_STATS
 
     def quote_identifier(self, value):
         return '"%s"' % value
@@ -86,3 +86,41 @@ class Storage:
         :type row_var: int, variable name or :obj:`Orange.data.DiscreteVariable`
         """
         raise NotImplementedError
+
+    def _compute_group_stats(self, group_vars, columns=None):
+        """
+        Compute basic stats of the columns within groups of rows with equal
+        values of the group variables. Rows with missing values of group
+        variables are not included in any group.
+
+        :param group_vars: variables that define the groups
+        :type group_vars: list of ints, variable names or descriptors of type
+            :obj:`Orange.data.Variable`
+        :param columns: discrete or continuous columns to compute stats for;
+            None = variables that do not define the groups
+        :return: a pair; the first element is a list with an array of values
+            of each group variable, giving the groups ordered by these
+            values, and the second is a list with an array for each column,
+            where row i contains (min, max, mean, variance, #nans, #non-nans)
+            for the i-th group
+        """
+        raise NotImplementedError
+
+    def _compute_group_distributions(self, group_vars, columns=None):
+        """
+        Compute distributions of values of the columns within groups of rows
+        with equal values of the group variables (see
+        :obj:`_compute_group_stats`).
+
+        :param group_vars: variables that define the groups
+        :type group_vars: list of ints, variable names or descriptors of type
+            :obj:`Orange.data.Variable`
+        :param columns: discrete or continuous columns to compute
+            distributions for; None = variables that do not define the groups
+        :return: a pair; the first element is a list of arrays with values of
+            group variables, like in :obj:`_compute_group_stats`, and the
+            second is a list of distributions for the columns in the format
+            of contingencies (see :obj:`_compute_contingency`), where the
+            rows correspond to groups
+        """
+        raise NotImplementedError
@@ -1,12 +1,15 @@
 import os
 import zlib
-from collections import MutableSequence, Iterable, Sequence, Sized
+from collections import MutableSequence, Iterable, Sequence, Sized, \
+    OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from itertools import chain
 from numbers import Real, Integral
 import operator
 from functools import reduce
 from warnings import warn
-from threading import Lock
+from threading import Lock, local
+from weakref import WeakSet
 import tempfile
 import urllib.parse
 import urllib.request
@@ -18,6 +21,8 @@ from .instance import *
 from Orange.data import (domain as orange_domain,
                          io, DiscreteVariable, ContinuousVariable, Variable)
 from Orange.data.storage import Storage
+from Orange.data.util import SharedComputeValue, ConversionCache
+from Orange.misc.pickling import picklable_array
 from . import _contingency
 from . import _valuecount
 
@@ -68,10 +73,12 @@ class RowInstance(Instance):
     def weight(self, weight):
         if not self.table.has_weights():
             self.table.set_weights()
+        self.table._changing()
         self.table.W[self.row_index] = weight
 
     def set_class(self, value):
         self._check_single_class()
+        self.table._changing()
         if not isinstance(value, Real):
             value = self.table.domain.class_var.to_val(value)
         self._y[0] = value
@@ -79,6 +86,7 @@ class RowInstance(Instance):
             self.table._Y[self.row_index, 0] = value
 
     def __setitem__(self, key, value):
+        self.table._changing()
         if not isinstance(key, Integral):
             key = self._domain.index(key)
         if isinstance(value, str):
@@ -140,10 +148,38 @@ class Columns:
             setattr(self, v.name.replace(" ", "_"), v)
 
 
-# noinspection PyPep8Naming
+def _copy_statistic(result):
+    # Copy a computed statistic, which is a numpy array, a number or a
+    # (nested) tuple or list of them
+    if isinstance(result, np.ndarray):
+        return result.copy()
+    if isinstance(result, (tuple, list)):
+        return type(result)(_copy_statistic(part) for part in result)
+    return result
+
+
 class Table(MutableSequence, Storage):
     __file__ = None
 
+    #: The maximal number of statistics (e.g. distributions of columns)
+    #: that a table keeps (see :obj:`_cached_columns`)
+    statistics_cache_size = 1000
+
+    # Replacing these arrays changes the table (see _changing)
+    _counted_arrays = frozenset(("X", "_Y", "metas", "W"))
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self._counted_arrays:
+            counter = self.__dict__.get("_changes")
+            if counter is not None:
+                counter[0] += 1
+        # The buffer of a replaced array is no longer needed (see
+        # _resize_all)
+        buffers = self.__dict__.get("_buffers")
+        if buffers and name in buffers:
+            del buffers[name]
+
     @property
     def columns(self):
         """
@@ -186,13 +222,13 @@ class Table(MutableSequence, Storage):
             else:
                 return cls.from_file(args[0], **kwargs)
         elif isinstance(args[0], Table):
-            return cls.from_table(args[0].domain, args[0])
+            return cls.from_table(args[0].domain, args[0], **kwargs)
         elif isinstance(args[0], orange_domain.Domain):
             domain, args = args[0], args[1:]
             if not args:
                 return cls.from_domain(domain, **kwargs)
             if isinstance(args[0], Table):
-                return cls.from_table(domain, *args)
+                return cls.from_table(domain, *args, **kwargs)
             elif isinstance(args[0], list):
                 return cls.from_list(domain, *args)
         else:
@@ -228,10 +264,13 @@ class Table(MutableSequence, Storage):
         cls._init_ids(self)
         return self
 
-    conversion_cache = None
+    #: Tables converted by :obj:`from_table_cached`
+    conversion_cache = ConversionCache()
+    # Conversions made within the outermost call of from_table, per thread
+    _conversion_scratch = local()
 
     @classmethod
-    def from_table(cls, domain, source, row_indices=...):
+    def from_table(cls, domain, source, row_indices=..., dtype=None):
         """
         Create a new table from selected columns and/or rows of an existing
         one. The columns are chosen using a domain. The domain may also include
@@ -246,9 +285,14 @@ class Table(MutableSequence, Storage):
         :type source: Orange.data.Table
         :param row_indices: indices of the rows to include
         :type row_indices: a slice or a sequence
+        :param dtype: the type of X and Y (e.g. `np.float32`); by default,
+            the type follows the source
+        :type dtype: numpy.dtype
         :return: a new table
         :rtype: Orange.data.Table
         """
+        if dtype is not None:
+            return cls.from_table(domain, source, row_indices)._astype(dtype)
 
         def get_columns(row_indices, src_cols, n_rows):
             if not len(src_cols):
@@ -281,10 +325,18 @@ class Table(MutableSequence, Storage):
                 if col is None:
                     a[:, i] = Unknown
                 elif not isinstance(col, Integral):
+                    if isinstance(col, SharedComputeValue):
+                        if col.compute_shared not in shared_cache:
+                            shared_cache[col.compute_shared] = \
+                                col.compute_shared(source)
+                        column = col(source,
+                                     shared_cache[col.compute_shared])
+                    else:
+                        column = col(source)
                     if row_indices is not ...:
-                        a[:, i] = col(source)[row_indices]
+                        a[:, i] = column[row_indices]
                     else:
-                        a[:, i] = col(source)
+                        a[:, i] = column
                 elif col < 0:
                     a[:, i] = source.metas[row_indices, -1 - col]
                 elif col < n_src_attrs:
@@ -293,17 +345,21 @@ class Table(MutableSequence, Storage):
                     a[:, i] = source._Y[row_indices, col - n_src_attrs]
             return a
 
-        new_cache = Table.conversion_cache is None
+        scratch = Table._conversion_scratch
+        new_cache = getattr(scratch, "converted", None) is None
         try:
             if new_cache:
-                Table.conversion_cache = {}
+                scratch.converted = {}
             else:
-                cached = Table.conversion_cache.get((id(domain), id(source)))
+                cached = scratch.converted.get((id(domain), id(source)))
                 if cached:
                     return cached
             if domain == source.domain:
                 return Table.from_table_rows(source, row_indices)
 
+            # Results of computations shared by compute_values of variables
+            shared_cache = {}
+
             if isinstance(row_indices, slice):
                 start, stop, stride = row_indices.indices(source.X.shape[0])
                 n_rows = (stop - start) // stride
@@ -333,11 +389,41 @@ class Table(MutableSequence, Storage):
                 self.ids = np.array(source.ids[row_indices])
             else:
                 cls._init_ids(self)
-            Table.conversion_cache[(id(domain), id(source))] = self
+            self._share_data(source)
+            scratch.converted[(id(domain), id(source))] = self
             return self
         finally:
             if new_cache:
-                Table.conversion_cache = None
+                scratch.converted = None
+
+    @classmethod
+    def from_table_cached(cls, domain, source):
+        """
+        Return the source table converted to the given domain, like
+        :obj:`from_table`. Conversions of unchanged tables are reused from
+        :obj:`conversion_cache`, so the result may be shared with other
+        callers and must not be modified.
+
+        :param domain: the domain for the new table
+        :type domain: Orange.data.Domain
+        :param source: the source table
+        :type source: Orange.data.Table
+        :return: a converted table
+        :rtype: Orange.data.Table
+        """
+        if domain == source.domain:
+            return source
+        cache = Table.conversion_cache
+        table = cache.get(domain, source)
+        if table is None:
+            table = cls.from_table(domain, source)
+            cache.put(domain, source, table)
+            # Tables from the cache do not share the change counter with the
+            # source, so changing them does not invalidate the entry
+            cached = cache.get(domain, source)
+            if cached is not None:
+                table = cached
+        return table
 
     @classmethod
     def from_table_rows(cls, source, row_indices):
@@ -363,15 +449,136 @@ class Table(MutableSequence, Storage):
         self.W = source.W[row_indices]
         self.name = getattr(source, 'name', '')
         self.ids = np.array(source.ids[row_indices])
+        self._share_data(source)
         return self
 
+    def _share_data(self, source):
+        # Arrays of this table may be views of the source's, so the tables
+        # share the change counter; the source does not resize its arrays
+        # while they are shared (see _resize_all)
+        self._changes = source._change_counter()
+        if any(np.may_share_memory(self.__dict__[name], source.__dict__[name])
+               for name in ("X", "_Y", "metas", "W")):
+            views = source.__dict__.get("_views")
+            if views is None:
+                views = source.__dict__.setdefault("_views", WeakSet())
+            views.add(self)
+
+    def _changing(self):
+        # Called before changing the arrays in place, so that statistics
+        # cached by tables that share the counter (and possibly the data)
+        # are recomputed
+        self._change_counter()[0] += 1
+
+    def _change_counter(self):
+        # Tables whose arrays are views of this table's share the counter
+        counter = self.__dict__.get("_changes")
+        if counter is None:
+            counter = self.__dict__.setdefault("_changes", [0])
+        return counter
+
+    def _statistics_cache(self):
+        # An ordered dictionary of computed statistics, with the least
+        # recently used first; it is emptied when the table is changed
+        # through its methods or its arrays are replaced (see _changing);
+        # values written directly into the arrays are not tracked
+        version = self._change_counter()[0]
+        cached = self.__dict__.get("_stats")
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        stats = OrderedDict()
+        self._stats = version, stats
+        return stats
+
+    def _cached_columns(self, kind, columns, compute, copy_results=True):
+        # Return the statistics of the given kind for the columns; only the
+        # statistics of columns that are not cached are computed (by
+        # calling `compute` with the list of these columns)
+        stats = self._statistics_cache()
+        missing = []
+        for col in columns:
+            if (kind, col) not in stats and col not in missing:
+                missing.append(col)
+        if missing:
+            computed = compute(missing)
+            for col, result in zip(missing, computed):
+                stats[kind, col] = result
+        results = []
+        for col in columns:
+            stats.move_to_end((kind, col))
+            results.append(stats[kind, col])
+        while len(stats) > self.statistics_cache_size:
+            stats.popitem(last=False)
+        if not copy_results:
+            return results
+        # Callers may change the results (e.g. distributions) in place
+        return [_copy_statistic(result) for result in results]
+
+    def _sort_orders(self, columns):
+        """
+        Return the orders of values (as given by `argsort`, with missing
+        values at the end) in the given dense columns. The orders are
+        computed in threads and are not kept by the table.
+
+        :param columns: indices of columns
+        :type columns: list of int
+        :return: a list of arrays of row indices
+        """
+        def sort_order(col):
+            values, _ = self.get_column_view(col)
+            return np.ascontiguousarray(values, dtype=np.float64).argsort()
+
+        return _map_in_threads(sort_order, list(columns))
+
     @classmethod
-    def from_numpy(cls, domain, X, Y=None, metas=None, W=None):
+    def concatenate(cls, tables):
+        """
+        Construct a new table with the rows of the given tables. Tables with
+        a different domain are converted to the domain of the first table.
+        The arrays of the new table are allocated only once.
+
+        :param tables: tables whose rows are concatenated
+        :type tables: a sequence of Orange.data.Table
+        :return: a new table
+        :rtype: Orange.data.Table
+        """
+        tables = list(tables)
+        if not tables:
+            raise ValueError("concatenate requires at least one table")
+        domain = tables[0].domain
+        tables = [table if table.domain == domain
+                  else cls.from_table(domain, table) for table in tables]
+
+        def concat(arrays):
+            if any(sp.issparse(arr) for arr in arrays):
+                return sp.vstack(arrays, format="csr")
+            return np.concatenate(arrays)
+
+        self = cls.__new__(Table)
+        self.domain = domain
+        self.X = concat([table.X for table in tables])
+        self._Y = concat([table._Y for table in tables])
+        self.metas = concat([table.metas for table in tables])
+        if any(table.has_weights() for table in tables):
+            self.W = np.concatenate([
+                table.W if table.has_weights() else np.ones(len(table))
+                for table in tables])
+        else:
+            self.W = np.empty((self.X.shape[0], 0))
+        self.ids = np.concatenate([table.ids for table in tables])
+        self.name = getattr(tables[0], 'name', '')
+        return self
+
+    @classmethod
+    def from_numpy(cls, domain, X, Y=None, metas=None, W=None,
+                   dtype=np.float64):
         """
         Construct a table from numpy arrays with the given domain. The number
         of variables in the domain must match the number of columns in the
         corresponding arrays. All arrays must have the same number of rows.
         Arrays may be of different numpy types, and may be dense or sparse.
+        X and Y are stored as `dtype`; `np.float32` halves the memory and
+        is exact for values of discrete variables.
 
         :param domain: the domain for the new table
         :type domain: Orange.data.Domain
@@ -383,9 +590,12 @@ class Table(MutableSequence, Storage):
         :type metas: np.array
         :param W: array with weights
         :type W: np.array
+        :param dtype: the type of X and Y
+        :type dtype: numpy.dtype
         :return:
         """
-        X, Y, W = _check_arrays(X, Y, W, dtype='float64')
+        X, Y = _check_arrays(X, Y, dtype=dtype)
+        W, = _check_arrays(W, dtype='float64')
         metas, = _check_arrays(metas)
 
         if Y is not None and Y.ndim == 1:
@@ -439,6 +649,12 @@ class Table(MutableSequence, Storage):
     def from_list(cls, domain, rows, weights=None):
         if weights is not None and len(rows) != len(weights):
             raise ValueError("mismatching number of instances and weights")
+        if len(rows) and all(isinstance(row, Instance) and
+                             row.domain is rows[0].domain for row in rows):
+            self = cls._from_instances(domain, rows)
+            if weights is not None:
+                self.W = np.array(weights)
+            return self
         self = cls.from_domain(domain, len(rows), weights is not None)
         attrs, classes = domain.attributes, domain.class_vars
         metas = domain.metas
@@ -456,6 +672,20 @@ class Table(MutableSequence, Storage):
             self.W = np.array(weights)
         return self
 
+    @classmethod
+    def _from_instances(cls, domain, instances):
+        # Stack the values of instances from the same domain and convert
+        # them to `domain` at once, with the domain conversion's plan
+        source_domain = instances[0].domain
+        X = np.vstack([inst._x for inst in instances])
+        Y = np.vstack([inst._y for inst in instances])
+        metas = np.vstack([inst._metas for inst in instances])
+        if source_domain != domain:
+            source = Table.from_numpy(source_domain, X, Y, metas)
+            X, Y, metas = domain.get_conversion(source_domain).convert_arrays(
+                X, Y, metas, source)
+        return cls.from_numpy(domain, X, Y, metas)
+
     @classmethod
     def _init_ids(cls, obj):
         with cls._next_instance_lock:
@@ -473,7 +703,7 @@ class Table(MutableSequence, Storage):
         :param filename: File name
         :type filename: str
         """
-        ext = os.path.splitext(filename)[1]
+        _, ext, compression = io.split_extension(filename)
         writer = io.FileFormats.writers.get(ext)
         if not writer:
             desc = io.FileFormats.names.get(ext)
@@ -482,22 +712,80 @@ class Table(MutableSequence, Storage):
                     format(desc.lower()))
             else:
                 raise IOError("Unknown file name extension.")
+        if compression and not getattr(writer, "SUPPORTS_COMPRESSION", False):
+            raise IOError("Writing of compressed {}s is not supported".
+                          format(io.FileFormats.names[ext].lower()))
         writer().write_file(filename, self)
 
+    #: If set to an instance of :obj:`Orange.data.io.TableCache`,
+    #: :obj:`from_file` stores the parsed files in it and reuses them
+    file_cache = None
+
     @classmethod
-    def from_file(cls, filename):
+    def from_file(cls, filename, dtype=None):
         """
         Read a data table from a file. The path can be absolute or relative.
 
         :param filename: File name
         :type filename: str
+        :param dtype: the type of X and Y (e.g. `np.float32`); by default,
+            the data is stored as `np.float64`
+        :type dtype: numpy.dtype
         :return: a new data table
         :rtype: Orange.data.Table
         """
+        absolute_filename, reader = cls._find_file(filename)
+        cache = Table.file_cache
+        data = cache and cache.get(absolute_filename, reader, cls)
+        if data is None:
+            data = reader().read_file(absolute_filename, cls)
+            if cache is not None:
+                cache.put(absolute_filename, reader, data)
+        data.name = io.split_extension(os.path.split(filename)[-1])[0]
+        # no need to call _init_ids as fuctions from .io already
+        # construct a table with .ids
+
+        data.__file__ = absolute_filename
+        if dtype is not None:
+            data._astype(dtype)
+        return data
+
+    @classmethod
+    def iter_chunks(cls, filename, chunk_size=10000):
+        """
+        Read a data table from a file in chunks. The function yields tables
+        with at most `chunk_size` rows and the same domain, so that files
+        that do not fit into memory can be processed sequentially.
+
+        :param filename: File name
+        :type filename: str
+        :param chunk_size: the maximal number of rows in a chunk
+        :type chunk_size: int
+        :return: a generator of data tables
+        """
+        absolute_filename, reader = cls._find_file(filename)
+        reader = reader()
+        if not hasattr(reader, "iter_chunks"):
+            ext = io.split_extension(absolute_filename)[1]
+            raise IOError("Reading {}s in chunks is not supported".format(
+                io.FileFormats.names[ext].lower()))
+        name = io.split_extension(os.path.split(filename)[-1])[0]
+        for data in reader.iter_chunks(absolute_filename, chunk_size, cls):
+            data.name = name
+            data.__file__ = absolute_filename
+            yield data
+
+    @staticmethod
+    def _find_file(filename):
+        """
+        Return the absolute path to the file and the reader for its format.
+        Compressed files (e.g. `data.tab.gz`) are read by the reader for
+        the format, if it supports compression.
+        """
         for dir in dataset_dirs:
-            ext = os.path.splitext(filename)[1]
+            _, ext, compression = io.split_extension(filename)
             absolute_filename = os.path.join(dir, filename)
-            if not ext:
+            if not ext and not compression:
                 for ext in io.FileFormats.readers:
                     if os.path.exists(absolute_filename + ext):
                         absolute_filename += ext
@@ -517,13 +805,10 @@ class Table(MutableSequence, Storage):
                     format(desc.lower()))
             else:
                 raise IOError("Unknown file name extension.")
-        data = reader().read_file(absolute_filename, cls)
-        data.name = os.path.splitext(os.path.split(filename)[-1])[0]
-        # no need to call _init_ids as fuctions from .io already
-        # construct a table with .ids
-
-        data.__file__ = absolute_filename
-        return data
+        if compression and not getattr(reader, "SUPPORTS_COMPRESSION", False):
+            raise IOError("Reading compressed {}s is not supported".
+                          format(io.FileFormats.names[ext].lower()))
+        return absolute_filename, reader
 
     @classmethod
     def from_url(cls, url):
@@ -578,37 +863,63 @@ class Table(MutableSequence, Storage):
                              self.metas_density()))
 
     # A helper function for extend and insert
-    # Resize X, Y, metas and W.
-    def _resize_all(self, new_length):
+    # Resize X, Y, metas, W and ids. The arrays are views of buffers that
+    # the table allocated and whose capacity grows geometrically, so that
+    # appending rows one by one takes amortized constant time. A buffer is
+    # reused only while the table's array is still the view that was made
+    # from it; the table's own arrays (e.g. those given to the constructor)
+    # are copied into new buffers. Rows of the arrays are never moved, so
+    # other references to the arrays keep their values; with `reallocate`,
+    # all arrays are copied (before moving the rows in insert).
+    # As with ndarray.resize before, tables whose arrays are views of other
+    # arrays, and tables whose rows are shared by other tables (see
+    # _share_data), cannot be resized.
+    def _resize_all(self, new_length, reallocate=False):
         old_length = self.X.shape[0]
         if old_length == new_length:
             return
         if not self._check_all_dense():
             raise ValueError("Tables with sparse data cannot be resized")
-        try:
-            self.X.resize(new_length, self.X.shape[1])
-            self._Y.resize(new_length, self._Y.shape[1])
-            self.metas.resize(new_length, self.metas.shape[1])
-            if self.W.ndim == 2:
-                self.W.resize((new_length, 0))
-            else:
-                self.W.resize(new_length)
-            self.ids.resize(new_length)
-        except Exception:
-            if self.X.shape[0] == new_length:
-                self.X.resize(old_length, self.X.shape[1])
-            if self._Y.shape[0] == new_length:
-                self._Y.resize(old_length, self._Y.shape[1])
-            if self.metas.shape[0] == new_length:
-                self.metas.resize(old_length, self.metas.shape[1])
-            if self.W.shape[0] == new_length:
-                if self.W.ndim == 2:
-                    self.W.resize((old_length, 0))
-                else:
-                    self.W.resize(old_length)
-            if self.ids.shape[0] == new_length:
-                self.ids.resize(old_length)
-            raise
+        table_dict = self.__dict__
+        buffers = table_dict.get("_buffers", {})
+        names = ("X", "_Y", "metas", "W", "ids")
+        for name in names:
+            if table_dict[name].base is not None and \
+                    buffers.get(name, (None, None))[1] is not table_dict[name]:
+                raise ValueError("cannot resize a table whose data is a "
+                                 "view of another array")
+        views = table_dict.get("_views")
+        if views:
+            for view in list(views):
+                if any(np.may_share_memory(view.__dict__[name],
+                                           table_dict[name])
+                       for name in names):
+                    raise ValueError("cannot resize a table whose data is "
+                                     "shared with another table")
+                views.discard(view)
+        self._changing()
+        if new_length > old_length:
+            capacity = max(new_length, 2 * old_length, 16)
+        else:
+            capacity = new_length
+        resized = {}
+        for name in names:
+            arr = table_dict[name]
+            buffer, view = buffers.get(name, (None, None))
+            if reallocate or arr is not view or new_length > len(buffer):
+                n_kept = min(old_length, new_length)
+                buffer = np.empty((capacity,) + arr.shape[1:], arr.dtype)
+                buffer[:n_kept] = arr[:n_kept]
+            if new_length > old_length:
+                buffer[old_length:new_length] = \
+                    None if buffer.dtype == object else 0
+            resized[name] = buffer, buffer[:new_length]
+        # The arrays are stored in the dictionary, so that __setattr__ does
+        # not discard the buffers; the dictionary is replaced, since it may
+        # be shared by a shallow copy of the table
+        table_dict["_buffers"] = resized
+        for name, (_, view) in resized.items():
+            table_dict[name] = view
 
     def __getitem__(self, key):
         if isinstance(key, Integral):
@@ -658,6 +969,7 @@ class Table(MutableSequence, Storage):
         if not self._check_all_dense():
             raise ValueError(
                 "Assignment to rows of sparse data is not supported")
+        self._changing()
         if not isinstance(key, tuple):
             if isinstance(value, Real):
                 self.X[key, :] = value
@@ -765,6 +1077,16 @@ class Table(MutableSequence, Storage):
         s += "\n]"
         return s
 
+    def __reduce_ex__(self, protocol):
+        # With protocol 5, the data of X, Y, metas, W and ids is pickled
+        # as out-of-band buffers; memory-mapped arrays become plain arrays
+        reduced = super().__reduce_ex__(protocol)
+        state = {name: picklable_array(value, protocol)
+                 for name, value in reduced[2].items()
+                 if name not in ("_changes", "_stats", "_buffers",
+                                 "_views")}
+        return reduced[:2] + (state,) + reduced[3:]
+
     def clear(self):
         """Remove all rows from the table."""
         if not self._check_all_dense():
@@ -793,7 +1115,7 @@ class Table(MutableSequence, Storage):
             row += len(self)
         if row < 0 or row > len(self):
             raise IndexError("Index out of range")
-        self._resize_all(len(self) + 1)
+        self._resize_all(len(self) + 1, reallocate=row < len(self))
         if row < len(self):
             self.X[row + 1:] = self.X[row:-1]
             self._Y[row + 1:] = self._Y[row:-1]
@@ -851,6 +1173,210 @@ class Table(MutableSequence, Storage):
             self._resize_all(old_length)
             raise
 
+    def join_indices(self, other, variables, other_variables=None,
+                     how="inner"):
+        """
+        Return the indices of rows of this table and of the `other` table
+        that are paired by joining the tables on equal values of the given
+        variables.
+
+        Values of discrete variables are compared by their labels, and
+        values of variables of different types by their string
+        representations. Missing values do not match. The pairs are ordered
+        by rows of this table and then by rows of the other table; in right
+        and outer joins, they are followed by the unmatched rows of the
+        other table.
+
+        :param other: the other table
+        :type other: Orange.data.Table
+        :param variables: key variables of this table
+        :type variables: list of int, str or Orange.data.Variable
+        :param other_variables: the corresponding variables of the other
+            table; the same as `variables` by default
+        :type other_variables: list of int, str or Orange.data.Variable
+        :param how: "inner", "left", "right" or "outer"
+        :type how: str
+        :return: a pair of arrays of row indices, where -1 marks a missing row
+        """
+        if how not in ("inner", "left", "right", "outer"):
+            raise ValueError("invalid join type '{}'".format(how))
+        if other_variables is None:
+            other_variables = variables
+        if not variables or len(variables) != len(other_variables):
+            raise ValueError("tables must be joined on pairs of variables")
+        left_keys, right_keys = _join_keys(self, other,
+                                           variables, other_variables)
+        return _join_codes(left_keys, right_keys, how)
+
+    def join_rows(self, other, rows, other_rows):
+        """
+        Return a table whose rows combine the given rows of this table with
+        the corresponding rows of the other table, with -1 denoting missing
+        rows (as returned by :obj:`join_indices`).
+
+        The domain consists of variables of this table, followed by those
+        variables of the other table that do not appear in this one. Values
+        of the shared variables are taken from the other table where the
+        row of this table is missing.
+
+        :param other: the other table
+        :type other: Orange.data.Table
+        :param rows: indices of rows of this table
+        :type rows: numpy.ndarray
+        :param other_rows: indices of rows of the other table
+        :type other_rows: numpy.ndarray
+        :return: a new table
+        :rtype: Orange.data.Table
+        """
+        if not (self._check_all_dense() and other._check_all_dense()):
+            raise ValueError("Tables with sparse data cannot be joined")
+        rows = np.asarray(rows, dtype=np.intp)
+        other_rows = np.asarray(other_rows, dtype=np.intp)
+        if rows.shape != other_rows.shape:
+            raise ValueError("rows and other_rows must have the same length")
+        own = set(chain(self.domain.variables, self.domain.metas))
+        parts = []
+        for own_vars, other_vars, arr, other_arr in (
+                (self.domain.attributes, other.domain.attributes,
+                 self.X, other.X),
+                (self.domain.class_vars, other.domain.class_vars,
+                 self._Y, other._Y),
+                (self.domain.metas, other.domain.metas,
+                 self.metas, other.metas)):
+            kept = [i for i, var in enumerate(other_vars) if var not in own]
+            if len(kept) != len(other_vars):
+                other_arr = other_arr[:, kept]
+            other_vars = [other_vars[i] for i in kept]
+            parts.append((
+                tuple(own_vars) + tuple(other_vars),
+                np.hstack((_take_rows(arr, rows),
+                           _take_rows(other_arr, other_rows)))))
+        (attributes, X), (class_vars, Y), (metas, M) = parts
+        domain = orange_domain.Domain(attributes, class_vars, metas)
+
+        missing = rows < 0
+        if missing.any():
+            n_attrs = len(attributes)
+            for var in chain(other.domain.variables, other.domain.metas):
+                if var not in own:
+                    continue
+                values = other.get_column_view(var)[0][other_rows[missing]]
+                pos = domain.index(var)
+                if 0 <= pos < n_attrs:
+                    X[missing, pos] = values
+                elif pos >= n_attrs:
+                    Y[missing, pos - n_attrs] = values
+                else:
+                    M[missing, -1 - pos] = values
+
+        if self.has_weights():
+            W = _take_rows(self.W, rows)
+            W[missing] = 1
+        else:
+            W = None
+        table = Table.from_numpy(domain, X, Y, M, W)
+        table.name = getattr(self, 'name', '')
+        return table
+
+    def join(self, other, variables, other_variables=None, how="inner"):
+        """
+        Return a table with rows of this table and of the `other` table that
+        have equal values of the given variables (see :obj:`join_indices`).
+        The variables of the new table are described in :obj:`join_rows`.
+
+        :param other: the other table
+        :type other: Orange.data.Table
+        :param variables: key variables of this table
+        :type variables: list of int, str or Orange.data.Variable
+        :param other_variables: the corresponding variables of the other
+            table; the same as `variables` by default
+        :type other_variables: list of int, str or Orange.data.Variable
+        :param how: "inner", "left", "right" or "outer"
+        :type how: str
+        :return: a new table
+        :rtype: Orange.data.Table
+        """
+        return self.join_rows(
+            other, *self.join_indices(other, variables, other_variables, how))
+
+    AGGREGATES = {
+        "count": lambda stats: stats[:, 5],
+        "sum": lambda stats: np.where(stats[:, 5] > 0,
+                                      stats[:, 2] * stats[:, 5], 0),
+        "mean": lambda stats: stats[:, 2],
+        "var": lambda stats: stats[:, 3],
+        "min": lambda stats: stats[:, 0],
+        "max": lambda stats: stats[:, 1]}
+
+    def group_by(self, variables, columns=None,
+                 aggregates=("count", "sum", "mean", "min", "max")):
+        """
+        Return a table with a row for each group of rows with equal values of
+        the given variables. Rows with missing values of these variables are
+        not included in any group.
+
+        The new table contains the values of the group variables (string
+        variables are placed among meta attributes) and, for each of the
+        given columns, a continuous variable with each of the aggregates,
+        for instance `sepal length (mean)`. The aggregates are
+        "count" (the number of rows with known values), "sum", "mean",
+        "var" (the variance), "min" and "max"; the first four take the
+        weights into account.
+
+        The groups and their statistics are computed by
+        :obj:`_compute_group_stats`, so tables that are stored in a database
+        compute them with the database's grouping.
+
+        :param variables: the variables that define the groups
+        :type variables: list of int, str or Orange.data.Variable
+        :param columns: the aggregated columns; continuous variables that
+            do not define the groups by default
+        :type columns: list of int, str or Orange.data.Variable
+        :param aggregates: names of aggregates
+        :type aggregates: list of str
+        :return: a new table
+        :rtype: Orange.data.Table
+        """
+        unknown = [agg for agg in aggregates if agg not in self.AGGREGATES]
+        if unknown:
+            raise ValueError("unknown aggregates: " + ", ".join(unknown))
+        variables = [self.domain[var] for var in variables]
+        if columns is None:
+            columns = [var for var in self.domain.variables
+                       if var.is_continuous and var not in variables]
+        else:
+            columns = [self.domain[col] for col in columns]
+        groups, stats = self._compute_group_stats(variables, columns)
+
+        attributes, metas, X, M = [], [], [], []
+        for var, values in zip(variables, groups):
+            if var.is_primitive():
+                attributes.append(var)
+                X.append(values)
+            else:
+                metas.append(var)
+                M.append(values)
+        for col, col_stats in zip(columns, stats):
+            for agg in aggregates:
+                attributes.append(
+                    ContinuousVariable("{} ({})".format(col.name, agg)))
+                X.append(self.AGGREGATES[agg](col_stats))
+        n_groups = len(groups[0]) if groups else 0
+        domain = orange_domain.Domain(attributes, metas=metas)
+        X = np.column_stack(X) if X else np.empty((n_groups, 0))
+        M = np.column_stack(M).astype(object) if M else None
+        table = Table.from_numpy(domain, X, None, M)
+        table.name = getattr(self, 'name', '')
+        return table
+
+    def _astype(self, dtype):
+        # Store X and Y as the given type; return the table for chaining
+        for name in ("X", "_Y"):
+            arr = getattr(self, name)
+            if arr.dtype != dtype:
+                setattr(self, name, arr.astype(dtype))
+        return self
+
     def is_view(self):
         """
         Return `True` if all arrays represent a view referring to another table
@@ -864,22 +1390,28 @@ class Table(MutableSequence, Storage):
         """
         Return `True` if the table owns its data
         """
-        return ((not self.X.shape[-1] or self.X.base is None) and
-                (self._Y.base is None) and
-                (self.metas.base is None) and
-                (self.W.base is None))
+        return ((not self.X.shape[-1] or self._owns("X")) and
+                self._owns("_Y") and self._owns("metas") and self._owns("W"))
+
+    def _owns(self, name):
+        # Arrays are owned by the table if they are not views, or if they
+        # are views of the table's buffers (see _resize_all)
+        arr = self.__dict__[name]
+        buffers = self.__dict__.get("_buffers", {})
+        return arr.base is None or \
+            name in buffers and buffers[name][1] is arr
 
     def ensure_copy(self):
         """
         Ensure that the table owns its data; copy arrays when necessary
         """
-        if self.X.base is not None:
+        if not self._owns("X"):
             self.X = self.X.copy()
-        if self._Y.base is not None:
+        if not self._owns("_Y"):
             self._Y = self._Y.copy()
-        if self.metas.base is not None:
+        if not self._owns("metas"):
             self.metas = self.metas.copy()
-        if self.W.base is not None:
+        if not self._owns("W"):
             self.W = self.W.copy()
 
     @staticmethod
@@ -917,6 +1449,7 @@ class Table(MutableSequence, Storage):
         """
         if not self.W.shape[-1]:
             self.W = np.empty(len(self))
+        self._changing()
         self.W[:] = weight
 
     def has_weights(self):
@@ -990,6 +1523,56 @@ class Table(MutableSequence, Storage):
         else:
             return rx(self.metas[:, -1 - index])
 
+    def add_index(self, column):
+        """
+        Index the column, so that :obj:`Orange.data.filter.Values` finds
+        the rows that satisfy range and equality conditions on it by binary
+        search instead of scanning the column. The index (the sorted values
+        and the corresponding rows) is built at the first use and rebuilt
+        after the table changes.
+
+        Indices are used for conditions on continuous and discrete
+        variables, and for case-sensitive equality of strings.
+
+        :param column: the column to index
+        :type column: int, str or Orange.data.Variable
+        """
+        indexes = self.__dict__.setdefault("_indexes", set())
+        indexes.add(self.domain.index(column))
+
+    def remove_index(self, column):
+        """
+        Remove the index of the column (see :obj:`add_index`).
+
+        :param column: the indexed column
+        :type column: int, str or Orange.data.Variable
+        """
+        indexes = self.__dict__.get("_indexes", set())
+        indexes.discard(self.domain.index(column))
+
+    def _column_index(self, column):
+        # Return the sorted values of the column (with missing values at the
+        # end) and the corresponding row indices
+        def build(col):
+            values, _ = self.get_column_view(col)
+            if self.domain[col].is_string:
+                # Values are compared as strings, as in _string_mask, so
+                # missing values (None) are indexed as "None"
+                values = np.array(
+                    [value if isinstance(value, str) else str(value)
+                     for value in values], dtype=object)
+                ranks = values.argsort(kind="mergesort")
+            else:
+                values = np.asarray(values, dtype=np.float64)
+                ranks, = self._sort_orders([col])
+            sorted_values = values[ranks]
+            sorted_values.flags.writeable = False
+            return sorted_values, ranks
+
+        return self._cached_columns(
+            "index", [column], lambda columns: [build(columns[0])],
+            copy_results=False)[0]
+
     def _filter_is_defined(self, columns=None, negate=False):
         if columns is None:
             if sp.issparse(self.X):
@@ -1044,98 +1627,38 @@ class Table(MutableSequence, Storage):
         else:
             conditions = [filter]
             conjunction = True
-        if conjunction:
-            sel = np.ones(len(self), dtype=bool)
-        else:
-            sel = np.zeros(len(self), dtype=bool)
 
+        # Conditions on indexed columns are answered from the index, so
+        # they go first; others are evaluated on whole columns, but only for
+        # rows whose selection is not yet decided by the preceding conditions
+        indexes = self.__dict__.get("_indexes", ())
+        if indexes:
+            conditions = sorted(
+                conditions,
+                key=lambda f: self.domain.index(f.column) not in indexes)
+        sel = undecided = None
         for f in conditions:
-            col = self.get_column_view(f.column)[0]
-            if isinstance(f, data_filter.FilterDiscrete) and f.values is None \
-                    or isinstance(f, data_filter.FilterContinuous) and \
-                                    f.oper == f.IsDefined:
-                if conjunction:
-                    sel *= np.isnan(col)
-                else:
-                    sel += np.isnan(col)
-            elif isinstance(f, data_filter.FilterString) and \
-                            f.oper == f.IsDefined:
-                if conjunction:
-                    sel *= (col != "")
-                else:
-                    sel += (col != "")
-            elif isinstance(f, data_filter.FilterDiscrete):
-                if conjunction:
-                    s2 = np.zeros(len(self), dtype=bool)
-                    for val in f.values:
-                        if not isinstance(val, Real):
-                            val = self.domain[f.column].to_val(val)
-                        s2 += (col == val)
-                    sel *= s2
-                else:
-                    for val in f.values:
-                        if not isinstance(val, Real):
-                            val = self.domain[f.column].to_val(val)
-                        sel += (col == val)
-            elif isinstance(f, data_filter.FilterStringList):
-                if not f.case_sensitive:
-                    # noinspection PyTypeChecker
-                    col = np.char.lower(np.array(col, dtype=str))
-                    vals = [val.lower() for val in f.values]
-                else:
-                    vals = f.values
-                if conjunction:
-                    sel *= reduce(operator.add,
-                                  (col == val for val in vals))
-                else:
-                    sel = reduce(operator.add,
-                                 (col == val for val in vals), sel)
-            elif isinstance(f, (data_filter.FilterContinuous,
-                                data_filter.FilterString)):
-                if (isinstance(f, data_filter.FilterString) and
-                        not f.case_sensitive):
-                    # noinspection PyTypeChecker
-                    col = np.char.lower(np.array(col, dtype=str))
-                    fmin = f.min.lower()
-                    if f.oper in [f.Between, f.Outside]:
-                        fmax = f.max.lower()
-                else:
-                    fmin, fmax = f.min, f.max
-                if f.oper == f.Equal:
-                    col = (col == fmin)
-                elif f.oper == f.NotEqual:
-                    col = (col != fmin)
-                elif f.oper == f.Less:
-                    col = (col < fmin)
-                elif f.oper == f.LessEqual:
-                    col = (col <= fmin)
-                elif f.oper == f.Greater:
-                    col = (col > fmin)
-                elif f.oper == f.GreaterEqual:
-                    col = (col >= fmin)
-                elif f.oper == f.Between:
-                    col = (col >= fmin) * (col <= fmax)
-                elif f.oper == f.Outside:
-                    col = (col < fmin) + (col > fmax)
-                elif not isinstance(f, data_filter.FilterString):
-                    raise TypeError("Invalid operator")
-                elif f.oper == f.Contains:
-                    col = np.fromiter((fmin in e for e in col),
-                                      dtype=bool)
-                elif f.oper == f.StartsWith:
-                    col = np.fromiter((e.startswith(fmin) for e in col),
-                                      dtype=bool)
-                elif f.oper == f.EndsWith:
-                    col = np.fromiter((e.endswith(fmin) for e in col),
-                                      dtype=bool)
-                else:
-                    raise TypeError("Invalid operator")
-                if conjunction:
-                    sel *= col
-                else:
-                    sel += col
+            var = self.domain[f.column]
+            mask = None
+            if indexes and self.domain.index(f.column) in indexes:
+                mask = _index_filter_mask(
+                    f, self._column_index(self.domain.index(f.column)), var)
+                if mask is not None and undecided is not None:
+                    mask = mask[undecided]
+            if mask is None:
+                col = self.get_column_view(f.column)[0]
+                if undecided is not None:
+                    col = col[undecided]
+                mask = np.asarray(_value_filter_mask(f, col, var),
+                                  dtype=bool)
+            if undecided is None:
+                sel = mask
+                undecided = np.flatnonzero(mask == conjunction)
             else:
-                raise TypeError("Invalid filter")
+                sel[undecided[mask != conjunction]] = not conjunction
+                undecided = undecided[mask == conjunction]
+            if not len(undecided):
+                break
 
         if filter.negate:
             sel = ~sel
@@ -1146,33 +1669,43 @@ class Table(MutableSequence, Storage):
         if compute_variance:
             raise NotImplementedError("computation of variance is "
                                       "not implemented yet")
-        W = self.W if self.has_weights() else None
-        rr = []
         if not columns:
-            if self.domain.attributes:
-                rr.append(bn.stats(self.X, W))
-            if self.domain.class_vars:
-                rr.append(bn.stats(self._Y, W))
-            if include_metas and self.domain.metas:
-                rr.append(bn.stats(self.metas, W))
-            stats = np.vstack(tuple(rr))
-        else:
-            columns = [self.domain.index(c) for c in columns]
-            nattrs = len(self.domain.attributes)
-            Xs = any(0 <= c < nattrs for c in columns) and bn.stats(self.X, W)
-            Ys = any(c >= nattrs for c in columns) and bn.stats(self._Y, W)
-            ms = any(c < 0 for c in columns) and bn.stats(self.metas, W)
-            stats = []
-            for column in columns:
-                if 0 <= column < nattrs:
-                    stats.append(Xs[column, :])
-                elif column >= nattrs:
-                    stats.append(Ys[column - nattrs, :])
-                else:
-                    stats.append(ms[-1 - column])
+            columns = list(range(len(self.domain.variables)))
+            if include_metas:
+                columns += range(-1, -1 - len(self.domain.metas), -1)
+            return np.vstack(tuple(self._cached_columns(
+                "basic_stats", columns, self._basic_stats)))
+        columns = [self.domain.index(c) for c in columns]
+        return self._cached_columns("basic_stats", columns, self._basic_stats)
+
+    def _basic_stats(self, columns):
+        W = self.W if self.has_weights() else None
+        nattrs = len(self.domain.attributes)
+        Xs = any(0 <= c < nattrs for c in columns) and bn.stats(self.X, W)
+        Ys = any(c >= nattrs for c in columns) and bn.stats(self._Y, W)
+        ms = any(c < 0 for c in columns) and bn.stats(self.metas, W)
+        stats = []
+        for column in columns:
+            if 0 <= column < nattrs:
+                stats.append(Xs[column, :])
+            elif column >= nattrs:
+                stats.append(Ys[column - nattrs, :])
+            else:
+                stats.append(ms[-1 - column])
         return stats
 
     def _compute_distributions(self, columns=None):
+        if columns is None:
+            columns = range(len(self.domain.variables))
+            single_column = False
+        else:
+            columns = [self.domain.index(var) for var in columns]
+            single_column = len(columns) == 1 and len(self.domain) > 1
+        return self._cached_columns(
+            "distribution", columns,
+            lambda missing: self._distributions(missing, single_column))
+
+    def _distributions(self, columns, single_column):
         def _get_matrix(M, cachedM, col):
             nonlocal single_column
             if not sp.issparse(M):
@@ -1191,16 +1724,42 @@ class Table(MutableSequence, Storage):
                 weights = None
             return data, weights, cachedM
 
-        if columns is None:
-            columns = range(len(self.domain.variables))
-            single_column = False
-        else:
-            columns = [self.domain.index(var) for var in columns]
-            single_column = len(columns) == 1 and len(self.domain) > 1
+        def _dense_distribution(job):
+            m, W = job
+            if W is None:
+                # Sorted values suffice without weights
+                vals = np.ones((2, m.shape[0]))
+                vals[0, :] = m
+                vals[0, :].sort()
+                return (np.array(_valuecount.valuecount(vals)),
+                        bn.countnans(m))
+            W = np.asarray(W, dtype=np.float64).ravel()
+            m = np.ascontiguousarray(m, dtype=np.float64)
+            return _valuecount.valuecount_ranked(m, m.argsort(), W)
+
         distributions = []
         Xcsc = Ycsc = None
+        # Distributions of dense continuous columns are computed in threads
+        dense_cols = [col for col in columns
+                      if col >= 0 and self.domain[col].is_continuous and
+                      len(self) and
+                      not sp.issparse(self.X if col < self.X.shape[1]
+                                      else self._Y)]
+        dense_jobs = {}
+        for col in dense_cols:
+            if col < self.X.shape[1]:
+                m, W, _ = _get_matrix(self.X, None, col)
+            else:
+                m, W, _ = _get_matrix(self._Y, None, col - self.X.shape[1])
+            dense_jobs[col] = m, W
+        dense_dists = dict(zip(
+            dense_jobs,
+            _map_in_threads(_dense_distribution, list(dense_jobs.values()))))
         for col in columns:
             var = self.domain[col]
+            if col in dense_dists:
+                distributions.append(dense_dists[col])
+                continue
             if col < self.X.shape[1]:
                 m, W, Xcsc = _get_matrix(self.X, Xcsc, col)
             else:
@@ -1227,19 +1786,21 @@ class Table(MutableSequence, Storage):
         return distributions
 
     def _compute_contingency(self, col_vars=None, row_var=None):
-        n_atts = self.X.shape[1]
-
         if col_vars is None:
             col_vars = range(len(self.domain.variables))
-            single_column = False
         else:
             col_vars = [self.domain.index(var) for var in col_vars]
-            single_column = len(col_vars) == 1 and len(self.domain) > 1
         if row_var is None:
             row_var = self.domain.class_var
             if row_var is None:
                 raise ValueError("No row variable")
+        row_var = self.domain.index(row_var)
+        return self._cached_columns(
+            ("contingency", row_var), col_vars,
+            lambda missing: self._contingency(missing, row_var))
 
+    def _contingency(self, col_vars, row_var):
+        n_atts = self.X.shape[1]
         row_desc = self.domain[row_var]
         if not row_desc.is_discrete:
             raise TypeError("Row variable must be discrete")
@@ -1287,9 +1848,22 @@ class Table(MutableSequence, Storage):
                     for col_i, arr_i, _ in disc_vars:
                         contingencies[col_i] = (conts[arr_i], nans[arr_i])
                 else:
-                    for col_i, arr_i, var in disc_vars:
-                        contingencies[col_i] = bn.contingency(arr[:, arr_i],
-                                                              row_data, len(var.values) - 1, n_rows - 1, W)
+                    # One call for all columns with the same number of values
+                    groups = {}
+                    for v in disc_vars:
+                        groups.setdefault(len(v[2].values), []).append(v)
+                    for n_values, group in groups.items():
+                        indices = [arr_i for _, arr_i, _ in group]
+                        if indices == list(range(arr.shape[1])):
+                            sub = arr
+                        else:
+                            sub = arr[:, indices]
+                        if sub.dtype == object:
+                            sub = sub.astype(np.float64)
+                        conts, nans = bn.contingency(
+                            sub, row_data, n_values - 1, n_rows - 1, W)
+                        for i, (col_i, _, _) in enumerate(group):
+                            contingencies[col_i] = (conts[i], nans[i])
 
             cont_vars = [v for v in vars if v[2].is_continuous]
             if cont_vars:
@@ -1300,7 +1874,7 @@ class Table(MutableSequence, Storage):
                 if sp.issparse(arr):
                     arr = sp.csc_matrix(arr)
 
-                for col_i, arr_i, _ in cont_vars:
+                def cont_column(arr_i, arr=arr, W=W, classes=classes):
                     if sp.issparse(arr):
                         col_data = arr.data[arr.indptr[arr_i]:
                         arr.indptr[arr_i + 1]]
@@ -1311,13 +1885,464 @@ class Table(MutableSequence, Storage):
                     else:
                         col_data, W_, classes_ = arr[:, arr_i], W, classes
 
-                    col_data = col_data.astype(dtype=np.float64)
+                    col_data = np.asarray(col_data, dtype=np.float64)
                     U, C, unknown = _contingency.contingency_floatarray(
                         col_data, classes_, n_rows, W_)
-                    contingencies[col_i] = ([U, C], unknown)
+                    return [U, C], unknown
+
+                conts = _map_in_threads(
+                    cont_column, [arr_i for _, arr_i, _ in cont_vars])
+                for (col_i, _, _), cont in zip(cont_vars, conts):
+                    contingencies[col_i] = cont
 
         return contingencies
 
+    def _compute_group_stats(self, group_vars, columns=None):
+        groups, columns = self._group_columns(group_vars, columns)
+        return groups["values"], self._cached_columns(
+            ("group_stats", groups["key"]), columns,
+            lambda missing: [self._group_stats(groups, col)
+                             for col in missing])
+
+    def _compute_group_distributions(self, group_vars, columns=None):
+        groups, columns = self._group_columns(group_vars, columns)
+        return groups["values"], self._cached_columns(
+            ("group_distribution", groups["key"]), columns,
+            lambda missing: [self._group_distribution(groups, col)
+                             for col in missing])
+
+    def _group_columns(self, group_vars, columns):
+        # Return the groups of rows for the group variables (see _groups)
+        # and indices of the columns, which are, by default, the variables
+        # that do not define the groups
+        groups = self._groups(group_vars)
+        if columns is None:
+            columns = [i for i in range(len(self.domain.variables))
+                       if i not in groups["key"]]
+        else:
+            columns = [self.domain.index(col) for col in columns]
+        if any(not (self.domain[col].is_discrete or
+                    self.domain[col].is_continuous) for col in columns):
+            raise ValueError("group statistics can be computed only for "
+                             "discrete and continuous values")
+        return groups, columns
+
+    def _groups(self, group_vars):
+        # Return a dictionary describing the groups of rows with equal
+        # values of the variables, numbered in the order of values:
+        # - "key": indices of the group variables,
+        # - "values": a list of arrays with values of the variables,
+        # - "codes": the group of each row (-1 for missing values),
+        # - "rows": the rows with known values, ordered by groups,
+        # - "starts": the position of each group's first row in "rows".
+        key = tuple(self.domain.index(var) for var in group_vars)
+
+        def compute(key):
+            codes, _ = _join_keys(self, self[:0], key, key)
+            # Codes of missing keys may leave gaps
+            defined = codes >= 0
+            distinct, codes[defined] = np.unique(codes[defined],
+                                                 return_inverse=True)
+            n_groups = len(distinct)
+            defined = np.flatnonzero(defined)[::-1]
+            first = np.empty(n_groups, dtype=np.intp)
+            first[codes[defined]] = defined
+            values = [self.get_column_view(col)[0][first] for col in key]
+            ranks = [np.unique(vals, return_inverse=True)[1]
+                     if self.domain[col].is_string
+                     else np.asarray(vals, dtype=np.float64)
+                     for col, vals in zip(key, values)]
+            order = np.lexsort(ranks[::-1])
+            renumber = np.empty(n_groups + 1, dtype=np.intp)
+            renumber[order] = np.arange(n_groups)
+            renumber[-1] = -1
+            codes = renumber[codes]
+            sizes = np.bincount(codes[codes >= 0], minlength=n_groups)
+            return {"key": key,
+                    "values": [vals[order] for vals in values],
+                    "codes": codes,
+                    "rows": np.argsort(codes, kind="mergesort")[
+                        len(codes) - np.sum(sizes):],
+                    "starts": np.cumsum(sizes) - sizes}
+
+        return self._cached_columns(
+            "groups", [key], lambda keys: [compute(keys[0])],
+            copy_results=False)[0]
+
+    def _group_stats(self, groups, col):
+        # Return an array with a row of (min, max, mean, variance, #nans,
+        # #non-nans) for each group
+        rows, starts = groups["rows"], groups["starts"]
+        n_groups = len(starts)
+        values = np.asarray(self.get_column_view(col)[0],
+                            dtype=np.float64)[rows]
+        codes = groups["codes"][rows]
+        W = self.W.ravel()[rows] if self.has_weights() else None
+        nans = np.isnan(values)
+        known = ~nans
+        if W is None:
+            n_nans = np.bincount(codes[nans], minlength=n_groups)
+            weights = None
+        else:
+            n_nans = np.bincount(codes[nans], W[nans], minlength=n_groups)
+            weights = W[known]
+        codes, known_values = codes[known], values[known]
+        n_known = np.bincount(codes, weights, minlength=n_groups)
+        if weights is None:
+            weights = 1
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.bincount(codes, weights * known_values,
+                                minlength=n_groups) / n_known
+            variances = np.bincount(
+                codes, weights * (known_values - means[codes]) ** 2,
+                minlength=n_groups) / n_known
+        if n_groups:
+            # fmin and fmax ignore missing values unless all are missing
+            mins = np.fmin.reduceat(values, starts)
+            maxs = np.fmax.reduceat(values, starts)
+        else:
+            mins = maxs = np.zeros(0)
+        return np.column_stack((mins, maxs, means, variances,
+                                n_nans, n_known))
+
+    def _group_distribution(self, groups, col):
+        # Return the distributions of values in the groups in the format of
+        # contingencies with groups as rows (see _compute_contingency)
+        codes = groups["codes"]
+        n_groups = len(groups["starts"])
+        values = np.asarray(self.get_column_view(col)[0], dtype=np.float64)
+        W = self.W.ravel() if self.has_weights() else None
+        var = self.domain[col]
+        if var.is_discrete:
+            rows = groups["rows"]
+        else:
+            # Rows in the order of values; missing values are at the end
+            rows, = self._sort_orders([col])
+            rows = rows[codes[rows] >= 0]
+        codes, values = codes[rows], values[rows]
+        if W is not None:
+            W = W[rows]
+        nans = np.isnan(values)
+        known = ~nans
+        unknowns = np.bincount(codes[nans], None if W is None else W[nans],
+                               minlength=n_groups)
+        codes, values = codes[known], values[known]
+        if W is not None:
+            W = W[known]
+        if var.is_discrete:
+            n_values = len(var.values)
+            dist = np.bincount(codes * n_values + values.astype(np.intp), W,
+                               minlength=n_groups * n_values)
+            return (dist.reshape(n_groups, n_values).astype(np.float64),
+                    unknowns.astype(np.float64))
+        distinct = np.ones(len(values), dtype=bool)
+        distinct[1:] = values[1:] != values[:-1]
+        n_values = np.sum(distinct)
+        value_indices = np.cumsum(distinct) - 1
+        counts = np.bincount(codes * n_values + value_indices, W,
+                             minlength=n_groups * n_values)
+        return ([values[distinct],
+                 counts.reshape(n_groups, n_values).astype(np.float64)],
+                unknowns.astype(np.float64))
+
+
+def _value_filter_mask(f, col, var):
+    # Return a boolean array telling which values in the column satisfy the
+    # subfilter `f` (derived from Orange.data.filter.ValueFilter)
+    from Orange.data import filter as data_filter
+
+    if isinstance(f, data_filter.FilterDiscrete) and f.values is None \
+            or isinstance(f, data_filter.FilterContinuous) and \
+            f.oper == f.IsDefined:
+        return ~np.isnan(np.asarray(col, dtype=float))
+    if isinstance(f, data_filter.FilterString) and f.oper == f.IsDefined:
+        return col != ""
+    if isinstance(f, data_filter.FilterDiscrete):
+        values = [val if isinstance(val, Real) else var.to_val(val)
+                  for val in f.values]
+        return np.in1d(col, values)
+    if isinstance(f, data_filter.FilterStringList):
+        if f.case_sensitive:
+            values = set(f.values)
+            return _string_mask(col, values.__contains__)
+        values = set(f.values_lower)
+        return _string_mask(col, lambda x: x.lower() in values)
+    if isinstance(f, data_filter.FilterString):
+        return _string_mask(col, _string_predicate(f))
+    if not isinstance(f, data_filter.FilterContinuous):
+        raise TypeError("Invalid filter")
+
+    fmin, fmax = f.min, f.max
+    if f.oper == f.Equal:
+        return col == fmin
+    elif f.oper == f.NotEqual:
+        return col != fmin
+    elif f.oper == f.Less:
+        return col < fmin
+    elif f.oper == f.LessEqual:
+        return col <= fmin
+    elif f.oper == f.Greater:
+        return col > fmin
+    elif f.oper == f.GreaterEqual:
+        return col >= fmin
+    elif f.oper == f.Between:
+        return (col >= fmin) & (col <= fmax)
+    elif f.oper == f.Outside:
+        return (col < fmin) | (col > fmax)
+    else:
+        raise TypeError("Invalid operator")
+
+
+def _index_filter_mask(f, index, var):
+    # Return a boolean array telling which rows satisfy the subfilter `f`,
+    # found by binary search in the column's index (see Table._column_index);
+    # return None if the index cannot answer the condition
+    from Orange.data import filter as data_filter
+
+    sorted_values, ranks = index
+    if isinstance(f, data_filter.FilterDiscrete) and f.values is not None:
+        values = [val if isinstance(val, Real) else var.to_val(val)
+                  for val in f.values]
+        oper = data_filter.FilterContinuous.Equal
+    elif isinstance(f, data_filter.FilterStringList) and f.case_sensitive:
+        values = list(f.values)
+        oper = data_filter.FilterContinuous.Equal
+    elif isinstance(f, data_filter.FilterString) and f.case_sensitive and \
+            f.oper in (f.Equal, f.NotEqual):
+        values = [f.ref]
+        oper = data_filter.FilterContinuous.Equal
+        if f.oper == f.NotEqual:
+            oper = data_filter.FilterContinuous.NotEqual
+    elif isinstance(f, data_filter.FilterContinuous) and \
+            f.oper != f.IsDefined:
+        values = [f.min]
+        oper = f.oper
+    else:
+        return None
+    if var.is_string:
+        n_defined = len(sorted_values)
+    else:
+        n_defined = np.searchsorted(sorted_values, np.nan)
+
+    def left(value):
+        return np.searchsorted(sorted_values, value, "left")
+
+    def right(value):
+        return np.searchsorted(sorted_values, value, "right")
+
+    F = data_filter.FilterContinuous
+    if oper == F.Equal:
+        ranges = [(left(value), right(value)) for value in values]
+    elif oper == F.NotEqual:
+        # Comparisons of missing values with != are true
+        ranges = [(0, left(values[0])), (right(values[0]), len(ranks))]
+    elif oper == F.Less:
+        ranges = [(0, left(values[0]))]
+    elif oper == F.LessEqual:
+        ranges = [(0, right(values[0]))]
+    elif oper == F.Greater:
+        ranges = [(right(values[0]), n_defined)]
+    elif oper == F.GreaterEqual:
+        ranges = [(left(values[0]), n_defined)]
+    elif oper == F.Between:
+        ranges = [(left(f.min), right(f.max))]
+    elif oper == F.Outside:
+        ranges = [(0, left(f.min)), (right(f.max), n_defined)]
+    else:
+        raise TypeError("Invalid operator")
+    mask = np.zeros(len(ranks), dtype=bool)
+    for start, stop in ranges:
+        mask[ranks[start:stop]] = True
+    return mask
+
+
+def _string_predicate(f):
+    # Return a function that checks a string against FilterString `f`
+    fmin, fmax = f.min, f.max
+    if f.case_sensitive:
+        case = str
+    else:
+        case = str.lower
+        fmin = fmin.lower()
+        if f.oper in [f.Between, f.Outside]:
+            fmax = fmax.lower()
+    predicate = {
+        f.Equal: lambda x: x == fmin,
+        f.NotEqual: lambda x: x != fmin,
+        f.Less: lambda x: x < fmin,
+        f.LessEqual: lambda x: x <= fmin,
+        f.Greater: lambda x: x > fmin,
+        f.GreaterEqual: lambda x: x >= fmin,
+        f.Between: lambda x: fmin <= x <= fmax,
+        f.Outside: lambda x: not fmin <= x <= fmax,
+        f.Contains: lambda x: fmin in x,
+        f.StartsWith: lambda x: x.startswith(fmin),
+        f.EndsWith: lambda x: x.endswith(fmin)}.get(f.oper)
+    if predicate is None:
+        raise TypeError("Invalid operator")
+    return lambda x: predicate(case(x))
+
+
+def _string_mask(col, predicate):
+    # Return a boolean array telling which strings in the column satisfy the
+    # predicate. Columns of strings usually have few distinct values, so the
+    # predicate is called for each distinct value, and the rows are then
+    # matched against the smaller of the sets of accepted or rejected values
+    distinct = set(col)
+    accepted = {value for value in distinct if predicate(str(value))}
+    negate = len(accepted) > len(distinct) / 2
+    if negate:
+        accepted = distinct - accepted
+    if len(accepted) <= 8:
+        mask = np.zeros(len(col), dtype=bool)
+        for value in accepted:
+            mask |= col == value
+    else:
+        mask = np.fromiter(map(accepted.__contains__, col), dtype=bool,
+                           count=len(col))
+    return ~mask if negate else mask
+
+
+def _take_rows(arr, rows):
+    # Return the rows of a 2-d (or 1-d) array with a single fancy index;
+    # rows with index -1 are unknown
+    missing = rows < 0
+    if not len(arr):
+        shape = (len(rows),) + arr.shape[1:]
+        return np.full(shape, Unknown,
+                       dtype=object if arr.dtype == object else float)
+    taken = arr.take(rows, axis=0)
+    if missing.any():
+        if taken.dtype.kind not in "fO":
+            taken = taken.astype(float)
+        taken[missing] = Unknown
+    return taken
+
+
+def _join_keys(left, right, left_vars, right_vars):
+    # Return arrays of integer codes of the rows' keys in the two tables,
+    # where equal keys have equal codes and -1 denotes a missing key
+    left_codes = right_codes = None
+    for left_var, right_var in zip(left_vars, right_vars):
+        left_var, right_var = left.domain[left_var], right.domain[right_var]
+        lcol = left.get_column_view(left_var)[0]
+        rcol = right.get_column_view(right_var)[0]
+        if left_var.is_discrete and right_var.is_discrete:
+            # Map the codes of both variables to the union of their labels
+            labels = {val: i for i, val in enumerate(left_var.values)}
+            for val in right_var.values:
+                labels.setdefault(val, len(labels))
+            lut = np.array([labels[val] for val in right_var.values] + [-1])
+            lcol = np.asarray(lcol, dtype=float)
+            rcol = np.asarray(rcol, dtype=float)
+            lkey = np.where(np.isnan(lcol), -1, lcol).astype(np.int64)
+            rkey = lut[np.where(np.isnan(rcol), -1, rcol).astype(np.int64)]
+        elif left_var.is_continuous and right_var.is_continuous:
+            lkey, rkey = _factorize_floats(lcol, rcol)
+        else:
+            lkey, rkey = _factorize_strings(
+                _key_strings(left_var, lcol), _key_strings(right_var, rcol))
+        if left_codes is None:
+            left_codes, right_codes = lkey, rkey
+            continue
+        n_keys = max(lkey.max() if len(lkey) else -1,
+                     rkey.max() if len(rkey) else -1) + 1
+        # Combine with the codes of previous variables and renumber them
+        left_missing = (left_codes < 0) | (lkey < 0)
+        right_missing = (right_codes < 0) | (rkey < 0)
+        combined = np.concatenate((left_codes * n_keys + lkey,
+                                   right_codes * n_keys + rkey))
+        _, codes = np.unique(combined, return_inverse=True)
+        left_codes, right_codes = codes[:len(left)], codes[len(left):]
+        left_codes[left_missing] = -1
+        right_codes[right_missing] = -1
+    return left_codes, right_codes
+
+
+def _factorize_floats(left, right):
+    # Return codes of values in two float arrays (-1 for NaN)
+    values = np.concatenate((np.asarray(left, dtype=float),
+                             np.asarray(right, dtype=float)))
+    _, codes = np.unique(values, return_inverse=True)
+    codes[np.isnan(values)] = -1
+    return codes[:len(left)], codes[len(left):]
+
+
+def _key_strings(var, col):
+    # Return the values of the column as strings; missing values are
+    # represented by any value that is not a non-empty string
+    if var.is_string:
+        return col
+    return [None if isnan(val) else var.str_val(val)
+            for val in np.asarray(col, dtype=float)]
+
+
+def _factorize_strings(left, right):
+    # Return codes of strings in two sequences (-1 for missing values).
+    # Strings are factorized by their hashes, unless they collide.
+    values = np.empty(len(left) + len(right), dtype=object)
+    values[:len(left)] = left
+    values[len(left):] = right
+    missing = np.fromiter(map(operator.not_, values), dtype=bool,
+                          count=len(values))
+    missing |= values != values  # NaN
+    hashes = np.fromiter(map(hash, values), dtype=np.int64,
+                         count=len(values))
+    _, first, codes = np.unique(hashes, return_index=True,
+                                return_inverse=True)
+    if not ((values == values[first][codes]) | missing).all():
+        distinct = {}
+        for val in values:
+            distinct.setdefault(val, len(distinct))
+        codes = np.fromiter(map(distinct.__getitem__, values),
+                            dtype=np.int64, count=len(values))
+    codes[missing] = -1
+    return codes[:len(left)], codes[len(left):]
+
+
+def _join_codes(left, right, how):
+    # Return the indices of rows with equal codes in the two arrays of
+    # codes (see _join_keys), for the given type of join
+    # The codes are consecutive, so the matching rows of `right` are found
+    # by counting instead of by binary search
+    n_codes = max(left.max() if len(left) else -1,
+                  right.max() if len(right) else -1) + 1
+    right_counts = np.bincount(right[right >= 0], minlength=n_codes)
+    right_counts = np.append(right_counts, 0)  # for missing keys (-1)
+    order = np.argsort(right, kind="mergesort")[np.sum(right < 0):]
+    start = (np.cumsum(right_counts) - right_counts)[left]
+    counts = right_counts[left]
+    left_rows = np.repeat(np.arange(len(left)), counts)
+    offsets = np.arange(len(left_rows)) - \
+        np.repeat(np.cumsum(counts) - counts, counts)
+    right_rows = order[np.repeat(start, counts) + offsets]
+    if how in ("left", "outer"):
+        unmatched = np.flatnonzero(counts == 0)
+        left_rows = np.concatenate((left_rows, unmatched))
+        right_rows = np.concatenate((right_rows, np.full(len(unmatched), -1,
+                                                         dtype=np.intp)))
+        ordered = np.argsort(left_rows, kind="mergesort")
+        left_rows, right_rows = left_rows[ordered], right_rows[ordered]
+    if how in ("right", "outer"):
+        matched = np.zeros(len(right), dtype=bool)
+        matched[right_rows[right_rows >= 0]] = True
+        unmatched = np.flatnonzero(~matched)
+        left_rows = np.concatenate((left_rows, np.full(len(unmatched), -1,
+                                                       dtype=np.intp)))
+        right_rows = np.concatenate((right_rows, unmatched))
+    return left_rows, right_rows
+
+
+def _map_in_threads(func, items):
+    # Return the list of results of `func` for the items, computed in a pool
+    # with a thread per CPU; this pays off for functions that release the
+    # GIL, like numpy's sorting and the Cython counting functions
+    n_jobs = min(len(items), os.cpu_count() or 1)
+    if n_jobs <= 1:
+        return list(map(func, items))
+    with ThreadPoolExecutor(n_jobs) as executor:
+        return list(executor.map(func, items))
+
 
 def _check_arrays(*arrays, dtype=None):
     checked = []
@@ -0,0 +1,138 @@
+"""
+Data-manipulation utilities.
+"""
+import weakref
+from collections import OrderedDict
+from threading import RLock
+
+from scipy import sparse as sp
+
+
+class SharedComputeValue:
+    """
+    A base class for compute_value objects whose columns are obtained from
+    a computation shared by several variables, such as a projection that
+    transforms the whole table, where each component is one of its columns.
+
+    When converting a table, :obj:`Orange.data.Table.from_table` calls
+    `compute_shared` only once for all variables with the same (equal)
+    `compute_shared` and passes the result to their :obj:`compute`.
+
+    :param compute_shared: a hashable callable that receives the data and
+        returns the result of the shared computation
+    """
+    def __init__(self, compute_shared):
+        self.compute_shared = compute_shared
+
+    def __call__(self, data, shared_data=None):
+        """
+        Return the column for the data; the shared computation is made if
+        its result is not given.
+        """
+        if shared_data is None:
+            shared_data = self.compute_shared(data)
+        return self.compute(data, shared_data)
+
+    def compute(self, data, shared_data):
+        """
+        Return the column from the result of the shared computation.
+        """
+        raise NotImplementedError(
+            "Derived classes must implement method 'compute'.")
+
+
+class ConversionCache:
+    """
+    A thread-safe cache of tables converted to other domains.
+
+    Entries are weakly bound to the source table and the domain: they are
+    removed when either is garbage collected. An entry keeps the arrays of
+    the converted table, but not the table, so it does not keep the domain
+    alive; :obj:`get` returns a new table with the cached arrays.
+
+    An entry is used only while the source's change counter is the same as
+    at the conversion; the counter increases whenever the source is changed
+    through its methods or its arrays are replaced, so checking it takes
+    constant time. Values written directly into the source's arrays are
+    not tracked. When the total size of the cached arrays exceeds
+    `max_size` bytes, the least recently used entries are removed.
+
+    The arrays of the cached tables are shared, so they must not be
+    modified.
+    """
+    def __init__(self, max_size=1 << 24):
+        self.max_size = max_size
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = RLock()
+        # Keys of entries whose source or domain were collected; they are
+        # removed under the lock, not in the weakref callbacks
+        self._dead = []
+
+    ARRAYS = ("X", "_Y", "metas", "W", "ids")
+
+    @staticmethod
+    def _nbytes(arr):
+        if sp.issparse(arr):
+            return arr.data.nbytes + arr.indices.nbytes + arr.indptr.nbytes
+        return arr.nbytes
+
+    def _prune(self):
+        while self._dead:
+            self._remove(self._dead.pop())
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[-1]
+
+    def get(self, domain, source):
+        """
+        Return the table converted from `source` to `domain`, or `None`.
+        """
+        key = (id(domain), id(source))
+        with self._lock:
+            self._prune()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            _, _, version, cls, name, arrays, _ = entry
+            if version != source._change_counter()[0]:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+        table = cls.__new__(cls)
+        table.domain = domain
+        for attr, arr in zip(self.ARRAYS, arrays):
+            setattr(table, attr, arr)
+        table.name = name
+        return table
+
+    def put(self, domain, source, table):
+        """
+        Store the table converted from `source` to `domain`. The source
+        must not have been changed since the conversion.
+        """
+        arrays = tuple(getattr(table, attr) for attr in self.ARRAYS)
+        nbytes = sum(map(self._nbytes, arrays))
+        if nbytes > self.max_size:
+            return
+        key = (id(domain), id(source))
+        callback = lambda _: self._dead.append(key)
+        entry = (weakref.ref(domain, callback), weakref.ref(source, callback),
+                 source._change_counter()[0], type(table),
+                 getattr(table, "name", ""), arrays, nbytes)
+        with self._lock:
+            self._prune()
+            self._remove(key)
+            self._entries[key] = entry
+            self.size += nbytes
+            while self.size > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        """Remove all tables from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._dead.clear()
+            self.size = 0
@@ -2,9 +2,10 @@ from numbers import Real, Integral
 from math import isnan, floor
 import numpy as np
 from pickle import PickleError
+from itertools import count
+import weakref
 
 from ..data.value import Value, Unknown
-import collections
 
 from . import _variable
 
@@ -17,12 +18,120 @@ def make_variable(cls, compute_value, *args):
     return cls.make(*args)
 
 
+class _VariableRegistry:
+    """
+    Variables of a class that can be reused by :obj:`Variable.make`, by
+    names. The registry holds weak references, so variables that are no
+    longer used are removed.
+    """
+    def __init__(self):
+        self._vars = weakref.WeakValueDictionary()
+
+    def add(self, var):
+        self._vars[var.name] = var
+
+    def get(self, name):
+        return self._vars.get(name)
+
+    def clear(self):
+        self._vars.clear()
+
+    def __len__(self):
+        return len(self._vars)
+
+
+class _DiscreteVariableRegistry:
+    """
+    Weak references to discrete variables, indexed by names and by values,
+    so that :obj:`DiscreteVariable.make` checks only the variables that have
+    some of the requested values.
+
+    Variables are numbered in the order of construction. Values that are
+    added to variables after construction are indexed by
+    :obj:`DiscreteVariable.add_value`, and replaced lists of values are
+    indexed when they are assigned to :obj:`DiscreteVariable.values`.
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._serials = count()
+        # name -> {serial: variable}
+        self._by_name = {}
+        # (name, value) -> {serial: variable}
+        self._by_value = {}
+        # variable -> (serial, the number of indexed values)
+        self._indexed = weakref.WeakKeyDictionary()
+        self._n_keys_swept = 0
+
+    def add(self, var):
+        serial = next(self._serials)
+        self._by_name.setdefault(
+            var.name, weakref.WeakValueDictionary())[serial] = var
+        self._indexed[var] = serial, 0
+        self._index(var)
+        if len(self._by_value) > 2 * self._n_keys_swept + 1000:
+            self._sweep()
+
+    def _sweep(self):
+        # Remove the keys without live variables; this is done when the
+        # number of keys doubles, so the memory stays proportional to the
+        # number of live variables and values
+        for index in (self._by_name, self._by_value):
+            for key in [key for key, found in index.items() if not found]:
+                del index[key]
+        self._n_keys_swept = len(self._by_value)
+
+    def index_values(self, var, replaced=False):
+        """
+        Index the values that were added to the variable, or all its values
+        if the list of values was `replaced`.
+        """
+        if var in self._indexed:
+            if replaced:
+                self._indexed[var] = self._indexed[var][0], 0
+            self._index(var)
+
+    def _index(self, var):
+        serial, n_indexed = self._indexed[var]
+        for value in var.values[n_indexed:]:
+            self._by_value.setdefault(
+                (var.name, value), weakref.WeakValueDictionary())[serial] = var
+        self._indexed[var] = serial, len(var.values)
+
+    def candidates(self, name, values=()):
+        """
+        Return the variables with the given name (in the order of
+        construction) that have at least one of the given values, or all
+        variables with the name if no values are given.
+        """
+        if not values:
+            named = self._by_name.get(name)
+            if not named:
+                return []
+            return [var for _, var in sorted(named.items())]
+        found = {}
+        for value in values:
+            indexed = self._by_value.get((name, value))
+            if indexed:
+                for serial, var in indexed.items():
+                    if value in var.values:
+                        found[serial] = var
+        return [found[serial] for serial in sorted(found)]
+
+    def get(self, name):
+        return self.candidates(name) or None
+
+    def __len__(self):
+        return sum(len(named) for named in self._by_name.values())
+
+
 class VariableMeta(type):
     # noinspection PyMethodParameters
     def __new__(mcs, name, *args):
         cls = type.__new__(mcs, name, *args)
         if not hasattr(cls, '_all_vars') or cls._all_vars is Variable._all_vars:
-            cls._all_vars = {}
+            cls._all_vars = _VariableRegistry()
         if name != "Variable":
             Variable._variable_types.append(cls)
         return cls
@@ -74,10 +183,7 @@ class Variable(metaclass=VariableMeta):
         self.source_variable = None
         self.attributes = {}
         if name and compute_value is None:
-            if isinstance(self._all_vars, collections.defaultdict):
-                self._all_vars[name].append(self)
-            else:
-                self._all_vars[name] = self
+            self._all_vars.add(self)
 
     @classmethod
     def make(cls, name):
@@ -290,7 +396,9 @@ class DiscreteVariable(Variable):
 
     .. attribute:: values
 
-        A list of variable's values.
+        A list of variable's values. Values should be added with
+        :obj:`add_value`; when the list is replaced, the new values are
+        indexed for :obj:`make`.
 
     .. attribute:: ordered
 
@@ -305,15 +413,24 @@ class DiscreteVariable(Variable):
         used in some methods like, for instance, when creating dummy variables
         for regression.
     """
-    _all_vars = collections.defaultdict(list)
+    _all_vars = _DiscreteVariableRegistry()
     presorted_values = []
 
     def __init__(self, name="", values=(), ordered=False, base_value=-1, compute_value=None):
         """ Construct a discrete variable descriptor with the given values. """
-        super().__init__(name, compute_value)
         self.ordered = ordered
         self.values = list(values)
         self.base_value = base_value
+        super().__init__(name, compute_value)
+
+    @property
+    def values(self):
+        return self._values
+
+    @values.setter
+    def values(self, values):
+        self._values = values
+        self._all_vars.index_values(self, replaced=True)
 
     def __repr__(self):
         """
@@ -364,6 +481,7 @@ class DiscreteVariable(Variable):
         """ Add a value `s` to the list of values.
         """
         self.values.append(s)
+        self._all_vars.index_values(self)
 
     def val_from_str_add(self, s):
         """
@@ -461,20 +579,17 @@ class DiscreteVariable(Variable):
         :returns: an existing compatible variable or `None`
         """
         base_rep = base_value != -1 and values[base_value]
-        existing = cls._all_vars.get(name)
-        if existing is None:
-            return None
         if not ordered:
             values = cls.ordered_values(values)
-        for var in existing:
+        # Variables without common values are not compatible; they are not
+        # among the candidates unless no values are given
+        for var in cls._all_vars.candidates(name, values):
             if (var.ordered != ordered or
                     var.base_value != -1
                     and var.values[var.base_value] != base_rep):
                 continue
             if not values:
                 break  # we have the variable - any existing values are OK
-            if not set(var.values) & set(values):
-                continue  # empty intersection of values; not compatible
             if ordered:
                 i = 0
                 for val in var.values:
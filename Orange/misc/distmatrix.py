@@ -1,5 +1,7 @@
 import numpy as np
 
+from Orange.misc.pickling import picklable_array
+
 
 class DistMatrix():
     """
@@ -45,6 +47,12 @@ class DistMatrix():
         self.col_items = col_items
         self.axis = axis
 
+    def __reduce_ex__(self, protocol):
+        # With protocol 5, the matrix is pickled as an out-of-band buffer
+        reduced = super().__reduce_ex__(protocol)
+        state = dict(reduced[2], X=picklable_array(self.X, protocol))
+        return reduced[:2] + (state,) + reduced[3:]
+
     def get_KNN(self, i, k):
         """Return k columns with the lowest value in the i-th row.
 
@@ -69,4 +77,4 @@ class DistMatrix():
         elif typ == 2:
             return 1./self.X
         else:
-            raise ValueError('Unknown option for typ of matrix inversion.')
\ No newline at end of file
+            raise ValueError('Unknown option for typ of matrix inversion.')
@@ -0,0 +1,83 @@
+"""
+Pickling of numpy arrays through out-of-band buffers.
+
+With pickle protocol 5 (Python 3.8 or later) the data of arrays wrapped by
+:obj:`picklable_array` is handed to the pickler as :obj:`pickle.PickleBuffer`.
+When the pickler is given a `buffer_callback` (as do process pools and
+shared-memory transports), the data is not copied into the pickle stream,
+and unpickling with the corresponding `buffers` reconstructs the arrays on
+top of the given memory. Older protocols pickle arrays as before.
+"""
+import pickle
+
+import numpy as np
+
+__all__ = ["PickleBuffer", "picklable_array", "reduce_ndarray_subclass"]
+
+PickleBuffer = getattr(pickle, "PickleBuffer", None)
+
+
+def _array_from_buffer(buffer, dtype, shape, transposed):
+    if transposed:
+        return np.frombuffer(buffer, dtype=dtype).reshape(shape[::-1]).T
+    return np.frombuffer(buffer, dtype=dtype).reshape(shape)
+
+
+class _BufferedArray:
+    """A wrapper that pickles an array's data as a :obj:`PickleBuffer`."""
+    __slots__ = ("array",)
+
+    def __init__(self, array):
+        self.array = array
+
+    def __reduce_ex__(self, protocol):
+        array = self.array
+        if protocol < 5:
+            return array.__reduce_ex__(protocol)
+        transposed = array.flags.f_contiguous and not array.flags.c_contiguous
+        if transposed:
+            array = array.T
+        elif not array.flags.c_contiguous:
+            array = np.ascontiguousarray(array)
+        return (_array_from_buffer,
+                (PickleBuffer(array), array.dtype, self.array.shape,
+                 transposed))
+
+
+def picklable_array(array, protocol):
+    """
+    Return an object that pickles into `array`.
+
+    For protocol 5 and numeric arrays, the result stores the array's data in
+    a :obj:`PickleBuffer`, so it can be passed out-of-band. Otherwise, the
+    array is returned as a plain :obj:`numpy.ndarray`; memory-mapped arrays
+    and other subclasses are thus pickled as their data.
+
+    :param array: array to pickle
+    :type array: numpy.ndarray
+    :param protocol: pickle protocol
+    :type protocol: int
+    """
+    if not isinstance(array, np.ndarray):
+        return array
+    array = array.view(np.ndarray)
+    if protocol < 5 or PickleBuffer is None or array.dtype.hasobject:
+        return array
+    return _BufferedArray(array)
+
+
+def _subclass_from_array(cls, array, state):
+    self = array.view(cls)
+    self.__dict__.update(state)
+    return self
+
+
+def reduce_ndarray_subclass(self, protocol):
+    """
+    Reduce an instance of a subclass of :obj:`numpy.ndarray`, keeping
+    the attributes from its `__dict__`, which numpy's own reduction drops.
+
+    The data is pickled with :obj:`picklable_array`.
+    """
+    return (_subclass_from_array,
+            (type(self), picklable_array(self, protocol), self.__dict__))
@@ -0,0 +1,189 @@
+"""
+Sharing of tables (and other picklable objects) with worker processes.
+
+:obj:`SharedData` pickles an object into a block of shared memory, with the
+data of numpy arrays (such as X, Y, metas and weights of a table, or the
+components of sparse matrices) stored as raw arrays, and the rest (e.g. the
+domain) as a small pickle. Workers receive the block's :obj:`SharedHandle`
+instead of the object; :obj:`SharedHandle.load` reconstructs the object
+with arrays that are read-only views of the shared memory, so the data is
+neither pickled nor copied for each worker. ::
+
+    with SharedData(data) as handle:
+        with ProcessPoolExecutor() as executor:
+            scores = list(executor.map(evaluate, repeat(handle, k)))
+
+    def evaluate(handle):
+        data = handle.load()
+        ...
+
+The block is a memory-mapped file in `/dev/shm` where it exists (that is,
+in memory), and in the temporary directory otherwise. It is removed when
+the :obj:`SharedData` is closed; the memory is released when the workers
+no longer use the arrays.
+"""
+import io
+import mmap
+import os
+import pickle
+import tempfile
+import weakref
+
+import numpy as np
+
+__all__ = ["SharedData", "SharedHandle"]
+
+# Protocol 5 would pickle the tables' arrays as PickleBuffers (see
+# Orange.misc.pickling), which are stored in the pickle when there is no
+# buffer callback
+PROTOCOL = min(pickle.HIGHEST_PROTOCOL, 4)
+ALIGNMENT = 64
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _shared_directory():
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def _remove(path):
+    # Files that are memory-mapped cannot be removed on Windows
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class _ArrayPickler(pickle.Pickler):
+    """
+    A pickler that replaces numeric numpy arrays with references to their
+    positions in the block; the arrays are collected in `arrays`.
+    """
+    def __init__(self, file):
+        super().__init__(file, PROTOCOL)
+        self.arrays = []
+        self.size = 0
+        self._memo = {}
+
+    def persistent_id(self, obj):
+        if type(obj) is not np.ndarray or obj.dtype.hasobject or \
+                not obj.size:
+            return None
+        pid = self._memo.get(id(obj))
+        if pid is None:
+            transposed = obj.flags.f_contiguous and not obj.flags.c_contiguous
+            offset = _align(self.size)
+            pid = offset, obj.dtype.str, obj.shape, transposed
+            self.size = offset + obj.nbytes
+            self.arrays.append((obj, pid))
+            self._memo[id(obj)] = pid
+        return pid
+
+
+class _ArrayUnpickler(pickle.Unpickler):
+    def __init__(self, file, buffer):
+        super().__init__(file)
+        self.buffer = buffer
+
+    def persistent_load(self, pid):
+        return _array_at(self.buffer, *pid)
+
+
+def _array_at(buffer, offset, dtype, shape, transposed):
+    dtype = np.dtype(dtype)
+    count = int(np.prod(shape))
+    array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+    if transposed:
+        return array.reshape(shape[::-1]).T
+    return array.reshape(shape)
+
+
+class SharedHandle:
+    """
+    A reference to an object in shared memory; handles are small and
+    are passed to worker processes instead of the object.
+    """
+    __slots__ = ("path", "offset", "size")
+
+    def __init__(self, path, offset, size):
+        self.path = path
+        self.offset = offset
+        self.size = size
+
+    def __getstate__(self):
+        return self.path, self.offset, self.size
+
+    def __setstate__(self, state):
+        self.path, self.offset, self.size = state
+
+    def load(self):
+        """
+        Return the shared object. Its numpy arrays are read-only and
+        share the memory with the object in other processes.
+        """
+        with open(self.path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = io.BytesIO(buffer[self.offset:self.offset + self.size])
+        return _ArrayUnpickler(header, buffer).load()
+
+
+class SharedData:
+    """
+    Store a copy of the object in shared memory, so that other processes
+    on the same computer can use it through :obj:`handle` without copying
+    the data of its numpy arrays.
+
+    The memory is released by :obj:`close`, when leaving the `with`
+    statement, which gives the :obj:`handle`, or when the object is garbage
+    collected. Objects loaded from the handle remain valid after that, but
+    the handle can no longer be loaded.
+
+    :param obj: a picklable object, such as :obj:`Orange.data.Table`
+    :param directory: the directory for the block; `/dev/shm` or the
+        temporary directory by default
+    :type directory: str
+    """
+    def __init__(self, obj, directory=None):
+        header = io.BytesIO()
+        pickler = _ArrayPickler(header)
+        pickler.dump(obj)
+        header = header.getvalue()
+        offset = _align(pickler.size)
+
+        fd, path = tempfile.mkstemp(prefix="orange-", suffix=".shm",
+                                    dir=directory or _shared_directory())
+        self._finalizer = weakref.finalize(self, _remove, path)
+        with open(fd, "wb+") as f:
+            f.truncate(offset + len(header))
+            if pickler.arrays:
+                with mmap.mmap(f.fileno(), 0) as buffer:
+                    self._copy_arrays(buffer, pickler.arrays)
+            f.seek(offset)
+            f.write(header)
+        self.handle = SharedHandle(path, offset, len(header))
+
+    @staticmethod
+    def _copy_arrays(buffer, arrays):
+        for array, pid in arrays:
+            target = _array_at(buffer, *pid)
+            target[...] = array
+            # The view must not outlive the buffer
+            del target
+
+    def close(self):
+        """Remove the block from shared memory."""
+        self._finalizer()
+
+    @property
+    def closed(self):
+        return not self._finalizer.alive
+
+    def __enter__(self):
+        return self.handle
+
+    def __exit__(self, *exc_info):
+        self.close()
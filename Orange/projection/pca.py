@@ -1,6 +1,7 @@
 import sklearn.decomposition as skl_decomposition
 
 import Orange.data
+from Orange.data.util import SharedComputeValue
 from Orange.misc.wrapper_meta import WrapperMeta
 from Orange.preprocess import Continuize
 from Orange.projection import SklProjector, Projection
@@ -83,6 +84,12 @@ class PCAModel(Projection, metaclass=WrapperMeta):
             [pca_variable(i) for i in range(self.n_components)],
              domain.class_vars, domain.metas)
 
+    def transform_data(self, data):
+        """Return the projection of the data."""
+        if data.domain != self.pre_domain:
+            data = data.from_table(self.pre_domain, data)
+        return self.transform(data.X)
+
 
 class IncrementalPCA(SklProjector):
     __wraps__ = skl_decomposition.IncrementalPCA
@@ -111,16 +118,15 @@ class IncrementalPCAModel(PCAModel):
         return self
 
 
-class Projector:
+class Projector(SharedComputeValue):
     def __init__(self, projection, feature):
+        super().__init__(projection.transform_data)
         self.projection = projection
         self.feature = feature
         self.transformed = None
 
-    def __call__(self, data):
-        if data.domain != self.projection.pre_domain:
-            data = data.from_table(self.projection.pre_domain, data)
-        self.transformed = self.projection.transform(data.X)
+    def compute(self, data, shared_data):
+        self.transformed = shared_data
         return self.transformed[:, self.feature]
 
     def __getstate__(self):
@@ -1,6 +1,7 @@
 import math
 import numpy as np
 from Orange import data
+from Orange.misc.pickling import reduce_ndarray_subclass
 
 
 def _get_variable(variable, dat, attr_name,
@@ -148,8 +149,8 @@ class Discrete(np.ndarray):
             if axis is None or axis == 1:
                 self.unknowns /= t
 
-    def __reduce__(self):
-        return create_discrete, (Discrete, np.copy(self), self.col_variable, self.row_variable, self.unknowns)
+    def __reduce_ex__(self, protocol):
+        return reduce_ndarray_subclass(self, protocol)
 
 
 class Continuous:
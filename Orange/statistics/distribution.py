@@ -4,6 +4,7 @@ import math
 from numbers import Real
 import numpy as np
 from Orange import data
+from Orange.misc.pickling import reduce_ndarray_subclass
 
 
 def _get_variable(dat, variable, expected_type=None, expected_name=""):
@@ -89,6 +90,9 @@ class Discrete(np.ndarray):
             not hasattr(other, "unknowns") or self.unknowns == other.unknowns)
 
 
+    def __reduce_ex__(self, protocol):
+        return reduce_ndarray_subclass(self, protocol)
+
     def __getitem__(self, index):
         if isinstance(index, str):
             index = self.variable.to_val(index)
@@ -237,6 +241,9 @@ class Continuous(np.ndarray):
     def __hash__(self):
         return zlib.adler32(self) ^ hash(self.unknowns)
 
+    def __reduce_ex__(self, protocol):
+        return reduce_ndarray_subclass(self, protocol)
+
     def normalize(self):
         t = np.sum(self[1, :])
         if t > 1e-6:
@@ -427,6 +427,39 @@ class SqlTableTests(PostgresTest):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstMetaIsInstance(sql_table, StringVariable)
 
+    def test_group_by(self):
+        data = list(zip(self.discrete_variable(21),
+                        self.float_variable(21),
+                        self.string_variable(21)))
+        with self.sql_table_from_data(data) as table:
+            discrete, continuous = table.domain.attributes
+            local = Table.from_numpy(
+                table.domain,
+                np.array([[discrete.to_val(d), f] for d, f, _ in data]),
+                metas=np.array([[s] for _, _, s in data], dtype=object))
+
+            grouped = table.group_by([discrete], aggregates=(
+                "count", "sum", "mean", "var", "min", "max"))
+            expected = local.group_by([discrete], aggregates=(
+                "count", "sum", "mean", "var", "min", "max"))
+            self.assertEqual([var.name for var in grouped.domain],
+                             [var.name for var in expected.domain])
+            assert_almost_equal(grouped.X, expected.X)
+
+            groups, dists = table._compute_group_distributions(
+                [discrete], [continuous])
+            expected_groups, expected_dists = \
+                local._compute_group_distributions([discrete], [continuous])
+            assert_almost_equal(groups[0], expected_groups[0])
+            assert_almost_equal(dists[0][0][0], expected_dists[0][0][0])
+            assert_almost_equal(dists[0][0][1], expected_dists[0][0][1])
+
+            grouped = table.group_by([table.domain.metas[0]], [discrete])
+            expected = local.group_by([table.domain.metas[0]], [discrete])
+            self.assertEqual(list(grouped.metas[:, 0]),
+                             list(expected.metas[:, 0]))
+            assert_almost_equal(grouped.X[:, 0], expected.X[:, 0])
+
     def test_recovers_connection_after_sql_error(self):
         import psycopg2
 
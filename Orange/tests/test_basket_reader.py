@@ -84,6 +84,29 @@ class TestBasketReader(unittest.TestCase):
         table = BasketFormat().read_file(fname)
         self.assertEqual(len(table.domain.variables), 4)
 
+    @with_file("""a=1.5,b=2.25|y=1;m=3\nc=0.125""")
+    def test_read_decimals_classes_and_metas(self, fname):
+        table = BasketFormat().read_file(fname)
+        np.testing.assert_almost_equal(table.X.todense(),
+                                       [[1.5, 2.25, 0], [0, 0, 0.125]])
+        np.testing.assert_almost_equal(table._Y.todense(), [[1], [0]])
+        self.assertEqual(table.metas.shape, (2, 1))
+        np.testing.assert_almost_equal(table.metas.todense(), [[3], [0]])
+
+    @with_file("""a=1,b=2\n\nc=3|y=1\n\r\nb=4,a=5|y=2\nd\n""")
+    def test_iter_chunks(self, fname):
+        table = BasketFormat().read_file(fname)
+        chunks = list(BasketFormat().iter_chunks(fname, 2))
+        self.assertEqual([len(chunk) for chunk in chunks], [1, 1, 2])
+        for chunk in chunks:
+            self.assertIs(chunk.domain, chunks[0].domain)
+        self.assertEqual([var.name for var in chunks[0].domain.attributes],
+                         ["a", "b", "c", "d"])
+        X = np.vstack([chunk.X.todense() for chunk in chunks])
+        np.testing.assert_almost_equal(X, table.X.todense())
+        Y = np.vstack([chunk.Y.todense() for chunk in chunks])
+        np.testing.assert_almost_equal(Y.ravel(), [[0, 1, 2, 0]])
+
 
 if __name__ == "__main__":
     unittest.main()
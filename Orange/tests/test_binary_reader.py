@@ -0,0 +1,73 @@
+import unittest
+from tempfile import NamedTemporaryFile
+import os
+
+import numpy as np
+
+from Orange.data import ContinuousVariable, DiscreteVariable, \
+    StringVariable, Domain, Table
+from Orange.data.io import BinaryFormat
+
+
+class TestBinaryFormat(unittest.TestCase):
+    def setUp(self):
+        file = NamedTemporaryFile(suffix=".orb", delete=False)
+        file.close()
+        self.filename = file.name
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_write_read(self):
+        x = ContinuousVariable("bin_x", number_of_decimals=2)
+        y = DiscreteVariable("bin_y", values=["b", "a"], ordered=True)
+        y.attributes["color"] = "red"
+        m = DiscreteVariable("bin_m", values=["u", "v"])
+        s = StringVariable("bin_s")
+        domain = Domain([x], y, [s, m])
+        data = Table.from_numpy(
+            domain, np.array([[1.5], [np.nan], [3]]),
+            np.array([1, 0, np.nan]),
+            np.array([["foo", 0], [None, 1], ["čšž", np.nan]], dtype=object),
+            np.array([1, 2, 3.5]))
+        data.save(self.filename)
+
+        table = Table.from_file(self.filename)
+        self.assertIsInstance(table.X, np.memmap)
+        self.assertEqual(table.domain.attributes[0].number_of_decimals, 2)
+        self.assertEqual(table.domain.class_var.values, ["b", "a"])
+        self.assertEqual(table.domain.class_var.attributes, {"color": "red"})
+        np.testing.assert_equal(table.X, data.X)
+        np.testing.assert_equal(table.Y, data.Y)
+        np.testing.assert_equal(table.W, data.W.ravel())
+        self.assertEqual(list(table.metas[:, 0]), ["foo", None, "čšž"])
+        np.testing.assert_equal(table.metas[:, 1].astype(float), [0, 1, np.nan])
+
+        # Changes are not written back to the file
+        table.X[0, 0] = 42
+        np.testing.assert_equal(
+            BinaryFormat().read_file(self.filename).X, data.X)
+
+    def test_recode_values(self):
+        existing = DiscreteVariable.make("bin_r", ["c", "d"])
+        var = DiscreteVariable("bin_r", values=["d", "e"])
+        data = Table.from_numpy(Domain([var]), np.array([[0], [1], [0]]))
+        data.save(self.filename)
+        table = Table.from_file(self.filename)
+        new_var = table.domain.attributes[0]
+        self.assertIs(new_var, existing)
+        self.assertEqual(new_var.values, ["c", "d", "e"])
+        np.testing.assert_equal(table.X[:, 0], [1, 2, 1])
+
+    def test_empty(self):
+        domain = Domain([ContinuousVariable("bin_a")])
+        Table.from_domain(domain).save(self.filename)
+        table = Table.from_file(self.filename)
+        self.assertEqual(table.X.shape, (0, 1))
+        self.assertFalse(table.has_weights())
+
+    def test_not_binary_table(self):
+        with open(self.filename, "w") as f:
+            f.write("a\nc\n\n1\n")
+        with self.assertRaises(ValueError):
+            BinaryFormat().read_file(self.filename)
@@ -3,6 +3,7 @@ import os
 import pickle
 import pkgutil
 import unittest
+from unittest.mock import patch
 
 import numpy as np
 import traceback
@@ -10,7 +11,8 @@ import traceback
 import Orange.classification
 from Orange.classification import (
     Learner, Model, NaiveBayesLearner, LogisticRegressionLearner)
-from Orange.data import DiscreteVariable, Domain, Table, Variable
+from Orange.data import DiscreteVariable, Domain, Table, Variable, \
+    Instance, Value
 from Orange.data.io import BasketFormat
 from Orange.evaluation import CrossValidation
 from Orange.tests.dummy_learners import DummyLearner, DummyMulticlassLearner
@@ -58,6 +60,24 @@ class ModelTest(unittest.TestCase):
         for row in table:
             pred.append(clf(row))
 
+    def test_predict_single_instance_without_table(self):
+        iris = Table("iris")
+        clf = LogisticRegressionLearner()(iris)
+        # Class values of instances from a domain without the class are
+        # unknown
+        domain = Domain(iris.domain.attributes)
+        instances = [Instance(domain, inst) for inst in iris[::10]]
+        expected = clf(iris[::10], Model.ValueProbs)
+        with patch("Orange.base.Table") as table:
+            predictions = [clf(inst, Model.ValueProbs)
+                           for inst in instances]
+            table.assert_not_called()
+        np.testing.assert_equal([value for value, _ in predictions],
+                                expected[0])
+        np.testing.assert_almost_equal(
+            np.vstack([probs for _, probs in predictions]), expected[1])
+        self.assertIsInstance(clf(instances[0]), Value)
+
     def test_value_from_probs(self):
         nrows = 100
         ncols = 5
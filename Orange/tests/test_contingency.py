@@ -1,3 +1,4 @@
+import pickle
 import unittest
 
 import numpy as np
@@ -30,6 +31,17 @@ class Discrete_Test(unittest.TestCase):
             [[1, 3], [11, 9], [4, 9], [7, 1], [2, 8], [19, 22], [1, 4]])
 
 
+    def test_pickle(self):
+        d = data.Table("zoo")
+        cont = contingency.Discrete(d, "predator")
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            cont2 = pickle.loads(pickle.dumps(cont, protocol))
+            self.assertIsInstance(cont2, contingency.Discrete)
+            self.assertEqual(cont2.col_variable.name, "predator")
+            self.assertEqual(cont2.row_variable.name, "type")
+            np.testing.assert_array_equal(cont2.unknowns, cont.unknowns)
+            np.testing.assert_array_equal(cont2, cont)
+
     def test_continuous(self):
         d = data.Table("iris")
         cont = contingency.Continuous(d, "sepal width")
@@ -43,6 +55,31 @@ class Discrete_Test(unittest.TestCase):
         np.testing.assert_almost_equal(cont[d.domain.class_var.values.index("Iris-virginica")], correct)
 
 
+    def test_compute_dense(self):
+        d = data.Table("zoo")
+        d.set_weights(np.random.random(len(d)))
+        conts = d._compute_contingency()
+        n_rows = len(d.domain.class_var.values)
+        for i, var in enumerate(d.domain.attributes):
+            cont, nans = conts[i]
+            self.assertEqual(cont.shape, (n_rows, len(var.values)))
+            for value in range(len(var.values)):
+                for row in range(n_rows):
+                    mask = (d.X[:, i] == value) & (d.Y == row)
+                    self.assertAlmostEqual(cont[row, value], d.W[mask].sum(),
+                                           places=5)
+            np.testing.assert_array_equal(nans, 0)
+
+        d = data.Table("iris")
+        columns = d.domain.attributes
+        conts = d._compute_contingency(columns)
+        d.set_weights(2)
+        for (cont, unknowns), (wcont, wunknowns) in zip(
+                conts, d._compute_contingency(columns)):
+            np.testing.assert_almost_equal(wcont[0], cont[0])
+            np.testing.assert_almost_equal(wcont[1], 2 * cont[1])
+            np.testing.assert_almost_equal(wunknowns, 2 * unknowns)
+
     @staticmethod
     def _construct_sparse():
         domain = data.Domain(
@@ -1,13 +1,28 @@
+import pickle
 from unittest import TestCase
 
 import numpy as np
 from scipy.sparse import csr_matrix
 
 from Orange.data import Table
+from Orange.misc import DistMatrix
 from Orange.distance import (Euclidean, SpearmanR, SpearmanRAbsolute, PearsonR,
                              PearsonRAbsolute, Manhattan, Cosine, Jaccard)
 
 
+class TestDistMatrix(TestCase):
+    def test_pickle(self):
+        iris = Table('iris')
+        dist = Euclidean(iris[:10])
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            dist2 = pickle.loads(pickle.dumps(dist, protocol))
+            self.assertIsInstance(dist2, DistMatrix)
+            np.testing.assert_array_equal(dist2.X, dist.X)
+            self.assertEqual(dist2.dim, dist.dim)
+            self.assertEqual(dist2.axis, dist.axis)
+            self.assertEqual(len(dist2.row_items), 10)
+
+
 class TestEuclidean(TestCase):
     def setUp(self):
         self.iris = Table('iris')
@@ -1,3 +1,4 @@
+import pickle
 import unittest
 
 import numpy as np
@@ -41,6 +42,17 @@ class Distribution_DiscreteTestCase(unittest.TestCase):
         self.assertEqual(disc, disc5)
 
 
+    def test_pickle(self):
+        d = data.Table("zoo")
+        disc = distribution.Discrete(d, "type")
+        disc.unknowns = 3
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            disc2 = pickle.loads(pickle.dumps(disc, protocol))
+            self.assertIsInstance(disc2, distribution.Discrete)
+            self.assertEqual(disc2.variable.name, "type")
+            self.assertEqual(disc2.unknowns, 3)
+            np.testing.assert_array_equal(disc2, disc)
+
     def test_construction(self):
         d = data.Table("zoo")
 
@@ -217,6 +229,16 @@ class Distribution_ContinuousTestCase(unittest.TestCase):
         self.assertEqual(disc2.unknowns, 0)
         np.testing.assert_array_equal(disc2, dd)
 
+    def test_pickle(self):
+        d = data.Table("iris")
+        disc = distribution.Continuous(d, "petal length")
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            disc2 = pickle.loads(pickle.dumps(disc, protocol))
+            self.assertIsInstance(disc2, distribution.Continuous)
+            self.assertEqual(disc2.variable.name, "petal length")
+            self.assertEqual(disc2.unknowns, disc.unknowns)
+            np.testing.assert_array_equal(disc2, disc)
+
     def test_hash(self):
         d = data.Table("iris")
         petal_length = d.columns.petal_length
@@ -6,7 +6,8 @@ import numpy as np
 from numpy.testing import assert_array_equal
 
 from Orange.data import (ContinuousVariable, DiscreteVariable, Domain, Table,
-                         StringVariable, Unknown, Variable, DomainConversion)
+                         StringVariable, Unknown, Variable, DomainConversion,
+                         Instance)
 from Orange.preprocess import Continuize, Impute
 from Orange.testing import create_pickling_tests
 
@@ -375,6 +376,34 @@ class TestDomainInit(unittest.TestCase):
         assert_array_equal(y, np.array([0]))
         assert_array_equal(metas, np.array([0, 1, "1234567"], dtype=object))
 
+    def test_convert_arrays(self):
+        d = Domain((age, gender, income), (race, ), metas=(ssn, education))
+        x = lambda data: 42 if isinstance(data, Instance) else \
+            np.full(len(data), 42.)
+        new_income = income.copy(compute_value=x)
+        h = Domain((education, new_income), (gender, ),
+                   metas=(age, new_income, ssn, incomeA))
+        conversion = h.get_conversion(d)
+
+        X = np.array([[30, 0, 100], [40, 1, 200]])
+        Y = np.array([[1], [0]])
+        metas = np.array([["a", 2], ["b", 3]], dtype=object)
+        hx, hy, hmetas = conversion.convert_arrays(X, Y, metas,
+                                                   Table(d, X, Y, metas))
+        assert_array_equal(hx, [[2, 42], [3, 42]])
+        assert_array_equal(hy, [[0], [1]])
+        assert_array_equal(hmetas[:, :3], np.array(
+            [[30, 42, "a"], [40, 42, "b"]], dtype=object))
+        self.assertTrue(np.isnan(hmetas[:, 3].astype(float)).all())
+
+        inst = Instance(d, [40, 1, 200, 0, "b", 3])
+        hx, hy, hmetas = h.convert(inst)
+        assert_array_equal(hx, [3, 42])
+        assert_array_equal(hy, [1])
+        assert_array_equal(hmetas[:3], np.array([40, 42, "b"], dtype=object))
+        self.assertEqual(hx.dtype, float)
+        self.assertEqual(hmetas.dtype, object)
+
     def test_conversion_size(self):
         domain = Domain([age, gender, income], [race])
         self.assertRaises(ValueError, domain.convert, [0] * 3)
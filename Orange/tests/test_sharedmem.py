@@ -0,0 +1,68 @@
+import os
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import scipy.sparse as sp
+
+from Orange.data import Table
+from Orange.misc.sharedmem import SharedData
+
+
+def _sum_shared(handle):
+    data = handle.load()
+    return len(data), np.nansum(data.X), data.X.flags.writeable
+
+
+class TestSharedData(unittest.TestCase):
+    def test_table(self):
+        zoo = Table("zoo")
+        zoo.set_weights(np.arange(len(zoo)))
+        with SharedData(zoo) as handle:
+            self.assertLess(len(pickle.dumps(handle)), 1000)
+            data = handle.load()
+            for name in ("X", "_Y", "metas", "W", "ids"):
+                np.testing.assert_equal(getattr(data, name),
+                                        getattr(zoo, name))
+            self.assertEqual([var.name for var in data.domain],
+                             [var.name for var in zoo.domain])
+            for arr in (data.X, data._Y, data.W):
+                self.assertFalse(arr.flags.writeable)
+                self.assertFalse(arr.flags.owndata)
+            with self.assertRaises(ValueError):
+                data.X[0, 0] = 0
+            self.assertEqual(data._compute_distributions([0])[0][0].tolist(),
+                             zoo._compute_distributions([0])[0][0].tolist())
+            path = handle.path
+        self.assertFalse(os.path.exists(path))
+        # Loaded objects remain valid
+        np.testing.assert_equal(data.X, zoo.X)
+
+    def test_processes(self):
+        iris = Table("iris")
+        with SharedData(iris) as handle:
+            with ProcessPoolExecutor(2) as executor:
+                results = list(executor.map(_sum_shared, repeat(handle, 3)))
+        self.assertEqual(results, [(150, np.sum(iris.X), False)] * 3)
+
+    def test_arrays(self):
+        a = np.asfortranarray(np.random.random((5, 3)))
+        b = sp.csr_matrix(np.eye(4))
+        objs = [a, a[::2], b, np.zeros((0, 3)), np.array(["a", 1])]
+        shared = SharedData(objs)
+        loaded = shared.handle.load()
+        for original, obj in zip(objs, loaded):
+            if sp.issparse(original):
+                original, obj = original.toarray(), obj.toarray()
+            np.testing.assert_equal(obj, original)
+        self.assertTrue(loaded[0].flags.f_contiguous)
+        self.assertFalse(shared.closed)
+        shared.close()
+        self.assertTrue(shared.closed)
+        shared.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
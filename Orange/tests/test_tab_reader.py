@@ -1,9 +1,13 @@
 import io
+import os
 import unittest
+from tempfile import NamedTemporaryFile
 
 import numpy as np
+import scipy.sparse as sp
 
-from Orange.data import ContinuousVariable, DiscreteVariable
+from Orange.data import ContinuousVariable, DiscreteVariable, \
+    StringVariable, Domain, Table
 from Orange.data.io import TabDelimFormat
 
 
@@ -86,3 +90,129 @@ class TestTabReader(unittest.TestCase):
 
         self.assertSequenceEqual(t2.domain['x'].values, 'abcdgh')
         np.testing.assert_almost_equal(t2.X.ravel(), [5, 4, 0, 2, 1])
+
+    def test_read_in_blocks(self):
+        lines = ["x\ty\tz\tw", "c\td\tstring\tw", "\t\tm\t"]
+        lines += ["{:.3f}\t{}\ts{}\t{}".format(
+            i / 7, "abc"[i % 3], i, i % 3 + 1) for i in range(100)]
+        lines[10] = "?\t\ts10\t2"
+        lines[20] = ""
+        file = io.StringIO("\n".join(lines))
+
+        reader = TabDelimFormat()
+        reader.block_size = 50
+        table = reader._read_file(file)
+        x, y = table.domain.attributes
+        self.assertEqual(len(table), 99)
+        self.assertEqual(x.number_of_decimals, 3)
+        self.assertEqual(y.values, ["a", "b", "c"])
+        self.assertTrue(np.isnan(table.X[7, 0]))
+        self.assertTrue(np.isnan(table.X[7, 1]))
+        np.testing.assert_almost_equal(table.X[:7, 0],
+                                       [i / 7 for i in range(7)], 3)
+        np.testing.assert_almost_equal(table.X[:7, 1], [0, 1, 2, 0, 1, 2, 0])
+        self.assertEqual(list(table.metas[:3, 0]), ["s0", "s1", "s2"])
+        self.assertEqual(table.metas[7, 0], "s10")
+        np.testing.assert_almost_equal(table.W[:3], [1, 2, 3])
+
+    def test_too_many_columns(self):
+        file = io.StringIO("x\ty\nc\tc\n\n1\t2\n1\t2\t3\n")
+        with self.assertRaisesRegex(ValueError, "line 5"):
+            TabDelimFormat()._read_file(file)
+
+    def test_read_non_seekable(self):
+        class Stream(io.StringIO):
+            def seekable(self):
+                return False
+
+            def seek(self, *args):
+                raise io.UnsupportedOperation("seek")
+
+        data = "x\ty\tw\nc\td\tw\n\tclass\t\n" + "".join(
+            "{}\t{}\t2\n".format(i, "ab"[i % 2]) for i in range(40))
+        reader = TabDelimFormat()
+        reader.block_size = 30
+        table = reader._read_file(Stream(data))
+        self.assertEqual(len(table), 40)
+        self.assertEqual(table.W.shape, (40,))
+        np.testing.assert_almost_equal(table.X[:, 0], np.arange(40))
+        np.testing.assert_almost_equal(table.Y, np.arange(40) % 2)
+
+        seekable = TabDelimFormat()._read_file(io.StringIO(data))
+        np.testing.assert_equal(table.X, seekable.X)
+        np.testing.assert_equal(table.Y, seekable.Y)
+        np.testing.assert_equal(table.W, seekable.W)
+
+        empty = TabDelimFormat()._read_file(Stream("x\ty\nc\td\n\t\n"))
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(empty.X.shape, (0, 2))
+
+    def test_read_parallel(self):
+        lines = ["x\ty\tz", "c\td\tstring", "\tclass\tm"]
+        lines += ["{}\t{}\ts{}".format(i, "vwxyz"[i // 100], i)
+                  for i in range(500)]
+        file = NamedTemporaryFile("wt", suffix=".tab", delete=False)
+        try:
+            file.write("\n".join(lines))
+            file.close()
+            reader = TabDelimFormat()
+            reader.n_jobs = 2
+            reader.parallel_min_size = 0
+            table = reader.read_file(file.name)
+            sequential = TabDelimFormat().read_file(file.name)
+        finally:
+            os.remove(file.name)
+        self.assertEqual(table.domain.class_var.values, list("vwxyz"))
+        np.testing.assert_equal(table.X, sequential.X)
+        np.testing.assert_equal(table.Y, np.arange(500) // 100)
+        np.testing.assert_equal(table.metas, sequential.metas)
+
+    def test_iter_chunks(self):
+        lines = ["x\ty", "c\td", "\tclass"]
+        lines += ["{}\t{}".format(i, "vwxyz"[i // 10]) for i in range(50)]
+        file = NamedTemporaryFile("wt", suffix=".tab", delete=False)
+        try:
+            file.write("\n".join(lines))
+            file.close()
+            chunks = list(TabDelimFormat().iter_chunks(file.name, 15))
+        finally:
+            os.remove(file.name)
+        self.assertEqual([len(chunk) for chunk in chunks], [15, 15, 15, 5])
+        domain = chunks[0].domain
+        self.assertEqual(domain.class_var.values, list("vwxyz"))
+        for chunk in chunks:
+            self.assertIs(chunk.domain, domain)
+        np.testing.assert_equal(
+            np.hstack([chunk.X[:, 0] for chunk in chunks]), np.arange(50))
+        np.testing.assert_equal(
+            np.hstack([chunk.Y for chunk in chunks]), np.arange(50) // 10)
+
+    def test_read_basket_column(self):
+        file = io.StringIO(
+            "x\titems\ty\nc\tbasket\td\n\tbasket\tclass\n"
+            "1\ta=2, b\tyes\n"
+            "2\t?\tno\n"
+            "3\tc b=1.5\tyes\n")
+        reader = TabDelimFormat()
+        reader.block_size = 20
+        table = reader._read_file(file)
+        self.assertTrue(sp.isspmatrix_csr(table.X))
+        self.assertEqual([var.name for var in table.domain.attributes],
+                         ["x", "a", "b", "c"])
+        np.testing.assert_almost_equal(
+            table.X.todense(), [[1, 2, 1, 0], [2, 0, 0, 0], [3, 0, 1.5, 1]])
+        np.testing.assert_almost_equal(table.Y, [1, 0, 1])
+
+    def test_write_file(self):
+        x = ContinuousVariable("wx", number_of_decimals=2)
+        y = DiscreteVariable("wy", values=["a", "b"])
+        s = StringVariable("ws")
+        data = Table.from_numpy(
+            Domain([x], y, [s]), np.array([[1.005], [np.nan], [-0.001]]),
+            np.array([1, np.nan, 0]),
+            np.array([["foo"], ["bar"], [None]], dtype=object))
+        file = io.StringIO()
+        file.close = lambda: None
+        TabDelimFormat.write_file(file, data)
+        self.assertEqual(file.getvalue().splitlines()[3:],
+                         ['1.00\tb\t"foo"', '?\t?\t"bar"', '-0.00\ta\t"None"'])
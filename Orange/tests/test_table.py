@@ -1,6 +1,11 @@
+import gc
 import os
+import pickle
+import shutil
+import tempfile
 import unittest
 from itertools import chain
+from functools import reduce
 from math import isnan
 import random
 
@@ -598,6 +603,302 @@ class TableTestCase(unittest.TestCase):
         with self.assertRaises(ValueError):
             d.extend(x)
 
+    def test_append_amortized(self):
+        d = data.Table("iris")
+        d2 = data.Table.from_domain(d.domain)
+        buffers = set()
+        for inst in d:
+            d2.append(data.Instance(d.domain, inst))
+            buffers.add(id(d2.X.base))
+        self.assertLess(len(buffers), 10)
+        self.assertTrue(d2.is_copy())
+        np.testing.assert_equal(d2.X, d.X)
+        np.testing.assert_equal(d2.Y, d.Y)
+        self.assertEqual(len(d2.ids), len(d))
+
+        # Rows are not moved within the buffers, so other references to
+        # the arrays keep their values
+        X = d2.X
+        d2.insert(0, d[5])
+        self.assertEqual(d2[0], d[5])
+        self.assertEqual(d2[1], d[0])
+        np.testing.assert_equal(X, d.X)
+        d2.extend(d[:3])
+        np.testing.assert_equal(d2.X[-4:], d.X[[-1, 0, 1, 2]])
+        del d2[:1]
+        d2.append(d[7])
+        self.assertEqual(d2[-1], d[7])
+        self.assertEqual(len(d2), len(d) + 4)
+
+        # Tables that share the rows are not resized
+        x = d2[:5]
+        with self.assertRaises(ValueError):
+            d2.append(d[0])
+        with self.assertRaises(ValueError):
+            x.append(d[0])
+        x.ensure_copy()
+        d2.append(d[0])
+        self.assertEqual(len(d2), len(d) + 5)
+
+        d3 = pickle.loads(pickle.dumps(d2))
+        np.testing.assert_equal(d3.X, d2.X)
+        self.assertNotIn("_buffers", d3.__dict__)
+
+    def test_concatenate(self):
+        d = data.Table("zoo")
+        d2 = data.Table.concatenate([d[:10], d[10:30], d[30:]])
+        np.testing.assert_equal(d2.X, d.X)
+        np.testing.assert_equal(d2.Y, d.Y)
+        np.testing.assert_equal(d2.metas, d.metas)
+        np.testing.assert_equal(d2.ids, d.ids)
+        self.assertFalse(d2.has_weights())
+
+        dom = data.Domain(d.domain.attributes[:2], d.domain.class_var)
+        d3 = d[:5]
+        d3.set_weights(2)
+        d4 = data.Table.concatenate([d3, data.Table(dom, d[5:])])
+        self.assertEqual(d4.domain, d.domain)
+        self.assertEqual(len(d4), len(d))
+        np.testing.assert_equal(d4.X[:5], d.X[:5])
+        np.testing.assert_equal(d4.X[5:, :2], d.X[5:, :2])
+        self.assertTrue(np.isnan(d4.X[5:, 2:]).all())
+        np.testing.assert_equal(d4.W, [2] * 5 + [1] * (len(d) - 5))
+
+        with self.assertRaises(ValueError):
+            data.Table.concatenate([])
+
+    def test_float32_storage(self):
+        from Orange.classification import NaiveBayesLearner
+        from Orange.classification.simple_tree import SimpleTreeLearner
+        d = data.Table("zoo")
+        d32 = data.Table.from_file("zoo", dtype=np.float32)
+        self.assertEqual(d32.X.dtype, np.float32)
+        self.assertEqual(d32.Y.dtype, np.float32)
+        self.assertEqual(d32.W.dtype, np.float64)
+        np.testing.assert_equal(d32.X, d.X)
+
+        d2 = data.Table(d.domain, d32)
+        self.assertEqual(d2.X.dtype, np.float32)
+        d2 = data.Table.from_table(d.domain, d32, dtype=np.float64)
+        self.assertEqual(d2.X.dtype, np.float64)
+        d2 = data.Table.from_numpy(d.domain, d.X, d.Y, d.metas,
+                                   dtype=np.float32)
+        self.assertEqual(d2.X.dtype, np.float32)
+
+        for dist, dist32 in zip(d._compute_distributions(),
+                                d32._compute_distributions()):
+            np.testing.assert_equal(dist32, dist)
+        (cont, unknowns), = d._compute_contingency([0])
+        (cont32, unknowns32), = d32._compute_contingency([0])
+        np.testing.assert_equal(cont32, cont)
+        np.testing.assert_equal(unknowns32, unknowns)
+
+        iris = data.Table("iris")
+        iris32 = data.Table(iris.domain, iris, dtype=np.float32)
+        self.assertEqual(iris32.X.dtype, np.float32)
+        (cont, _), = iris._compute_contingency([0])
+        (cont32, _), = iris32._compute_contingency([0])
+        np.testing.assert_allclose(cont32[0], cont[0], rtol=1e-6)
+        np.testing.assert_equal(cont32[1], cont[1])
+        for learner in (NaiveBayesLearner(), SimpleTreeLearner()):
+            np.testing.assert_equal(learner(d32)(d32), learner(d)(d))
+            learner(iris32)(iris32)
+
+    def test_statistics_cache(self):
+        d = data.Table("zoo")
+        with patch.object(data.Table, "_distributions", autospec=True,
+                          side_effect=data.Table._distributions) as compute:
+            dist = d._compute_distributions([0, 1])
+            self.assertEqual(compute.call_count, 1)
+            dist2 = d._compute_distributions()
+            self.assertEqual(compute.call_args[0][1],
+                             list(range(2, len(d.domain.variables))))
+            np.testing.assert_equal(dist2[0][0], dist[0][0])
+            # Results are copies
+            dist2[0][0][:] = 0
+            self.assertEqual(d._compute_distributions([0])[0][0].sum(),
+                             len(d))
+            self.assertEqual(compute.call_count, 2)
+
+            d[0, 0] = 1 - d[0, 0]
+            d._compute_distributions([0])
+            self.assertEqual(compute.call_count, 3)
+            d.set_weights(2)
+            self.assertEqual(d._compute_distributions([0])[0][0].sum(),
+                             2 * len(d))
+            d.shuffle()
+            d._compute_distributions([0])
+            self.assertEqual(compute.call_count, 5)
+
+            # Changes of a table are seen by views that share the data
+            view = d[:10]
+            self.assertEqual(view._compute_distributions([0])[0][0].sum(), 20)
+            d[0].weight = 12
+            self.assertEqual(view._compute_distributions([0])[0][0].sum(), 30)
+
+        d = data.Table("iris")
+        stats = d._compute_basic_stats()
+        np.testing.assert_equal(d._compute_basic_stats(), stats)
+        d[0, 0] = 100
+        self.assertEqual(d._compute_basic_stats([0])[0][1], 100)
+        self.assertEqual(d._compute_contingency([0])[0][0][1].sum(), len(d))
+
+        d = data.Table("zoo")
+        self.assertEqual(d._compute_contingency([0, 1])[1][0].sum(), len(d))
+        d.set_weights(3)
+        self.assertEqual(d._compute_contingency([1])[0][0].sum(), 3 * len(d))
+
+        # Reading the arrays does not change the data
+        d = data.Table("iris")
+        d._compute_distributions([0])
+        self.assertEqual(d.X.shape, (150, 4))
+        self.assertEqual(d.Y.shape, (150,))
+        self.assertEqual(len(d), 150)
+        self.assertFalse(d.has_weights())
+        self.assertIn(("distribution", 0), d._statistics_cache())
+
+        # Replacing them does
+        d.X = np.ones_like(d.X)
+        (dist, _), = d._compute_distributions([0])
+        np.testing.assert_equal(dist, [[1], [len(d)]])
+
+        d.statistics_cache_size = 3
+        d._compute_basic_stats()
+        self.assertEqual(len(d._statistics_cache()), 3)
+
+    def test_continuous_distributions(self):
+        d = data.Table("iris")
+        d.X[:3, 0] = np.nan
+        for weights in (None, np.arange(len(d)) % 3):
+            if weights is not None:
+                d.set_weights(weights)
+            W = d.W if d.has_weights() else np.ones(len(d))
+            for i, (dist, unknowns) in enumerate(
+                    d._compute_distributions(d.domain.attributes)):
+                col = d.X[:, i]
+                values = np.unique(col[~np.isnan(col)])
+                np.testing.assert_equal(dist[0], values)
+                np.testing.assert_almost_equal(
+                    dist[1], [W[col == v].sum() for v in values])
+                self.assertAlmostEqual(unknowns, W[np.isnan(col)].sum())
+
+        # Sort orders put missing values at the end and are not kept
+        ranks, = d._sort_orders([0])
+        self.assertIsNot(d._sort_orders([0])[0], ranks)
+        np.testing.assert_equal(d.X[ranks[:-3], 0], np.sort(d.X[3:, 0]))
+        d._compute_distributions([0])
+        self.assertEqual({kind for kind, _ in d._statistics_cache()},
+                         {"distribution"})
+
+    def test_join(self):
+        zoo = data.Table("zoo")
+        a = zoo[:60, [0, 1, "type", -1]]
+        b = zoo[40:, [2, 3, "type", -1]]
+        b.metas[-1, 0] = a.metas[0, 0] = ""
+
+        def pairs(how, *args):
+            rows, b_rows = a.join_indices(b, *args, how=how)
+            return list(zip(rows.tolist(), b_rows.tolist()))
+
+        inner = [(i, i - 40) for i in range(40, 60)]
+        self.assertEqual(pairs("inner", ["name"]), inner)
+        self.assertEqual(pairs("inner", ["name", "type"]), inner)
+        self.assertEqual(pairs("left", ["name"]),
+                         [(i, -1) for i in range(40)] + inner)
+        self.assertEqual(pairs("right", ["name"]),
+                         inner + [(-1, i) for i in range(20, len(b))])
+        self.assertEqual(pairs("outer", ["name"]),
+                         [(i, -1) for i in range(40)] + inner +
+                         [(-1, i) for i in range(20, len(b))])
+
+        # Repeated keys produce all pairs
+        rows, b_rows = zoo.join_indices(zoo, ["type"])
+        counts = np.bincount(zoo.Y.astype(int))
+        self.assertEqual(len(rows), np.sum(counts ** 2))
+        np.testing.assert_equal(zoo.Y[rows], zoo.Y[b_rows])
+
+        joined = a.join(b, ["name"], how="outer")
+        self.assertEqual(
+            [var.name for var in joined.domain.variables + joined.domain.metas],
+            ["hair", "feathers", "eggs", "milk", "type", "name"])
+        self.assertEqual(len(joined), len(zoo))
+        self.assertEqual(joined[45, "eggs"], zoo[45, "eggs"])
+        self.assertTrue(isnan(joined[0, "eggs"]))
+        # Shared variables are taken from the other table if needed
+        self.assertEqual(joined[-2, "type"], zoo[-2, "type"])
+        self.assertEqual(joined[-2, "name"], zoo[-2, "name"])
+
+        # Discrete values are matched by labels
+        type_ = data.DiscreteVariable(
+            "type", values=list(reversed(zoo.domain.class_var.values)))
+        c = data.Table(data.Domain([], type_),
+                       np.empty((2, 0)), [[0], [np.nan]])
+        rows, c_rows = zoo.join_indices(c, ["type"])
+        self.assertTrue(np.all(zoo.Y[rows] == len(type_.values) - 1))
+        np.testing.assert_equal(c_rows, 0)
+
+        self.assertRaises(ValueError, a.join_indices, b, ["name"], how="x")
+        self.assertRaises(ValueError, a.join_indices, b, ["name"], [])
+
+    def test_group_by(self):
+        zoo = data.Table("zoo")
+        zoo.X[:3, 12] = np.nan
+        zoo.metas[3, 0] = ""
+        zoo.set_weights(np.arange(len(zoo)) % 3)
+        legs, type_ = zoo.domain["legs"], zoo.domain["type"]
+        groups, stats = zoo._compute_group_stats(["type", "name"], ["legs"])
+        _, dists = zoo._compute_group_distributions(["type", "name"],
+                                                    ["legs"])
+        grouped_rows = [row for i, row in enumerate(zoo) if i != 3]
+        keys = sorted({(row["type"], str(row["name"]))
+                       for row in grouped_rows},
+                      key=lambda key: (type_.to_val(key[0]), key[1]))
+        self.assertEqual(list(zip(groups[0], groups[1])),
+                         [(type_.to_val(t), name) for t, name in keys])
+        for key, col_stats, dist in zip(keys, stats[0], dists[0][0]):
+            rows = [row for row in grouped_rows
+                    if (row["type"], str(row["name"])) == key]
+            known = [row for row in rows if not isnan(row["legs"])]
+            weight = sum(row.weight for row in known)
+            expected = [row["legs"] * row.weight for row in known]
+            np.testing.assert_almost_equal(
+                col_stats[[4, 5]],
+                [sum(row.weight for row in rows) - weight, weight])
+            if known:
+                self.assertEqual(col_stats[0],
+                                 min(float(row["legs"]) for row in known))
+            if weight:
+                self.assertAlmostEqual(col_stats[2], sum(expected) / weight)
+            np.testing.assert_almost_equal(
+                dist, [sum(row.weight for row in known if row["legs"] == val)
+                       for val in legs.values])
+
+        iris = data.Table("iris")
+        iris.set_weights(np.random.random(len(iris)))
+        values, dists = iris._compute_group_distributions(["iris"])
+        conts = iris._compute_contingency(row_var="iris")
+        for (dist, unknowns), (cont, cont_unknowns) in zip(dists, conts):
+            np.testing.assert_almost_equal(dist[0], cont[0])
+            np.testing.assert_almost_equal(dist[1], cont[1])
+            np.testing.assert_almost_equal(unknowns, cont_unknowns)
+
+        grouped = iris.group_by(["iris"], ["petal length"])
+        self.assertEqual(
+            [var.name for var in grouped.domain],
+            ["iris"] + ["petal length ({})".format(agg)
+                        for agg in ("count", "sum", "mean", "min", "max")])
+        for row, cls in zip(grouped, range(3)):
+            W = iris.W[iris.Y == cls]
+            x = iris.X[iris.Y == cls, 2]
+            np.testing.assert_almost_equal(
+                list(row), [cls, W.sum(), (W * x).sum(),
+                            (W * x).sum() / W.sum(), x.min(), x.max()])
+        grouped = zoo.group_by(["name"], ["legs"], ["var"])
+        self.assertEqual(grouped.domain.metas, (zoo.domain["name"], ))
+        self.assertEqual(len(grouped), 99)
+        self.assertRaises(ValueError, iris.group_by, ["iris"], None, ["avg"])
+        self.assertRaises(ValueError, zoo.group_by, ["type"], ["name"])
+
     def test_convert_through_append(self):
         d = data.Table("iris")
         dom2 = data.Domain([d.domain[0], d.domain[2], d.domain[4]])
@@ -629,6 +930,115 @@ class TableTestCase(unittest.TestCase):
         self.assertEqual(d.checksum(include_metas=False),
                          d2.checksum(include_metas=False))
 
+    @unittest.skipUnless(hasattr(pickle, "PickleBuffer"),
+                         "out-of-band buffers require pickle protocol 5")
+    def test_pickle_out_of_band(self):
+        d = data.Table("iris")
+        buffers = []
+        s = pickle.dumps(d, 5, buffer_callback=buffers.append)
+        self.assertGreater(len(buffers), 0)
+        self.assertLess(len(s), d.X.nbytes)
+        d2 = pickle.loads(s, buffers=buffers)
+        np.testing.assert_array_equal(d2.X, d.X)
+        np.testing.assert_array_equal(d2.Y, d.Y)
+        np.testing.assert_array_equal(d2.ids, d.ids)
+        self.assertEqual(d.checksum(), d2.checksum())
+
+        d = data.Table("zoo")
+        d2 = pickle.loads(pickle.dumps(d, 5))
+        self.assertEqual(d[0], d2[0])
+        self.assertEqual(d.checksum(), d2.checksum())
+
+    def test_shared_compute_value(self):
+        from Orange.data.util import SharedComputeValue
+
+        class Column(SharedComputeValue):
+            def __init__(self, compute_shared, column):
+                super().__init__(compute_shared)
+                self.column = column
+
+            def compute(self, data, shared_data):
+                return shared_data[:, self.column]
+
+        d = data.Table("iris")
+        compute_shared = Mock(side_effect=lambda data: data.X * 2)
+        attrs = [data.ContinuousVariable(
+            "c{}".format(i), compute_value=Column(compute_shared, i))
+            for i in range(3)]
+        dom = data.Domain(attrs[:2], d.domain.class_var, metas=attrs[2:])
+        d2 = data.Table.from_table(dom, d, [0, 2, 4])
+        self.assertEqual(compute_shared.call_count, 1)
+        np.testing.assert_equal(d2.X, d.X[[0, 2, 4], :2] * 2)
+        np.testing.assert_equal(d2.metas[:, 0], d.X[[0, 2, 4], 2] * 2)
+
+        # Outside of conversion, the shared computation is made for each call
+        np.testing.assert_equal(attrs[1].compute_value(d), d.X[:, 1] * 2)
+        self.assertEqual(compute_shared.call_count, 2)
+
+    def test_from_table_cached(self):
+        from Orange.data.util import ConversionCache
+        d = data.Table("iris")
+        dom = data.Domain(d.domain.attributes[:2], d.domain.class_var)
+        cache = data.Table.conversion_cache = ConversionCache()
+        try:
+            self.assertIs(data.Table.from_table_cached(d.domain, d), d)
+            d2 = data.Table.from_table_cached(dom, d)
+            np.testing.assert_equal(d2.X, d.X[:, :2])
+            # Reading the converted table does not invalidate the entry
+            d2 = data.Table.from_table_cached(dom, d)
+            self.assertEqual(d2.X.shape, (len(d), 2))
+            d2b = data.Table.from_table_cached(dom, d)
+            self.assertIs(d2b.X, d2.X)
+            self.assertIs(d2b.domain, dom)
+
+            # Changed data is converted again
+            d[0, 0] = 42
+            d3 = data.Table.from_table_cached(dom, d)
+            self.assertIsNot(d3.X, d2.X)
+            self.assertEqual(d3.X[0, 0], 42)
+
+            # Entries are removed when the source is collected
+            self.assertEqual(len(cache._entries), 1)
+            del d
+            self.assertIsNone(cache.get(dom, d3))
+            self.assertEqual(len(cache._entries), 0)
+
+            # ... or when the domain is collected
+            d = data.Table("iris")
+            dom2 = data.Domain(d.domain.attributes[:1])
+            d4 = data.Table.from_table_cached(dom2, d)
+            self.assertEqual(len(cache._entries), 1)
+            del dom2, d4
+            gc.collect()
+            self.assertIsNone(cache.get(dom, d))
+            self.assertEqual(len(cache._entries), 0)
+
+            # Least recently used entries are evicted
+            d100 = d[:100]
+            data.Table.from_table_cached(dom, d)
+            cache.max_size = cache.size + 1
+            data.Table.from_table_cached(dom, d100)
+            self.assertEqual(list(cache._entries), [(id(dom), id(d100))])
+        finally:
+            data.Table.conversion_cache = ConversionCache()
+
+    def test_from_table_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        d = data.Table("iris")
+        doms = [data.Domain(d.domain.attributes[i:i + 2]) for i in range(3)]
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(
+                lambda i: data.Table.from_table(doms[i % 3], d),
+                range(30)))
+        for i, table in enumerate(results):
+            np.testing.assert_equal(table.X, d.X[:, i % 3:i % 3 + 2])
+
+    def test_row_selection_copies(self):
+        d = data.Table("iris")
+        d2 = d[[0, 1, 2]]
+        d.X[0, 0] = 100
+        self.assertEqual(d2.X[0, 0], 5.1)
+
     def test_translate_through_slice(self):
         d = data.Table("iris")
         dom = data.Domain(["petal length", "sepal length", "iris"],
@@ -700,6 +1110,69 @@ class TableTestCase(unittest.TestCase):
         finally:
             os.remove("iris.pickle")
 
+    def test_save_compressed(self):
+        table = data.Table("iris")
+        for filename in ("iris-c.tab.gz", "iris-c.tab.bz2", "iris-c.tab.xz",
+                         "iris-c.pickle.gz"):
+            try:
+                table.save(filename)
+                with open(filename, "rb") as f:
+                    self.assertNotIn(b"Iris-setosa", f.read())
+                table2 = data.Table.from_file(filename)
+                self.assertEqual(table2.name, "iris-c")
+                np.testing.assert_almost_equal(table.X, table2.X)
+            finally:
+                os.remove(filename)
+        with self.assertRaises(IOError):
+            table.save("iris-c.xlsx.gz")
+
+    def test_file_cache(self):
+        from Orange.data.io import TableCache, TabDelimFormat
+        directory = tempfile.mkdtemp()
+        filename = os.path.join(directory, "iris.tab")
+        cache = TableCache(os.path.join(directory, "cache"), min_size=0)
+        try:
+            data.Table("iris").save(filename)
+            data.Table.file_cache = cache
+            table = data.Table.from_file(filename)
+            self.assertEqual(len(cache.entries()), 1)
+            with patch.object(TabDelimFormat, "read_file") as read_file:
+                table2 = data.Table.from_file(filename)
+                self.assertFalse(read_file.called)
+            self.assertEqual(table2.name, "iris")
+            self.assertEqual(table2.domain, table.domain)
+            np.testing.assert_equal(table2.X, table.X)
+            np.testing.assert_equal(table2.Y, table.Y)
+            # Cached tables own their data, like tables read from files
+            self.assertIs(type(table2.X), np.ndarray)
+            self.assertTrue(table2.X.flags.c_contiguous)
+            self.assertTrue(table2.X.flags.owndata)
+            table2.append([5.1, 3.5, 1.4, 0.2, "Iris-setosa"])
+            self.assertEqual(len(table2), len(table) + 1)
+
+            # A modified file is read again
+            stat = os.stat(filename)
+            os.utime(filename, (stat.st_atime, stat.st_mtime + 10))
+            with patch.object(TabDelimFormat, "read_file",
+                              return_value=table) as read_file:
+                data.Table.from_file(filename)
+                self.assertTrue(read_file.called)
+
+            # Only the most recent entry fits into the cache
+            self.assertEqual(len(cache.entries()), 2)
+            cache.max_size = cache.entries()[0][1]
+            cache.evict()
+            self.assertEqual(len(cache.entries()), 1)
+            with patch.object(TabDelimFormat, "read_file") as read_file:
+                data.Table.from_file(filename)
+                self.assertFalse(read_file.called)
+
+            cache.clear()
+            self.assertEqual(cache.entries(), [])
+        finally:
+            data.Table.file_cache = None
+            shutil.rmtree(directory)
+
     def test_from_numpy(self):
         import random
 
@@ -895,6 +1368,79 @@ class TableTestCase(unittest.TestCase):
         f = filter.FilterDiscrete(d.domain.class_var, values=[2, data.Table])
         self.assertRaises(TypeError, d._filter_values, f)
 
+    def test_filter_values_combined(self):
+        d = data.Table("zoo")
+        d.X[:5, 0] = np.nan
+        names = d.metas[:, 0]
+        first_letters = list("abcdefghijk")
+        conditions = [
+            filter.FilterDiscrete("hair", ["1"]),
+            filter.FilterString("name", filter.FilterString.StartsWith, "b"),
+            filter.FilterContinuous("hair", filter.FilterContinuous.IsDefined),
+            filter.FilterStringList("name", first_letters)]
+        masks = [d.X[:, 0] == 1,
+                 np.array([name.startswith("b") for name in names]),
+                 ~np.isnan(d.X[:, 0]),
+                 np.in1d(names, first_letters)]
+        for n in range(1, len(conditions) + 1):
+            for conjunction in (True, False):
+                for negate in (False, True):
+                    f = filter.Values(conditions[:n], conjunction, negate)
+                    expected = reduce(np.logical_and if conjunction
+                                      else np.logical_or, masks[:n])
+                    if negate:
+                        expected = ~expected
+                    np.testing.assert_equal(f(d).ids, d.ids[expected])
+
+        # Case-insensitive lists and more than a few accepted strings
+        f = filter.FilterStringList(
+            "name", [name.upper() for name in names[::3]],
+            case_sensitive=False)
+        np.testing.assert_equal(filter.Values([f])(d).ids, d.ids[::3])
+        f = filter.FilterString("name", filter.FilterString.Contains, "A",
+                                case_sensitive=False)
+        np.testing.assert_equal(filter.Values([f])(d).ids,
+                                d.ids[["a" in name for name in names]])
+
+    def test_filter_values_index(self):
+        d = data.Table("zoo")
+        d.X[:5, 12] = np.nan
+        d.metas[5:7, 0] = None
+        d.metas[7:9, 0] = ""
+        legs = d.domain["legs"]
+        Cont, Str = filter.FilterContinuous, filter.FilterString
+        conditions = [filter.FilterDiscrete("legs", ["2", "4"]),
+                      filter.FilterDiscrete("legs", None)]
+        conditions += [Cont("legs", oper, legs.to_val("4"), legs.to_val("6"))
+                       for oper in range(Cont.IsDefined + 1)]
+        for case_sensitive in (True, False):
+            for values in (["frog", "girl", "x"], ["", "None"], ["GIRL"]):
+                conditions.append(filter.FilterStringList(
+                    "name", values, case_sensitive=case_sensitive))
+            for ref in ("frog", "", "None", "GIRL"):
+                conditions += [
+                    Str("name", oper, ref, "pony",
+                        case_sensitive=case_sensitive)
+                    for oper in range(Str.IsDefined + 1)]
+        indexed = data.Table(d)
+        indexed.add_index("legs")
+        indexed.add_index("name")
+        for cond in conditions:
+            for other in [None, filter.FilterDiscrete("hair", ["1"])]:
+                for conjunction in (True, False):
+                    f = filter.Values([other, cond] if other else [cond],
+                                      conjunction)
+                    np.testing.assert_equal(f(indexed).ids, f(d).ids)
+
+        # The index is rebuilt when the table changes
+        f = filter.Values([filter.FilterDiscrete("legs", ["2"])])
+        n_rows = len(f(indexed))
+        indexed[5, "legs"] = "2" if indexed[5, "legs"] != "2" else "4"
+        self.assertEqual(abs(len(f(indexed)) - n_rows), 1)
+        np.testing.assert_equal(f(indexed).ids, f(data.Table(indexed)).ids)
+        indexed.remove_index("legs")
+        np.testing.assert_equal(f(indexed).ids, f(data.Table(indexed)).ids)
+
     def test_valueFilter_string_case_sens(self):
         d = data.Table("zoo")
         col = d[:, "name"].metas[:, 0]
@@ -1141,6 +1687,20 @@ class CreateTableWithFilename(TableTests):
         with self.assertRaises(IOError):
             data.Table.from_file("file.invalid_extension")
 
+    @patch("os.path.exists", Mock(return_value=True))
+    def test_iter_chunks_calls_reader(self):
+        chunks = [Mock(data.Table), Mock(data.Table)]
+        reader_instance = Mock(iter_chunks=Mock(return_value=iter(chunks)))
+
+        with patch.dict(data.io.FileFormats.readers,
+                        {'.xlsx': lambda: reader_instance}):
+            tables = list(data.Table.iter_chunks("test.xlsx", 100))
+
+        reader_instance.iter_chunks.assert_called_with(
+            "test.xlsx", 100, data.Table)
+        self.assertEqual(tables, chunks)
+        self.assertEqual(tables[0].name, "test")
+
     @patch("Orange.data.table.Table.from_file")
     def test_calling_new_with_string_argument_calls_read_data(self, read_data):
         data.Table(self.filename)
@@ -1303,6 +1863,18 @@ class CreateTableWithData(TableTests):
         self.assertEqual(table.domain, new_table.domain)
         np.testing.assert_array_equal(table.metas, new_table.metas)
 
+    def test_creates_a_table_from_list_of_instances_of_other_domain(self):
+        table = data.Table('zoo')
+        domain = data.Domain(table.domain.attributes[::-1],
+                             metas=[table.domain.class_var,
+                                    table.domain.metas[0]])
+        new_table = data.Table(domain, [d for d in table])
+        self.assertIs(new_table.domain, domain)
+        converted = data.Table(domain, table)
+        np.testing.assert_almost_equal(converted.X, new_table.X)
+        np.testing.assert_array_equal(converted.metas, new_table.metas)
+        self.assertEqual(new_table.Y.shape, (len(table), 0))
+
     def test_creates_a_table_with_domain_and_given_X(self):
         domain = self.mock_domain()
 
@@ -3,8 +3,10 @@ from tempfile import NamedTemporaryFile
 import os
 
 import numpy as np
+import scipy.sparse as sp
 
-from Orange.data import ContinuousVariable, DiscreteVariable
+from Orange.data import ContinuousVariable, DiscreteVariable, \
+    StringVariable, Domain, Table
 from Orange.data.io import TxtFormat
 
 tab_file = """\
@@ -74,3 +76,66 @@ class TestTabReader(unittest.TestCase):
         self.read_easy(csv_file, "Feature ")
         self.read_easy(csv_file_nh, "Var000")
 
+
+    def test_read_parallel(self):
+        file = NamedTemporaryFile("wt", delete=False)
+        try:
+            file.write(csv_file + "".join(
+                "{}, {}, ?\n".format(i, i / 2) for i in range(300)))
+            file.close()
+            reader = TxtFormat()
+            reader.n_jobs = 2
+            reader.parallel_min_size = 0
+            table = reader.read_file(file.name)
+            sequential = TxtFormat().read_file(file.name)
+        finally:
+            os.remove(file.name)
+        self.assertEqual(table.X.shape, (302, 3))
+        np.testing.assert_equal(table.X, sequential.X)
+
+    def test_iter_chunks(self):
+        file = NamedTemporaryFile("wt", delete=False)
+        try:
+            file.write(csv_file)
+            file.close()
+            chunks = list(TxtFormat().iter_chunks(file.name, 1))
+        finally:
+            os.remove(file.name)
+        self.assertEqual(len(chunks), 2)
+        np.testing.assert_almost_equal(
+            np.vstack([chunk.X for chunk in chunks]), [[1, 1.3, 5], [2, 42, 7]])
+
+    def test_write_csv(self):
+        x = ContinuousVariable("wx", number_of_decimals=1)
+        y = DiscreteVariable("wy", values=["a", "b"])
+        s = StringVariable("ws")
+        data = Table.from_numpy(
+            Domain([x], y, [s]), np.array([[1.25], [np.nan]]),
+            np.array([1, 0]), np.array([["foo, bar"], ["baz"]], dtype=object))
+        file = NamedTemporaryFile("wt", suffix=".csv", delete=False)
+        file.close()
+        try:
+            TxtFormat.write_file(file.name, data)
+            with open(file.name) as f:
+                lines = f.read().splitlines()
+            read = TxtFormat().read_file(file.name)
+        finally:
+            os.remove(file.name)
+        # Values are written as numbers, which are read back
+        self.assertEqual(lines, ["wx,wy", "1.25,1.0", "?,0.0"])
+        self.assertEqual([var.name for var in read.domain], ["wx", "wy"])
+        np.testing.assert_equal(read.X, [[1.25, 1], [np.nan, 0]])
+
+    def test_write_sparse_csv(self):
+        domain = Domain([ContinuousVariable("s{}".format(i))
+                         for i in range(3)])
+        data = Table.from_numpy(
+            domain, sp.csr_matrix(np.array([[0, 2.5, 0], [1, 0, 0]])))
+        file = NamedTemporaryFile("wt", suffix=".csv", delete=False)
+        file.close()
+        try:
+            TxtFormat.write_file(file.name, data)
+            read = TxtFormat().read_file(file.name)
+        finally:
+            os.remove(file.name)
+        np.testing.assert_equal(read.X, [[0, 2.5, 0], [1, 0, 0]])
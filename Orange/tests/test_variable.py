@@ -1,3 +1,4 @@
+import gc
 import math
 import unittest
 import pickle
@@ -90,6 +91,52 @@ class DiscreteVariableTest(VariableTest):
             find_comp("abc", values=["a", "d", "b"], ordered=True), abd)
         self.assertIs(find_comp("abc", values=["a", "b", "c"]), abc_un)
 
+    def test_registry_is_weak(self):
+        var = DiscreteVariable.make("weak", values=["a", "b"])
+        self.assertIs(DiscreteVariable.make("weak", values=["b"]), var)
+        self.assertEqual(len(DiscreteVariable._all_vars), 1)
+        del var
+        gc.collect()
+        self.assertEqual(len(DiscreteVariable._all_vars), 0)
+        self.assertIsNone(DiscreteVariable._find_compatible("weak", ["a"]))
+
+        cont = ContinuousVariable.make("weak")
+        del cont
+        gc.collect()
+        self.assertEqual(len(ContinuousVariable._all_vars), 0)
+
+    def test_find_compatible_indexed(self):
+        variables = [DiscreteVariable("x", values=[str(i), "common"])
+                     for i in range(1000)]
+        candidates = DiscreteVariable._all_vars.candidates
+        self.assertEqual(candidates("x", ["500"]), [variables[500]])
+        self.assertEqual(len(candidates("x")), 1000)
+        self.assertIs(DiscreteVariable._find_compatible("x", ["500"]),
+                      variables[500])
+        # The first constructed variable is preferred
+        self.assertIs(DiscreteVariable._find_compatible("x", ["500", "7"]),
+                      variables[7])
+        self.assertIs(DiscreteVariable._find_compatible("x", ["common"]),
+                      variables[0])
+        # Values that were added later are indexed, too
+        variables[900].add_value("new")
+        self.assertIs(DiscreteVariable._find_compatible("x", ["new"]),
+                      variables[900])
+        self.assertIs(DiscreteVariable._find_compatible("x", ["newer", "1"]),
+                      variables[1])
+        self.assertEqual(variables[1].values, ["1", "common", "newer"])
+        self.assertIs(DiscreteVariable._find_compatible("x", ["newer"]),
+                      variables[1])
+        # So are the values in lists that replace the variable's values
+        variables[800].values = ["800", "common", "replaced"]
+        self.assertIs(DiscreteVariable._find_compatible("x", ["replaced"]),
+                      variables[800])
+        variables[2].values = ["common", "2"]
+        self.assertEqual(candidates("x", ["2"]), [variables[2]])
+        del variables[:]
+        gc.collect()
+        self.assertEqual(candidates("x", ["500"]), [])
+
     def test_make(self):
         var = DiscreteVariable.make("a", values=["F", "M"])
         self.assertIsInstance(var, DiscreteVariable)
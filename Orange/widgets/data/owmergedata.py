@@ -1,5 +1,4 @@
 import math
-import itertools
 from collections import defaultdict
 
 from PyQt4 import QtGui, QtCore
@@ -162,23 +161,15 @@ def allvars(data):
 
 
 def merge(A, varA, B, varB):
-    join_indices = left_join_indices(A, B, (varA,), (varB,))
-    seen_set = set()
-
-    def seen(val):
-        return val in seen_set or bool(seen_set.add(val))
-
-    merge_indices = [(i, j) for i, j in join_indices if not seen(i)]
-
-    all_vars_A = set(A.domain.variables + A.domain.metas)
-    iter_vars_B = itertools.chain(
-        enumerate(B.domain.variables),
-        ((-i, m) for i, m in enumerate(B.domain.metas, start=1))
-    )
-    reduced_indices_B = [i for i, var in iter_vars_B if not var in all_vars_A]
-    reduced_B = B[:, list(reduced_indices_B)]
-
-    return join_table_by_indices(A, reduced_B, merge_indices)
+    """
+    Left join `A` and `B` on values of `varA` and `varB`; each row of `A`
+    is joined with the first matching row of `B`. Variables of `B` that also
+    appear in `A` are not repeated.
+    """
+    rows, rows_B = A.join_indices(B, [varA], [varB], how="left")
+    first = numpy.ones(len(rows), dtype=bool)
+    first[1:] = rows[1:] != rows[:-1]
+    return A.join_rows(B, rows[first], rows_B[first])
 
 
 def group_table_indices(table, key_vars, exclude_unknown=False):
@@ -193,28 +184,38 @@ def group_table_indices(table, key_vars, exclude_unknown=False):
     :param bool exclude_unknown:
 
     """
+    key_vars = [table.domain[var] for var in key_vars]
     groups = defaultdict(list)
-    for i, inst in enumerate(table):
-        key = [inst[a] for a in key_vars]
+    # Keys are string representations of values, so groups of different
+    # continuous values with the same representation are merged
+    merged = set()
+    found = table._groups(key_vars)
+    rows = numpy.split(found["rows"], found["starts"][1:])
+    for values, group_rows in zip(zip(*found["values"]), rows):
+        key = tuple(var.str_val(val) for var, val in zip(key_vars, values))
+        if key in groups:
+            merged.add(key)
+        groups[key] += group_rows.tolist()
+    # Rows with missing values, and empty strings, which are missing in
+    # _groups, are grouped one by one
+    for i in numpy.flatnonzero(found["codes"] < 0).tolist():
+        key = [table[i, var] for var in key_vars]
         if exclude_unknown and any(math.isnan(k) for k in key):
             continue
         key = tuple([str(k) for k in key])
+        if key in groups:
+            merged.add(key)
         groups[key].append(i)
+    for key in merged:
+        groups[key].sort()
     return groups
 
 
 def left_join_indices(table1, table2, vars1, vars2):
-    key_map1 = group_table_indices(table1, vars1)
-    key_map2 = group_table_indices(table2, vars2)
-    indices = []
-    for i, inst in enumerate(table1):
-        key = tuple([str(inst[v]) for v in vars1])
-        if key in key_map1 and key in key_map2:
-            for j in key_map2[key]:
-                indices.append((i, j))
-        else:
-            indices.append((i, None))
-    return indices
+    rows1, rows2 = table1.join_indices(table2, list(vars1), list(vars2),
+                                       how="left")
+    return [(i, j if j >= 0 else None)
+            for i, j in zip(rows1.tolist(), rows2.tolist())]
 
 
 def right_join_indices(table1, table2, vars1, vars2):
@@ -262,25 +263,18 @@ def join_table_by_indices(left, right, indices):
 
 
 def join_array_by_indices(left, right, indices, masked=float("nan")):
-    left_masked = [masked] * left.shape[1]
-    right_masked = [masked] * right.shape[1]
-
-    leftparts = []
-    rightparts = []
-    for i, j in indices:
-        if i is not None:
-            leftparts.append(left[i])
-        else:
-            leftparts.append(left_masked)
-        if j is not None:
-            rightparts.append(right[j])
-        else:
-            rightparts.append(right_masked)
-
-    def hstack_blocks(blocks):
-        return numpy.hstack(list(map(numpy.vstack, blocks)))
-
-    return hstack_blocks((leftparts, rightparts))
+    def take(arr, rows):
+        dtype = object if arr.dtype == object else float
+        taken = numpy.full((len(rows), arr.shape[1]), masked, dtype=dtype)
+        defined = rows >= 0
+        taken[defined] = arr[rows[defined]]
+        return taken
+
+    left_rows = numpy.array([-1 if i is None else i for i, _ in indices],
+                            dtype=int)
+    right_rows = numpy.array([-1 if j is None else j for _, j in indices],
+                             dtype=int)
+    return numpy.hstack((take(left, left_rows), take(right, right_rows)))
 
 
 def test():
@@ -0,0 +1,57 @@
+"""
+Micro-benchmarks of converting and predicting single data instances.
+
+Run with `python benchmark/bench_predict.py`; the script prints the time
+per call in microseconds.
+"""
+import timeit
+
+import numpy as np
+
+from Orange.classification import LogisticRegressionLearner
+from Orange.data import Table, Instance, Domain, ContinuousVariable
+from Orange.preprocess import Normalize
+
+
+def report(name, statement, number=2000):
+    time = min(timeit.repeat(statement, number=number, repeat=3))
+    print("{:<40} {:10.1f} us".format(name, time / number * 1e6))
+
+
+def main():
+    data = Table("iris")
+    model = LogisticRegressionLearner()(data)
+    instance = data[0]
+    instances = list(data[:100])
+
+    # A domain with computed variables, as given by preprocessors
+    normalized = Normalize()(data).domain
+    # A domain with the same variables in a different order
+    reordered = Domain(data.domain.attributes[::-1], data.domain.class_var)
+    # A domain without the class and with an additional attribute
+    extended = Domain(data.domain.attributes + (ContinuousVariable("x"),))
+
+    report("convert instance (same variables)",
+           lambda: Instance(reordered, instance))
+    report("convert instance (computed variables)",
+           lambda: Instance(normalized, instance))
+    report("convert instance (unknown variable)",
+           lambda: Instance(extended, instance))
+    attributes = [ContinuousVariable("a{}".format(i)) for i in range(200)]
+    wide = Table.from_numpy(Domain(attributes), np.random.random((10, 200)))
+    wide_reordered = Domain(attributes[::-1])
+    report("convert instance (200 variables)",
+           lambda: Instance(wide_reordered, wide[0]))
+    report("table from 100 instances",
+           lambda: Table(data.domain, instances), number=200)
+    report("convert 100 instances",
+           lambda: Table(reordered, instances), number=200)
+    report("predict instance", lambda: model(instance))
+    report("predict instance from another domain",
+           lambda: model(Instance(extended, instance)))
+    report("predict probabilities of instance",
+           lambda: model(instance, model.Probs))
+
+
+if __name__ == "__main__":
+    main()